@@ -0,0 +1,143 @@
+import os
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from dbt.clients.system import load_file_contents, write_file
+from dbt.contracts.files import FileHash
+
+
+class BufferedFileWriter:
+    """Write files on a background thread, so the threads that compile and
+    run nodes don't wait on the filesystem. Queued files are written in
+    batches: when a file is queued more than once in a batch, only the last
+    contents are written. The directories the writer made are remembered, so
+    they're only checked once.
+
+    With skip_unchanged, a file that already has the contents is left alone.
+
+    An error writing a file doesn't stop the others from being written. The
+    first one is raised by raise_error.
+    """
+    def __init__(
+        self, skip_unchanged: bool = False, batch_size: int = 100
+    ) -> None:
+        self.skip_unchanged = skip_unchanged
+        self.batch_size = batch_size
+        # paths and contents, then None when the writer is closed
+        self._queue: 'queue.Queue[Optional[Tuple[str, str]]]' = queue.Queue()
+        self._directories: Set[str] = set()
+        self._error: Optional[Exception] = None
+        self._thread = threading.Thread(
+            target=self._write_files, name='file-writer', daemon=True
+        )
+        self.written = 0
+        self.unchanged = 0
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def write(self, path: str, contents: str) -> None:
+        self._queue.put((path, contents))
+
+    def flush(self) -> None:
+        """Wait for the queued files to be written."""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Write the queued files and stop the background thread."""
+        self._queue.put(None)
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def raise_error(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    def _next_batch(self) -> List[Optional[Tuple[str, str]]]:
+        batch = [self._queue.get()]
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write_files(self) -> None:
+        closed = False
+        while not closed:
+            batch = self._next_batch()
+            files: Dict[str, str] = {}
+            for item in batch:
+                if item is None:
+                    closed = True
+                else:
+                    path, contents = item
+                    files[path] = contents
+            for path, contents in files.items():
+                try:
+                    self._write_file(path, contents)
+                except Exception as exc:
+                    if self._error is None:
+                        self._error = exc
+            for _ in batch:
+                self._queue.task_done()
+
+    def _write_file(self, path: str, contents: str) -> None:
+        if self.skip_unchanged and self._has_contents(path, contents):
+            self.unchanged += 1
+            return
+        directory = os.path.dirname(path)
+        write_file(
+            path,
+            contents,
+            create_directory=directory not in self._directories,
+        )
+        self._directories.add(directory)
+        self.written += 1
+
+    @staticmethod
+    def _has_contents(path: str, contents: str) -> bool:
+        if not os.path.isfile(path):
+            return False
+        existing = load_file_contents(path, strip=False)
+        return FileHash.from_contents(existing) == FileHash.from_contents(
+            contents
+        )
+
+
+# the writer of the task that's running, if any
+_ACTIVE_WRITER: Optional[BufferedFileWriter] = None
+
+
+@contextmanager
+def buffered_writes(
+    skip_unchanged: bool = False
+) -> Iterator[BufferedFileWriter]:
+    """Write the files passed to write_output on a background thread until
+    the block exits. All of them are written by then, and the first error
+    writing one is raised.
+    """
+    global _ACTIVE_WRITER
+    writer = BufferedFileWriter(skip_unchanged=skip_unchanged)
+    writer.start()
+    _ACTIVE_WRITER = writer
+    try:
+        yield writer
+    finally:
+        _ACTIVE_WRITER = None
+        writer.close()
+    writer.raise_error()
+
+
+def write_output(path: str, contents: str) -> None:
+    """Write a file that dbt produces, like the compiled SQL of a node. It's
+    written in the background if there's a buffered writer, or right away
+    otherwise.
+    """
+    writer = _ACTIVE_WRITER
+    if writer is None:
+        write_file(path, contents)
+    else:
+        writer.write(path, contents)
@@ -9,7 +9,7 @@ from contextlib import contextmanager
 from itertools import chain, islice
 from typing import (
     List, Union, Set, Optional, Dict, Any, Iterator, Type, NoReturn, Tuple,
-    Callable
+    Callable, Mapping
 )
 
 import jinja2
@@ -17,7 +17,9 @@ import jinja2.ext
 import jinja2.nativetypes  # type: ignore
 import jinja2.nodes
 import jinja2.parser
+import jinja2.runtime
 import jinja2.sandbox
+import jinja2.utils
 
 from dbt.utils import (
     get_dbt_macro_name, get_docs_macro_name, get_materialization_macro_name,
@@ -82,7 +84,47 @@ class MacroFuzzParser(jinja2.parser.Parser):
         return node
 
 
+class LazyMacroContext(Dict[str, Any]):
+    """A context dict that also resolves the names of the macros in
+    'macros', which bind them to the context when they're looked up. Entries
+    in the dict itself take precedence.
+
+    The macros aren't entries, so iterating over the dict or copying it
+    leaves them out. Templates find them through the 'context' entry, which
+    refers to the dict itself, see MacroFuzzContext.
+    """
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.macros: Mapping[str, Any] = {}
+
+    def __missing__(self, key: str) -> Any:
+        return self.macros[key]
+
+    def __contains__(self, key: object) -> bool:
+        return super().__contains__(key) or key in self.macros
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+
+class MacroFuzzContext(jinja2.runtime.Context):
+    # jinja copies the context dict it's given, so a name that isn't in the
+    # copy is looked up in the original, if that's a LazyMacroContext
+    def resolve_or_missing(self, key):
+        value = super().resolve_or_missing(key)
+        if value is jinja2.utils.missing:
+            context = self.parent.get('context')
+            if isinstance(context, LazyMacroContext):
+                value = context.macros.get(key, value)
+        return value
+
+
 class MacroFuzzEnvironment(jinja2.sandbox.SandboxedEnvironment):
+    context_class = MacroFuzzContext
+
     def _parse(self, source, name, filename):
         return MacroFuzzParser(self, source, name, filename).parse()
 
@@ -699,3 +741,87 @@ def statically_extract_macro_calls(string, ctx):
             possible_macro_calls.append(func_name)
 
     return possible_macro_calls
+
+
+# The calls that statically_extract_ref_source_config understands. If a
+# template calls anything else, or calls these with anything but literal
+# arguments, it has to be rendered to find out what it does.
+STATIC_PARSE_CALLS = frozenset(('ref', 'source', 'config'))
+
+
+class _NotStatic(Exception):
+    pass
+
+
+def _literal_value(node):
+    if isinstance(node, jinja2.nodes.Const):
+        return node.value
+    elif isinstance(node, jinja2.nodes.List):
+        return [_literal_value(item) for item in node.items]
+    elif isinstance(node, jinja2.nodes.Tuple):
+        return tuple(_literal_value(item) for item in node.items)
+    elif isinstance(node, jinja2.nodes.Dict):
+        return {
+            _literal_value(pair.key): _literal_value(pair.value)
+            for pair in node.items
+        }
+    raise _NotStatic()
+
+
+def _static_call(node):
+    if not isinstance(node, jinja2.nodes.Call):
+        raise _NotStatic()
+    if not isinstance(node.node, jinja2.nodes.Name):
+        raise _NotStatic()
+    if node.node.name not in STATIC_PARSE_CALLS:
+        raise _NotStatic()
+    if node.dyn_args is not None or node.dyn_kwargs is not None:
+        raise _NotStatic()
+    args = [_literal_value(arg) for arg in node.args]
+    kwargs = {kw.key: _literal_value(kw.value) for kw in node.kwargs}
+    name = node.node.name
+    # leave anything that would be an error to the renderer
+    if name == 'ref':
+        valid = (
+            1 <= len(args) <= 2 and not kwargs and
+            all(isinstance(arg, str) for arg in args)
+        )
+    elif name == 'source':
+        valid = (
+            len(args) == 2 and not kwargs and
+            all(isinstance(arg, str) for arg in args)
+        )
+    else:
+        valid = (
+            (len(args) == 1 and not kwargs and isinstance(args[0], dict)) or
+            (not args and len(kwargs) > 0)
+        )
+    if not valid:
+        raise _NotStatic()
+    return name, args, kwargs
+
+
+def statically_extract_ref_source_config(string):
+    """Find the ref(), source() and config() calls in the template without
+    rendering it. The calls are returned as (name, args, kwargs) in the order
+    in which rendering would make them. If the template does anything else,
+    like use a variable, a macro or a control structure, return None.
+    """
+    env = get_environment(None, capture_macros=True)
+    try:
+        parsed = env.parse(string)
+    except jinja2.exceptions.TemplateSyntaxError:
+        return None
+
+    calls = []
+    try:
+        for node in parsed.body:
+            if not isinstance(node, jinja2.nodes.Output):
+                raise _NotStatic()
+            for child in node.nodes:
+                if isinstance(child, jinja2.nodes.TemplateData):
+                    continue
+                calls.append(_static_call(child))
+    except _NotStatic:
+        return None
+    return calls
@@ -129,10 +129,13 @@ def supports_symlinks() -> bool:
     return getattr(os, "symlink", None) is not None
 
 
-def write_file(path: str, contents: str = '') -> bool:
+def write_file(
+    path: str, contents: str = '', create_directory: bool = True
+) -> bool:
     path = convert_path(path)
     try:
-        make_directory(os.path.dirname(path))
+        if create_directory:
+            make_directory(os.path.dirname(path))
         with open(path, 'w', encoding='utf-8') as f:
             f.write(str(contents))
     except Exception as exc:
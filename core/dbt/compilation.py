@@ -1,6 +1,7 @@
 import os
+import re
 from collections import defaultdict
-from typing import List, Dict, Any, Tuple, cast, Optional
+from typing import List, Dict, Any, Tuple, Optional
 
 import networkx as nx  # type: ignore
 import sqlparse
@@ -25,7 +26,7 @@ from dbt.exceptions import (
     InternalException,
     RuntimeException,
 )
-from dbt.graph import Graph
+from dbt.graph import Graph, DAG
 from dbt.logger import GLOBAL_LOGGER as logger
 from dbt.node_types import NodeType
 from dbt.utils import pluralize
@@ -94,12 +95,14 @@ def _generate_stats(manifest: Manifest):
     return stats
 
 
+# The prepended CTEs are kept in a dict of unique ID -> CTE, which keeps them
+# in the order they were first added.
 def _add_prepended_cte(prepended_ctes, new_cte):
-    for cte in prepended_ctes:
-        if cte.id == new_cte.id:
-            cte.sql = new_cte.sql
-            return
-    prepended_ctes.append(new_cte)
+    cte = prepended_ctes.get(new_cte.id)
+    if cte is None:
+        prepended_ctes[new_cte.id] = new_cte
+    else:
+        cte.sql = new_cte.sql
 
 
 def _extend_prepended_ctes(prepended_ctes, new_prepended_ctes):
@@ -107,11 +110,38 @@ def _extend_prepended_ctes(prepended_ctes, new_prepended_ctes):
         _add_prepended_cte(prepended_ctes, new_cte)
 
 
+# whitespace and comments, then 'with' and the whitespace after it. A
+# comment can't match past its first '*/', or a 'with' after a later comment
+# would look like the first word.
+_LEADING_WITH = re.compile(
+    r'(?:\s|--[^\r\n]*(?:\r\n|\r|\n)|/\*(?:[^*]|\*(?!/))*\*/)*'
+    r'with(?=\s)\s*',
+    re.IGNORECASE,
+)
+_ANY_WITH = re.compile(r'\bwith\b', re.IGNORECASE)
+_LEADING_WHITESPACE = re.compile(r'\s*')
+
+
+def _inject_ctes_without_parsing(sql: str, cte_sql: str) -> Optional[str]:
+    """Inject the CTEs the way sqlparse would, for the SQL where that only
+    takes a look at the start of it: a single statement that either starts
+    with 'with', or doesn't contain the word at all. Return None for
+    anything else.
+    """
+    if ';' in sql or not sql.strip():
+        return None
+    match = _LEADING_WITH.match(sql)
+    if match is not None:
+        return f'{sql[:match.end()]}{cte_sql},{sql[match.end():]}'
+    if _ANY_WITH.search(sql) is None:
+        start = _LEADING_WHITESPACE.match(sql).end()  # type: ignore
+        return f'{sql[:start]}with{cte_sql}{sql[start:]}'
+    return None
+
+
 class Linker:
-    def __init__(self, data=None):
-        if data is None:
-            data = {}
-        self.graph = nx.DiGraph(**data)
+    def __init__(self):
+        self.graph = DAG()
 
     def edges(self):
         return self.graph.edges()
@@ -120,18 +150,13 @@ class Linker:
         return self.graph.nodes()
 
     def find_cycles(self):
-        try:
-            cycle = nx.find_cycle(self.graph)
-        except nx.NetworkXNoCycle:
+        cycle = self.graph.find_cycle()
+        if cycle is None:
             return None
-        else:
-            # cycles is a List[Tuple[str, ...]]
-            return " --> ".join(c[0] for c in cycle)
+        return " --> ".join(cycle)
 
     def dependency(self, node1, node2):
         "indicate that node1 depends on node2"
-        self.graph.add_node(node1)
-        self.graph.add_node(node2)
         self.graph.add_edge(node2, node1)
 
     def add_node(self, node):
@@ -141,10 +166,11 @@ class Linker:
         """Write the graph to a gpickle file. Before doing so, serialize and
         include all nodes in their corresponding graph entries.
         """
-        out_graph = self.graph.copy()
-        for node_id in self.graph.nodes():
+        out_graph = nx.DiGraph()
+        for node_id in self.graph:
             data = manifest.expect(node_id).to_dict(omit_none=True)
             out_graph.add_node(node_id, **data)
+        out_graph.add_edges_from(self.graph.edges())
         nx.write_gpickle(out_graph, outfile)
 
 
@@ -221,6 +247,11 @@ class Compiler:
         if len(ctes) == 0:
             return sql
 
+        cte_sql = ", ".join(c.sql for c in ctes)
+        injected_sql = _inject_ctes_without_parsing(sql, cte_sql)
+        if injected_sql is not None:
+            return injected_sql
+
         parsed_stmts = sqlparse.parse(sql)
         parsed = parsed_stmts[0]
 
@@ -242,10 +273,7 @@ class Compiler:
             )
             parsed.insert_after(with_stmt, trailing_comma)
 
-        token = sqlparse.sql.Token(
-            sqlparse.tokens.Keyword,
-            ", ".join(c.sql for c in ctes)
-        )
+        token = sqlparse.sql.Token(sqlparse.tokens.Keyword, cte_sql)
         parsed.insert_after(with_stmt, token)
 
         return str(parsed)
@@ -278,7 +306,7 @@ class Compiler:
 
         # This stores the ctes which will all be recursively
         # gathered and then "injected" into the model.
-        prepended_ctes: List[InjectedCTE] = []
+        prepended_ctes: Dict[str, InjectedCTE] = {}
 
         # extra_ctes are added to the model by
         # RuntimeRefResolver.create_relation, which adds an
@@ -295,27 +323,17 @@ class Compiler:
             if not cte_model.is_ephemeral_model:
                 raise InternalException(f'{cte.id} is not ephemeral')
 
-            # This model has already been compiled, so it's been
-            # through here before
-            if getattr(cte_model, 'compiled', False):
-                assert isinstance(cte_model, tuple(COMPILED_TYPES.values()))
-                cte_model = cast(NonSourceCompiledNode, cte_model)
-                new_prepended_ctes = cte_model.extra_ctes
-
-            # if the cte_model isn't compiled, i.e. first time here
-            else:
-                # This is an ephemeral parsed model that we can compile.
-                # Compile and update the node
-                cte_model = self._compile_node(
-                    cte_model, manifest, extra_context)
-                # recursively call this method
-                cte_model, new_prepended_ctes = \
-                    self._recursively_prepend_ctes(
-                        cte_model, manifest, extra_context
-                    )
-                # Save compiled SQL file and sync manifest
-                self._write_node(cte_model)
-                manifest.sync_update_node(cte_model)
+            # If the model has already been compiled, it's been through here
+            # before. Otherwise compile it, unless another thread is already
+            # compiling it: then wait for that.
+            cte_model = manifest.get_or_compile_ephemeral(
+                cte.id,
+                lambda node: self._compile_ephemeral(
+                    node, manifest, extra_context
+                ),
+            )
+            assert isinstance(cte_model, tuple(COMPILED_TYPES.values()))
+            new_prepended_ctes = cte_model.extra_ctes
 
             _extend_prepended_ctes(prepended_ctes, new_prepended_ctes)
 
@@ -327,19 +345,38 @@ class Compiler:
 
             _add_prepended_cte(prepended_ctes, InjectedCTE(id=cte.id, sql=sql))
 
+        injected_ctes = list(prepended_ctes.values())
         injected_sql = self._inject_ctes_into_sql(
             model.compiled_sql,
-            prepended_ctes,
+            injected_ctes,
         )
         model._pre_injected_sql = model.compiled_sql
         model.compiled_sql = injected_sql
         model.extra_ctes_injected = True
-        model.extra_ctes = prepended_ctes
-        model.validate(model.to_dict(omit_none=True))
+        model.extra_ctes = injected_ctes
+        if flags.STRICT_MODE:
+            # validating is slow, and only the injected CTEs changed
+            model.validate(model.to_dict(omit_none=True))
 
         manifest.update_node(model)
 
-        return model, prepended_ctes
+        return model, injected_ctes
+
+    def _compile_ephemeral(
+        self,
+        node: ManifestNode,
+        manifest: Manifest,
+        extra_context: Optional[Dict[str, Any]],
+    ) -> NonSourceCompiledNode:
+        # This is an ephemeral parsed model that we can compile.
+        compiled = self._compile_node(node, manifest, extra_context)
+        # recursively inject its own ephemeral models
+        compiled, _ = self._recursively_prepend_ctes(
+            compiled, manifest, extra_context
+        )
+        # Save compiled SQL file
+        self._write_node(compiled)
+        return compiled
 
     # creates a compiled_node from the ManifestNode passed in,
     # creates a "context" dictionary for jinja rendering,
@@ -1,7 +1,11 @@
+import hashlib
 import json
 import os
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from typing import (
-    Any, Dict, NoReturn, Optional, Mapping
+    Any, Dict, Iterator, NoReturn, Optional, Mapping
 )
 
 from dbt import flags
@@ -105,6 +109,62 @@ class ContextMeta(type):
         return type.__new__(mcls, name, bases, new_dct)
 
 
+# Partial parsing needs to know which vars and env vars a file used, so that
+# changing one of them only re-parses the files that used it. While a file is
+# parsed inside 'record_parse_dependencies', every var() and env_var() call is
+# recorded along with a checksum of the value that could change between runs:
+# the CLI value of a var, or the value of an env var. Vars set in
+# dbt_project.yml are covered by the project hash instead. An empty checksum
+# means the var wasn't set on the CLI, or the env var wasn't set.
+@dataclass
+class ParseDependencies:
+    vars: Dict[str, str] = field(default_factory=dict)
+    env_vars: Dict[str, str] = field(default_factory=dict)
+
+
+_parse_dependencies = threading.local()
+
+
+def value_checksum(value: Any) -> str:
+    data = json.dumps(value, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(data).hexdigest()
+
+
+def cli_var_checksum(cli_vars: Mapping[str, Any], var_name: str) -> str:
+    if var_name not in cli_vars:
+        return ''
+    return value_checksum(cli_vars[var_name])
+
+
+def env_var_checksum(var_name: str) -> str:
+    if var_name not in os.environ:
+        return ''
+    return value_checksum(os.environ[var_name])
+
+
+@contextmanager
+def record_parse_dependencies() -> Iterator[ParseDependencies]:
+    previous = getattr(_parse_dependencies, 'current', None)
+    dependencies = ParseDependencies()
+    _parse_dependencies.current = dependencies
+    try:
+        yield dependencies
+    finally:
+        _parse_dependencies.current = previous
+
+
+def record_var(cli_vars: Mapping[str, Any], var_name: str) -> None:
+    dependencies = getattr(_parse_dependencies, 'current', None)
+    if dependencies is not None:
+        dependencies.vars[var_name] = cli_var_checksum(cli_vars, var_name)
+
+
+def record_env_var(var_name: str) -> None:
+    dependencies = getattr(_parse_dependencies, 'current', None)
+    if dependencies is not None:
+        dependencies.env_vars[var_name] = env_var_checksum(var_name)
+
+
 class Var:
     UndefinedVarError = "Required var '{}' not found in config:\nVars "\
                         "supplied to {} = {}"
@@ -151,6 +211,7 @@ class Var:
         return get_rendered(raw, self._context)
 
     def __call__(self, var_name, default=_VAR_NOTSET):
+        record_var(self._cli_vars, var_name)
         if self.has_var(var_name):
             return self.get_rendered_var(var_name)
         elif default is not self._VAR_NOTSET:
@@ -278,6 +339,7 @@ class BaseContext(metaclass=ContextMeta):
 
         If the default is None, raise an exception for an undefined variable.
         """
+        record_env_var(var)
         if var in os.environ:
             return os.environ[var]
         elif default is not None:
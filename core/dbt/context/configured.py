@@ -4,7 +4,7 @@ from dbt.contracts.connection import AdapterRequiredConfig
 from dbt.node_types import NodeType
 from dbt.utils import MultiDict
 
-from dbt.context.base import contextproperty, Var
+from dbt.context.base import contextproperty, record_var, Var
 from dbt.context.target import TargetContext
 
 
@@ -40,6 +40,7 @@ class ConfiguredVar(Var):
         self._project_name = project_name
 
     def __call__(self, var_name, default=Var._VAR_NOTSET):
+        record_var(self._config.cli_vars, var_name)
         my_config = self._config.load_dependencies()[self._project_name]
 
         # cli vars > active project > local project
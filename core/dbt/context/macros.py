@@ -1,8 +1,9 @@
 from typing import (
-    Any, Dict, Iterable, Union, Optional, List, Iterator, Mapping, Set
+    Any, Dict, Iterable, Union, Optional, List, Iterator, Mapping
 )
 
 from dbt.clients.jinja import MacroGenerator, MacroStack
+from dbt.contracts.graph.manifest import MacroMethods
 from dbt.contracts.graph.parsed import ParsedMacro
 from dbt.include.global_project import PROJECT_NAME as GLOBAL_PROJECT_NAME
 from dbt.exceptions import (
@@ -13,81 +14,243 @@ from dbt.exceptions import (
 FlatNamespace = Dict[str, MacroGenerator]
 NamespaceMember = Union[FlatNamespace, MacroGenerator]
 FullNamespace = Dict[str, NamespaceMember]
+MacroMap = Dict[str, ParsedMacro]
+SharedMember = Union[ParsedMacro, MacroMap]
 
 
-# The point of this class is to collect the various macros
-# and provide the ability to flatten them into the ManifestContexts
-# that are created for jinja, so that macro calls can be resolved.
-# Creates special iterators and _keys methods to flatten the lists.
-# When this class is created it has a static 'local_namespace' which
-# depends on the package of the node, so it only works for one
-# particular local package at a time for "flattening" into a context.
-# 'get_by_package' should work for any macro.
-class MacroNamespace(Mapping):
+# The macros of a manifest sorted into packages, and the names they resolve
+# to for each search package. None of this depends on the node a context is
+# generated for, so it's built once per manifest (see 'get_shared_namespace')
+# and shared by the MacroNamespace of every node. Don't modify it after it
+# has been shared.
+class SharedMacroNamespace:
     def __init__(
         self,
-        global_namespace: FlatNamespace,  # root package macros
-        local_namespace: FlatNamespace,   # packages for *this* node
-        global_project_namespace: FlatNamespace,  # internal packages
-        packages: Dict[str, FlatNamespace],  # non-internal packages
-    ):
-        self.global_namespace: FlatNamespace = global_namespace
-        self.local_namespace: FlatNamespace = local_namespace
-        self.packages: Dict[str, FlatNamespace] = packages
-        self.global_project_namespace: FlatNamespace = global_project_namespace
-
-    def _search_order(self) -> Iterable[Union[FullNamespace, FlatNamespace]]:
-        yield self.local_namespace   # local package
-        yield self.global_namespace  # root package
-        yield self.packages          # non-internal packages
+        root_package: str,
+        internal_packages: List[str],
+    ) -> None:
+        self.root_package = root_package
+        # internal packages comes from get_adapter_package_names
+        self.internal_package_names = set(internal_packages)
+        self.internal_package_names_order = internal_packages
+        self.internal_packages: Dict[str, MacroMap] = {}
+        self.packages: Dict[str, MacroMap] = {}
+        self._global_project_namespace: Optional[MacroMap] = None
+        # search package -> name -> macro or package
+        self._members: Dict[str, Dict[str, SharedMember]] = {}
+        # what this was built from, see 'is_valid_for'
+        self._macros: Optional[Mapping[str, ParsedMacro]] = None
+        self._macro_count = 0
+
+    @classmethod
+    def from_macros(
+        cls,
+        macros: Mapping[str, ParsedMacro],
+        root_package: str,
+        internal_packages: List[str],
+    ) -> 'SharedMacroNamespace':
+        shared = cls(root_package, internal_packages)
+        shared.add_macros(macros.values())
+        shared._macros = macros
+        shared._macro_count = len(macros)
+        return shared
+
+    def is_valid_for(
+        self,
+        macros: Mapping[str, ParsedMacro],
+        root_package: str,
+        internal_packages: List[str],
+    ) -> bool:
+        return (
+            self._macros is macros and
+            self._macro_count == len(macros) and
+            self.root_package == root_package and
+            self.internal_package_names_order == internal_packages
+        )
+
+    def add_macro(self, macro: ParsedMacro) -> None:
+        # internal macros (from plugins) will be processed separately from
+        # project macros, so store them in a different place
+        if macro.package_name in self.internal_package_names:
+            hierarchy = self.internal_packages
+        else:
+            hierarchy = self.packages
+        namespace = hierarchy.setdefault(macro.package_name, {})
+        if macro.name in namespace:
+            raise_duplicate_macro_name(
+                namespace[macro.name], macro, macro.package_name
+            )
+        namespace[macro.name] = macro
+        self._global_project_namespace = None
+        self._members.clear()
+
+    def add_macros(self, macros: Iterable[ParsedMacro]) -> None:
+        for macro in macros:
+            self.add_macro(macro)
+
+    @property
+    def global_project_namespace(self) -> MacroMap:
+        if self._global_project_namespace is None:
+            # Iterate in reverse-order and overwrite: the packages that are
+            # first in the list are the ones we want to "win".
+            namespace: MacroMap = {}
+            for pkg in reversed(self.internal_package_names_order):
+                if pkg in self.internal_packages:
+                    namespace.update(self.internal_packages[pkg])
+            self._global_project_namespace = namespace
+        return self._global_project_namespace
+
+    def _search_order(
+        self, search_package: str
+    ) -> Iterable[Mapping[str, SharedMember]]:
+        if search_package not in self.internal_package_names:
+            yield self.packages.get(search_package, {})  # local package
+        yield self.packages.get(self.root_package, {})  # root package
+        yield self.packages  # non-internal packages
         yield {
             GLOBAL_PROJECT_NAME: self.global_project_namespace,  # dbt
         }
         yield self.global_project_namespace  # other internal project besides dbt
 
-    # provides special keys method for MacroNamespace iterator
-    # returns keys from local_namespace, global_namespace, packages,
-    # global_project_namespace
-    def _keys(self) -> Set[str]:
-        keys: Set[str] = set()
-        for search in self._search_order():
-            keys.update(search)
-        return keys
+    def members(self, search_package: str) -> Dict[str, SharedMember]:
+        """Return what each name resolves to for nodes in 'search_package',
+        either a macro or the macros of a package.
+        """
+        members = self._members.get(search_package)
+        if members is None:
+            members = {}
+            for namespace in self._search_order(search_package):
+                for name, member in namespace.items():
+                    members.setdefault(name, member)
+            self._members[search_package] = members
+        return members
+
+
+# Contexts are generated for every node, often for the same manifest from
+# several threads, so the shared namespace is kept on the manifest until the
+# macros or the packages change. Threads that find it missing at the same
+# time each build one, which is harmless.
+def get_shared_namespace(
+    manifest: MacroMethods,
+    root_package: str,
+    internal_packages: List[str],
+) -> SharedMacroNamespace:
+    shared = manifest._shared_macro_namespace
+    if shared is None or not shared.is_valid_for(
+        manifest.macros, root_package, internal_packages
+    ):
+        shared = SharedMacroNamespace.from_macros(
+            manifest.macros, root_package, internal_packages
+        )
+        manifest._shared_macro_namespace = shared
+    return shared
+
+
+# The macros of one package in a MacroNamespace. The macros are bound to the
+# context when they're looked up.
+class PackageNamespace(Mapping):
+    def __init__(self, macros: MacroMap, namespace: 'MacroNamespace'):
+        self._macros = macros
+        self._namespace = namespace
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._macros)
+
+    def __len__(self):
+        return len(self._macros)
+
+    def __getitem__(self, key: str) -> MacroGenerator:
+        return self._namespace.bind(self._macros[key])
+
+
+# The point of this class is to provide the macros of a
+# SharedMacroNamespace to the ManifestContexts that are created for
+# jinja, so that macro calls can be resolved. A MacroNamespace
+# is specific to one node: the search package of that node determines
+# the 'local' macros, and each macro is wrapped in a MacroGenerator
+# bound to the node's context the first time it's looked up, so the
+# shared namespace itself is never modified.
+# 'get_from_package' should work for any macro.
+class MacroNamespace(Mapping):
+    def __init__(
+        self,
+        shared: SharedMacroNamespace,
+        search_package: str,
+        ctx: Dict[str, Any],
+        node: Optional[Any] = None,
+        thread_ctx: Optional[MacroStack] = None,
+    ):
+        self.shared = shared
+        self.search_package = search_package
+        self.ctx = ctx
+        self.node = node
+        self.thread_ctx = thread_ctx
+        self._members = shared.members(search_package)
+        # macro unique_id -> MacroGenerator for this node
+        self._bound: FlatNamespace = {}
+        self._package_namespaces: Dict[str, PackageNamespace] = {}
+
+    def bind(self, macro: ParsedMacro) -> MacroGenerator:
+        macro_func = self._bound.get(macro.unique_id)
+        if macro_func is None:
+            # MacroGenerator is in clients/jinja.py
+            # a MacroGenerator object is a callable object that will
+            # execute the MacroGenerator.__call__ function
+            macro_func = MacroGenerator(
+                macro, self.ctx, self.node, self.thread_ctx
+            )
+            self._bound[macro.unique_id] = macro_func
+        return macro_func
+
+    def _package_namespace(self, package_name: str) -> PackageNamespace:
+        namespace = self._package_namespaces.get(package_name)
+        if namespace is None:
+            if package_name == GLOBAL_PROJECT_NAME:
+                macros = self.shared.global_project_namespace
+            else:
+                macros = self.shared.packages[package_name]
+            namespace = PackageNamespace(macros, self)
+            self._package_namespaces[package_name] = namespace
+        return namespace
 
-    # special iterator using special keys
     def __iter__(self) -> Iterator[str]:
-        for key in self._keys():
-            yield key
+        return iter(self._members)
 
     def __len__(self):
-        return len(self._keys())
+        return len(self._members)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._members
 
     def __getitem__(self, key: str) -> NamespaceMember:
-        for dct in self._search_order():
-            if key in dct:
-                return dct[key]
-        raise KeyError(key)
+        member = self._members[key]
+        if isinstance(member, ParsedMacro):
+            return self.bind(member)
+        return self._package_namespace(key)  # type: ignore
 
     def get_from_package(
         self, package_name: Optional[str], name: str
     ) -> Optional[MacroGenerator]:
-        pkg: FlatNamespace
+        macro: Optional[ParsedMacro]
         if package_name is None:
-            return self.get(name)
+            return self.get(name)  # type: ignore
         elif package_name == GLOBAL_PROJECT_NAME:
-            return self.global_project_namespace.get(name)
-        elif package_name in self.packages:
-            return self.packages[package_name].get(name)
+            macro = self.shared.global_project_namespace.get(name)
+        elif package_name in self.shared.packages:
+            macro = self.shared.packages[package_name].get(name)
         else:
             raise_compiler_error(
                 f"Could not find package '{package_name}'"
             )
+        if macro is None:
+            return None
+        return self.bind(macro)
 
 
-# This class builds the MacroNamespace by adding macros to
-# internal_packages or packages, and locals/globals.
-# Call 'build_namespace' to return a MacroNamespace.
-# This is used by ManifestContext (and subclasses)
+# This class builds the MacroNamespace for the package of a node.
+# Call 'bind_namespace' with the shared namespace of the manifest, or
+# 'build_namespace' with the macros to use instead, to return a
+# MacroNamespace. This is used by ManifestContext (and subclasses)
 class MacroNamespaceBuilder:
     def __init__(
         self,
@@ -100,83 +263,33 @@ class MacroNamespaceBuilder:
         self.root_package = root_package
         self.search_package = search_package
         # internal packages comes from get_adapter_package_names
-        self.internal_package_names = set(internal_packages)
         self.internal_package_names_order = internal_packages
-        # macro_func is added here if in root package, since
-        # the root package acts as a "global" namespace, overriding
-        # everything else except local external package macro calls
-        self.globals: FlatNamespace = {}
-        # macro_func is added here if it's the package for this node
-        self.locals: FlatNamespace = {}
-        # Create a dictionary of [package name][macro name] =
-        #     MacroGenerator object which acts like a function
-        self.internal_packages: Dict[str, FlatNamespace] = {}
-        self.packages: Dict[str, FlatNamespace] = {}
+        self.shared = SharedMacroNamespace(root_package, internal_packages)
         self.thread_ctx = thread_ctx
         self.node = node
 
-    def _add_macro_to(
-        self,
-        hierarchy: Dict[str, FlatNamespace],
-        macro: ParsedMacro,
-        macro_func: MacroGenerator,
-    ):
-        if macro.package_name in hierarchy:
-            namespace = hierarchy[macro.package_name]
-        else:
-            namespace = {}
-            hierarchy[macro.package_name] = namespace
-
-        if macro.name in namespace:
-            raise_duplicate_macro_name(
-                macro_func.macro, macro, macro.package_name
-            )
-        hierarchy[macro.package_name][macro.name] = macro_func
-
     def add_macro(self, macro: ParsedMacro, ctx: Dict[str, Any]):
-        macro_name: str = macro.name
+        self.shared.add_macro(macro)
 
-        # MacroGenerator is in clients/jinja.py
-        # a MacroGenerator object is a callable object that will
-        # execute the MacroGenerator.__call__ function
-        macro_func: MacroGenerator = MacroGenerator(
-            macro, ctx, self.node, self.thread_ctx
-        )
+    def add_macros(self, macros: Iterable[ParsedMacro], ctx: Dict[str, Any]):
+        self.shared.add_macros(macros)
 
-        # internal macros (from plugins) will be processed separately from
-        # project macros, so store them in a different place
-        if macro.package_name in self.internal_package_names:
-            self._add_macro_to(self.internal_packages, macro, macro_func)
-        else:
-            # if it's not an internal package
-            self._add_macro_to(self.packages, macro, macro_func)
-            # add to locals if it's the package this node is in
-            if macro.package_name == self.search_package:
-                self.locals[macro_name] = macro_func
-            # add to globals if it's in the root package
-            elif macro.package_name == self.root_package:
-                self.globals[macro_name] = macro_func
+    def get_shared_namespace(
+        self, manifest: MacroMethods
+    ) -> SharedMacroNamespace:
+        return get_shared_namespace(
+            manifest, self.root_package, self.internal_package_names_order
+        )
 
-    def add_macros(self, macros: Iterable[ParsedMacro], ctx: Dict[str, Any]):
-        for macro in macros:
-            self.add_macro(macro, ctx)
+    def bind_namespace(
+        self, shared: SharedMacroNamespace, ctx: Dict[str, Any]
+    ) -> MacroNamespace:
+        return MacroNamespace(
+            shared, self.search_package, ctx, self.node, self.thread_ctx
+        )
 
     def build_namespace(
         self, macros: Iterable[ParsedMacro], ctx: Dict[str, Any]
     ) -> MacroNamespace:
         self.add_macros(macros, ctx)
-
-        # Iterate in reverse-order and overwrite: the packages that are first
-        # in the list are the ones we want to "win".
-        global_project_namespace: FlatNamespace = {}
-        for pkg in reversed(self.internal_package_names_order):
-            if pkg in self.internal_packages:
-                # add the macros pointed to by this package name
-                global_project_namespace.update(self.internal_packages[pkg])
-
-        return MacroNamespace(
-            global_namespace=self.globals,  # root package macros
-            local_namespace=self.locals,  # packages for *this* node
-            global_project_namespace=global_project_namespace,  # internal packages
-            packages=self.packages,  # non internal_packages
-        )
+        return self.bind_namespace(self.shared, ctx)
@@ -1,6 +1,6 @@
 from typing import List
 
-from dbt.clients.jinja import MacroStack
+from dbt.clients.jinja import LazyMacroContext, MacroStack
 from dbt.contracts.connection import AdapterRequiredConfig
 from dbt.contracts.graph.manifest import Manifest
 from dbt.context.macro_resolver import TestMacroNamespace
@@ -24,6 +24,8 @@ class ManifestContext(ConfiguredContext):
         search_package: str,
     ) -> None:
         super().__init__(config)
+        # the macro names are resolved when they're looked up, see to_dict
+        self._ctx = LazyMacroContext()
         self.manifest = manifest
         # this is the package of the node for which this context was built
         self.search_package = search_package
@@ -34,12 +36,12 @@ class ManifestContext(ConfiguredContext):
         self.namespace = self._build_namespace()
 
     def _build_namespace(self):
-        # this takes all the macros in the manifest and adds them
-        # to the MacroNamespaceBuilder stored in self.namespace
+        # The macros in the manifest are sorted into packages once and
+        # shared by all contexts, only the macros that are looked up are
+        # bound to this context.
         builder = self._get_namespace_builder()
-        return builder.build_namespace(
-            self.manifest.macros.values(), self._ctx
-        )
+        shared = builder.get_shared_namespace(self.manifest)
+        return builder.bind_namespace(shared, self._ctx)
 
     def _get_namespace_builder(self) -> MacroNamespaceBuilder:
         # avoid an import loop
@@ -58,12 +60,18 @@ class ManifestContext(ConfiguredContext):
     # This does not use the Mashumaro code
     def to_dict(self):
         dct = super().to_dict()
-        # This moves all of the macros in the 'namespace' into top level
-        # keys in the manifest dictionary
         if isinstance(self.namespace, TestMacroNamespace):
+            # This moves all of the macros in the 'namespace' into top level
+            # keys in the manifest dictionary
             dct.update(self.namespace.local_namespace)
         else:
-            dct.update(self.namespace)
+            # The macros in the 'namespace' are top level names of the
+            # context, but they're only bound when they're looked up. They
+            # replace the other members with the same names, as if they
+            # had been copied in.
+            for name in [name for name in dct if name in self.namespace]:
+                dct[name] = self.namespace[name]
+            dct.macros = self.namespace
         return dct
 
 
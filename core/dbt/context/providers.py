@@ -1,8 +1,10 @@
 import abc
 import os
+import threading
+from contextlib import contextmanager
 from typing import (
     Callable, Any, Dict, Optional, Union, List, TypeVar, Type, Iterable,
-    Mapping,
+    Iterator, Mapping,
 )
 from typing_extensions import Protocol
 
@@ -62,6 +64,26 @@ import agate
 _MISSING = object()
 
 
+class _Introspection(threading.local):
+    allowed: bool = True
+
+
+_INTROSPECTION = _Introspection()
+
+
+@contextmanager
+def introspection_disallowed() -> Iterator[None]:
+    """While this is active, the adapter methods that look at or change the
+    database (the ones that get replaced at parse time) raise in the current
+    thread. Nodes are compiled this way before their parents have run.
+    """
+    _INTROSPECTION.allowed = False
+    try:
+        yield
+    finally:
+        _INTROSPECTION.allowed = True
+
+
 # base classes
 class RelationProxy:
     def __init__(self, adapter):
@@ -412,6 +434,14 @@ class RuntimeDatabaseWrapper(BaseDatabaseWrapper):
 
     def __getattr__(self, name):
         if name in self._adapter._available_:
+            if (
+                not _INTROSPECTION.allowed and
+                name in self._adapter._parse_replacements_
+            ):
+                raise RuntimeException(
+                    f'adapter.{name} cannot be used until the parents of the '
+                    f'node have run'
+                )
             return getattr(self._adapter, name)
         else:
             raise AttributeError(
@@ -1,7 +1,8 @@
 import hashlib
 import os
 from dataclasses import dataclass, field
-from typing import List, Optional, Union
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Union
 
 from dbt.dataclass_schema import dbtClassMixin, StrEnum
 
@@ -102,6 +103,29 @@ class FileHash(dbtClassMixin):
         return cls(name=name, checksum=checksum)
 
 
+@dataclass
+class FileStat(dbtClassMixin):
+    """The parts of os.stat() that tell us whether a file has changed since
+    it was last read, without reading it.
+    """
+    mtime_ns: int
+    size: int
+    inode: int
+
+    @classmethod
+    def from_path(cls, path: str) -> 'FileStat':
+        st = os.stat(path)
+        return cls(mtime_ns=st.st_mtime_ns, size=st.st_size, inode=st.st_ino)
+
+    def modified_since(self, when: datetime) -> bool:
+        """Return whether the file was modified at or after the given naive
+        UTC datetime. A file modified while it was being read can have the
+        same stat before and after the change, so its stat can't be trusted.
+        """
+        timestamp = when.replace(tzinfo=timezone.utc).timestamp()
+        return self.mtime_ns >= int(timestamp * 1e9)
+
+
 @dataclass
 class RemoteFile(dbtClassMixin):
     @property
@@ -130,6 +154,9 @@ class SourceFile(dbtClassMixin):
     project_name: Optional[str] = None
     # Parse file type: i.e. which parser will process this file
     parse_file_type: Optional[ParseFileType] = None
+    # The file stat at the time it was read, used by partial parsing to
+    # skip reading files that have not changed
+    stat: Optional[FileStat] = None
     # we don't want to serialize this
     _contents: Optional[str] = None
     # the unique IDs contained in this file
@@ -144,6 +171,10 @@ class SourceFile(dbtClassMixin):
     macro_patches: List[MacroKey] = field(default_factory=list)
     # any source patches in this file. The entries are package, name pairs
     source_patches: List[SourceKey] = field(default_factory=list)
+    # the vars and env vars used while parsing this file, with checksums of
+    # the values they had. See dbt.context.base.record_parse_dependencies
+    vars: Dict[str, str] = field(default_factory=dict)
+    env_vars: Dict[str, str] = field(default_factory=dict)
 
     @property
     def search_key(self) -> Optional[str]:
@@ -15,13 +15,15 @@ from dbt.contracts.graph.parsed import (
     SeedConfig,
     TestConfig,
     same_seeds,
+    schema_test_fingerprint,
+    seed_body_fingerprint,
 )
 from dbt.node_types import NodeType
 from dbt.contracts.util import Replaceable
 
 from dbt.dataclass_schema import dbtClassMixin
 from dataclasses import dataclass, field
-from typing import Optional, List, Union, Dict, Type
+from typing import Any, Optional, List, Union, Dict, Type
 
 
 @dataclass
@@ -100,6 +102,9 @@ class CompiledSeedNode(CompiledNode):
     def same_body(self, other) -> bool:
         return same_seeds(self, other)
 
+    def body_fingerprint(self) -> Optional[Any]:
+        return seed_body_fingerprint(self)
+
 
 @dataclass
 class CompiledSnapshotNode(CompiledNode):
@@ -138,6 +143,9 @@ class CompiledSchemaTestNode(CompiledNode, HasTestMetadata):
             True
         )
 
+    def content_fingerprint(self) -> Optional[str]:
+        return schema_test_fingerprint(self)
+
 
 CompiledTestNode = Union[CompiledDataTestNode, CompiledSchemaTestNode]
 
@@ -1,11 +1,13 @@
 import abc
 import enum
+import threading
 from dataclasses import dataclass, field
 from itertools import chain, islice
 from multiprocessing.synchronize import Lock
+from pathlib import Path
 from typing import (
     Dict, List, Optional, Union, Mapping, MutableMapping, Any, Set, Tuple,
-    TypeVar, Callable, Iterable, Generic, cast, AbstractSet
+    TypeVar, Callable, Iterable, Iterator, Generic, cast, AbstractSet
 )
 from typing_extensions import Protocol
 from uuid import UUID
@@ -435,6 +437,352 @@ def _update_into(dest: MutableMapping[str, T], new_item: T):
     dest[unique_id] = new_item
 
 
+class FlatGraphSection(Dict[str, Dict[str, Any]]):
+    """One section of the 'graph' context variable: a dict of unique IDs to
+    resources as dictionaries. It holds the resources themselves, and each
+    one is converted to a dictionary the first time it's looked up. Anything
+    that reads the values, like copying it or serializing it to JSON, sees
+    the dictionaries.
+    """
+    def __init__(self, resources: Mapping[str, Any]) -> None:
+        super().__init__(resources)
+
+    def __getitem__(self, key: str) -> Dict[str, Any]:
+        # Two threads might convert the same resource, which is harmless
+        value: Any = super().__getitem__(key)
+        if not isinstance(value, dict):
+            value = value.to_dict(omit_none=False)
+            super().__setitem__(key, value)
+        return value
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def __iter__(self) -> Iterator[str]:
+        # dict(section) only uses __getitem__ when __iter__ is overridden
+        return super().__iter__()
+
+    def values(self):  # type: ignore
+        return [self[key] for key in self]
+
+    def items(self):  # type: ignore
+        return [(key, self[key]) for key in self]
+
+    def copy(self) -> Dict[str, Dict[str, Any]]:
+        return dict(self.items())
+
+    def __repr__(self) -> str:
+        return repr(self.copy())
+
+    def __eq__(self, other: object) -> bool:
+        return self.copy() == other
+
+    def __ne__(self, other: object) -> bool:
+        return not self == other
+
+    def __reduce__(self):
+        # pickle the resources that haven't been converted as they are
+        return (self.__class__, (dict(super().items()),))
+
+
+class MacroNameIndex:
+    """An index of macros by name, with the locality of each macro relative
+    to the root project. It's only valid for the macros dict, root project
+    and adapter type that it was built for, see 'is_valid_for'.
+    """
+    def __init__(
+        self,
+        macros: Mapping[str, ParsedMacro],
+        root_project_name: str,
+        adapter_type: Optional[str],
+    ) -> None:
+        # avoid an import cycle
+        from dbt.adapters.factory import get_adapter_package_names
+        self._macros = macros
+        self._macro_count = len(macros)
+        self.root_project_name = root_project_name
+        self.adapter_type = adapter_type
+        packages = set(get_adapter_package_names(adapter_type))
+        self.storage: Dict[str, List[MacroCandidate]] = {}
+        for macro in macros.values():
+            candidate = MacroCandidate(
+                locality=_get_locality(macro, root_project_name, packages),
+                macro=macro,
+            )
+            self.storage.setdefault(macro.name, []).append(candidate)
+        # (materialization name, adapter type) -> the resolved macro. See
+        # 'find_materialization_macro_by_name'. Threads running nodes share
+        # this, but at worst they resolve the same materialization twice.
+        self.materializations: Dict[
+            Tuple[str, str], Optional[ParsedMacro]
+        ] = {}
+        # the lookups that were cached, and that were resolved
+        self.materialization_hits = 0
+        self.materialization_misses = 0
+        self._stats_lock = threading.Lock()
+
+    def is_valid_for(
+        self,
+        macros: Mapping[str, ParsedMacro],
+        root_project_name: str,
+        adapter_type: Optional[str],
+    ) -> bool:
+        # the macros dict is sometimes updated directly instead of through
+        # 'add_macro', so also check that it's the same size
+        return (
+            macros is self._macros and
+            len(macros) == self._macro_count and
+            root_project_name == self.root_project_name and
+            adapter_type == self.adapter_type
+        )
+
+    def candidates(self, name: str) -> List[MacroCandidate]:
+        return self.storage.get(name, [])
+
+    def record_materialization(self, hit: bool) -> None:
+        with self._stats_lock:
+            if hit:
+                self.materialization_hits += 1
+            else:
+                self.materialization_misses += 1
+
+
+class FqnTrie:
+    """A trie of flattened fqns. Each level keeps the unique IDs of the nodes
+    at or below it, with the length of their flattened fqn.
+    """
+    def __init__(self) -> None:
+        self.children: Dict[str, 'FqnTrie'] = {}
+        self.unique_ids: Dict[str, int] = {}
+
+    def add(self, parts: List[str], unique_id: str) -> None:
+        trie = self
+        trie.unique_ids[unique_id] = len(parts)
+        for part in parts:
+            trie = trie.children.setdefault(part, FqnTrie())
+            trie.unique_ids[unique_id] = len(parts)
+
+    def search(self, parts: List[str], glob: str) -> Iterator[str]:
+        """Yield the unique IDs of the nodes whose flattened fqn starts with
+        the given parts, up to the first glob. Like 'is_selected_node', the
+        fqn must have at least as many parts as the selector.
+        """
+        trie = self
+        for part in parts:
+            if part == glob:
+                break
+            child = trie.children.get(part)
+            if child is None:
+                return
+            trie = child
+        for unique_id, length in trie.unique_ids.items():
+            if length >= len(parts):
+                yield unique_id
+
+
+def _flatten_fqn(fqn: List[str]) -> List[str]:
+    return [item for segment in fqn for item in segment.split('.')]
+
+
+class SelectorIndex:
+    """Inverted indexes over the nodes, sources, exposures and macros of a
+    manifest, for the node selector methods. Each index is built the first time it's
+    used. They're only valid for the manifest contents they were built from,
+    see 'is_valid_for'.
+    """
+    def __init__(self, manifest: 'Manifest') -> None:
+        self._manifest = manifest
+        self._sizes = self._get_sizes(manifest)
+        self._tags: Optional[Dict[str, Set[str]]] = None
+        self._packages: Optional[Dict[str, Set[str]]] = None
+        self._paths: Optional[Dict[Path, Dict[Path, Set[str]]]] = None
+        self._fqns: Optional[Tuple[Dict[str, Set[str]], FqnTrie, FqnTrie]] = (
+            None
+        )
+        # macro unique ID -> the unique IDs of the macros and of the nodes
+        # that call it directly
+        self._macro_callers: Optional[
+            Tuple[Dict[str, Set[str]], Dict[str, Set[str]]]
+        ] = None
+        # config key -> (value, unique IDs) pairs
+        self._configs: Dict[Tuple[str, ...], List[Tuple[Any, Set[str]]]] = {}
+
+    @staticmethod
+    def _get_sizes(manifest: 'Manifest') -> Tuple[int, int, int, int]:
+        return (
+            len(manifest.nodes),
+            len(manifest.sources),
+            len(manifest.exposures),
+            len(manifest.macros),
+        )
+
+    def is_valid_for(self, manifest: 'Manifest') -> bool:
+        # nodes are usually added through the manifest, but not always, so
+        # also check the sizes
+        return (
+            manifest is self._manifest and
+            self._get_sizes(manifest) == self._sizes
+        )
+
+    def _all_nodes(self) -> Iterator[Tuple[str, Any]]:
+        return chain(
+            self._manifest.nodes.items(),
+            self._manifest.sources.items(),
+            self._manifest.exposures.items(),
+        )
+
+    @property
+    def tags(self) -> Dict[str, Set[str]]:
+        if self._tags is None:
+            tags: Dict[str, Set[str]] = {}
+            for unique_id, node in self._all_nodes():
+                for tag in node.tags:
+                    tags.setdefault(tag, set()).add(unique_id)
+            self._tags = tags
+        return self._tags
+
+    @property
+    def packages(self) -> Dict[str, Set[str]]:
+        if self._packages is None:
+            packages: Dict[str, Set[str]] = {}
+            for unique_id, node in self._all_nodes():
+                packages.setdefault(node.package_name, set()).add(unique_id)
+            self._packages = packages
+        return self._packages
+
+    @property
+    def paths(self) -> Dict[Path, Dict[Path, Set[str]]]:
+        """root path -> file path or any of its directories -> unique IDs"""
+        if self._paths is None:
+            paths: Dict[Path, Dict[Path, Set[str]]] = {}
+            for unique_id, node in self._all_nodes():
+                prefixes = paths.setdefault(Path(node.root_path), {})
+                file_path = Path(node.original_file_path)
+                for path in chain((file_path,), file_path.parents):
+                    prefixes.setdefault(path, set()).add(unique_id)
+            self._paths = paths
+        return self._paths
+
+    def _get_fqns(self) -> Tuple[Dict[str, Set[str]], FqnTrie, FqnTrie]:
+        # fqn selection only applies to nodes
+        if self._fqns is None:
+            names: Dict[str, Set[str]] = {}
+            fqns = FqnTrie()
+            unscoped_fqns = FqnTrie()
+            for unique_id, node in self._manifest.nodes.items():
+                names.setdefault(node.fqn[-1], set()).add(unique_id)
+                fqns.add(_flatten_fqn(node.fqn), unique_id)
+                if len(node.fqn) > 1:
+                    unscoped_fqns.add(_flatten_fqn(node.fqn[1:]), unique_id)
+            self._fqns = names, fqns, unscoped_fqns
+        return self._fqns
+
+    def fqn_matches(self, selector: str, glob: str) -> Set[str]:
+        """Return the unique IDs of the nodes that match the fqn selector,
+        with or without their package name. See 'is_selected_node'.
+        """
+        names, fqns, unscoped_fqns = self._get_fqns()
+        parts = selector.split('.')
+        matches = set(names.get(selector, ()))
+        matches.update(fqns.search(parts, glob))
+        matches.update(unscoped_fqns.search(parts, glob))
+        return matches
+
+    def _get_macro_callers(
+        self
+    ) -> Tuple[Dict[str, Set[str]], Dict[str, Set[str]]]:
+        if self._macro_callers is None:
+            macro_callers: Dict[str, Set[str]] = {}
+            for unique_id, macro in self._manifest.macros.items():
+                for called in macro.depends_on.macros:
+                    macro_callers.setdefault(called, set()).add(unique_id)
+            node_callers: Dict[str, Set[str]] = {}
+            for unique_id, node in chain(
+                self._manifest.nodes.items(), self._manifest.exposures.items()
+            ):
+                for called in node.depends_on.macros:
+                    node_callers.setdefault(called, set()).add(unique_id)
+            self._macro_callers = macro_callers, node_callers
+        return self._macro_callers
+
+    def nodes_using_macros(self, macros: Iterable[str]) -> Set[str]:
+        """Return the unique IDs of the nodes that call any of the given
+        macros, directly or through other macros.
+        """
+        macro_callers, node_callers = self._get_macro_callers()
+        seen: Set[str] = set(macros)
+        stack = list(seen)
+        while stack:
+            for caller in macro_callers.get(stack.pop(), ()):
+                if caller not in seen:
+                    seen.add(caller)
+                    stack.append(caller)
+        nodes: Set[str] = set()
+        for macro in seen:
+            nodes.update(node_callers.get(macro, ()))
+        return nodes
+
+    def config_values(
+        self,
+        key: Tuple[str, ...],
+        get_value: Callable[[Any], Any],
+    ) -> List[Tuple[Any, Set[str]]]:
+        """Return the distinct values of the given config key on nodes and
+        sources, with the unique IDs that have each one. get_value gets the
+        value from a config, and raises AttributeError if it isn't set.
+        """
+        values = self._configs.get(key)
+        if values is None:
+            by_value: Dict[Any, Set[str]] = {}
+            values = []
+            for unique_id, node in chain(
+                self._manifest.nodes.items(), self._manifest.sources.items()
+            ):
+                try:
+                    value = get_value(node.config)
+                except AttributeError:
+                    continue
+                try:
+                    by_value.setdefault(value, set()).add(unique_id)
+                except TypeError:
+                    # lists and dicts can't be grouped
+                    values.append((value, {unique_id}))
+            values.extend(by_value.items())
+            self._configs[key] = values
+        return values
+
+
+class EphemeralCompileCache:
+    """Makes the threads that compile ephemeral models just in time, to
+    inject them into the models that use them, compile each one once. The
+    compiled nodes themselves are stored in the manifest.
+    """
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # unique ID -> the lock held while the ephemeral model is compiled
+        self._compiling: Dict[str, threading.Lock] = {}
+        # ephemeral models that were found compiled, and that were compiled
+        self.hits = 0
+        self.misses = 0
+
+    def lock_for(self, unique_id: str) -> threading.Lock:
+        with self._lock:
+            lock = self._compiling.get(unique_id)
+            if lock is None:
+                lock = threading.Lock()
+                self._compiling[unique_id] = lock
+            return lock
+
+    def record(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+
 # This contains macro methods that are in both the Manifest
 # and the MacroManifest
 class MacroMethods:
@@ -442,6 +790,8 @@ class MacroMethods:
     def __init__(self):
         self.macros = []
         self.metadata = {}
+        self._macro_name_index = None
+        self._shared_macro_namespace = None
 
     def find_macro_by_name(
         self, name: str, root_project_name: str, package: Optional[str]
@@ -495,22 +845,27 @@ class MacroMethods:
     ) -> CandidateList:
         """Find macros by their name.
         """
-        # avoid an import cycle
-        from dbt.adapters.factory import get_adapter_package_names
+        index = self._get_macro_name_index(root_project_name)
         candidates: CandidateList = CandidateList()
-        packages = set(get_adapter_package_names(self.metadata.adapter_type))
-        for unique_id, macro in self.macros.items():
-            if macro.name != name:
-                continue
-            candidate = MacroCandidate(
-                locality=_get_locality(macro, root_project_name, packages),
-                macro=macro,
-            )
+        for candidate in index.candidates(name):
             if filter is None or filter(candidate):
                 candidates.append(candidate)
 
         return candidates
 
+    # The index is built the first time a macro is looked up, and rebuilt
+    # after the macros change.
+    def _get_macro_name_index(self, root_project_name: str) -> MacroNameIndex:
+        adapter_type = self.metadata.adapter_type
+        index: Optional[MacroNameIndex] = self._macro_name_index
+        if (
+            index is None or
+            not index.is_valid_for(self.macros, root_project_name, adapter_type)
+        ):
+            index = MacroNameIndex(self.macros, root_project_name, adapter_type)
+            self._macro_name_index = index
+        return index
+
 
 @dataclass
 class ManifestStateCheck(dbtClassMixin):
@@ -546,7 +901,15 @@ class Manifest(MacroMethods):
     _docs_cache: Optional[DocCache] = None
     _sources_cache: Optional[SourceCache] = None
     _refs_cache: Optional[RefableCache] = None
+    # not in __reduce_ex__, they're rebuilt as needed
+    _macro_name_index: Optional[MacroNameIndex] = None
+    # see dbt.context.macros.get_shared_namespace
+    _shared_macro_namespace: Optional[Any] = None
+    _selector_index: Optional[SelectorIndex] = None
     _lock: Lock = field(default_factory=flags.MP_CONTEXT.Lock)
+    _ephemeral_cache: EphemeralCompileCache = field(
+        default_factory=EphemeralCompileCache
+    )
 
     def sync_update_node(
         self, new_node: NonSourceCompiledNode
@@ -568,6 +931,34 @@ class Manifest(MacroMethods):
             _update_into(self.nodes, new_node)
             return new_node
 
+    def get_or_compile_ephemeral(
+        self,
+        unique_id: str,
+        compile: Callable[[ManifestNode], NonSourceCompiledNode],
+    ) -> NonSourceCompiledNode:
+        """Return the compiled ephemeral model, compiling it with 'compile'
+        and updating the manifest if no thread has yet. Threads that need the
+        model while another thread compiles it wait for that instead of
+        compiling it again.
+        """
+        node = self.nodes[unique_id]
+        if not getattr(node, 'compiled', False):
+            with self._ephemeral_cache.lock_for(unique_id):
+                node = self.nodes[unique_id]
+                if not getattr(node, 'compiled', False):
+                    self._ephemeral_cache.record(hit=False)
+                    return self.sync_update_node(compile(node))
+        self._ephemeral_cache.record(hit=True)
+        # already compiled -> must be a NonSourceCompiledNode
+        return cast(NonSourceCompiledNode, node)
+
+    def get_ephemeral_cache_stats(self) -> Tuple[int, int]:
+        """Return the number of times an ephemeral model that was already
+        compiled was injected into a model, and the number of times one had
+        to be compiled first.
+        """
+        return self._ephemeral_cache.hits, self._ephemeral_cache.misses
+
     def update_exposure(self, new_exposure: ParsedExposure):
         _update_into(self.exposures, new_exposure)
 
@@ -582,20 +973,14 @@ class Manifest(MacroMethods):
         only build it once and avoid any concurrency issues around it.
         Make sure you don't call this until you're done with building your
         manifest!
+
+        Most nodes never look at the graph, so each resource is only
+        converted to a dictionary when it's first accessed.
         """
         self.flat_graph = {
-            'exposures': {
-                k: v.to_dict(omit_none=False)
-                for k, v in self.exposures.items()
-            },
-            'nodes': {
-                k: v.to_dict(omit_none=False)
-                for k, v in self.nodes.items()
-            },
-            'sources': {
-                k: v.to_dict(omit_none=False)
-                for k, v in self.sources.items()
-            }
+            'exposures': FlatGraphSection(self.exposures),
+            'nodes': FlatGraphSection(self.nodes),
+            'sources': FlatGraphSection(self.sources),
         }
 
     def find_disabled_by_name(
@@ -643,6 +1028,17 @@ class Manifest(MacroMethods):
     def find_materialization_macro_by_name(
         self, project_name: str, materialization_name: str, adapter_type: str
     ) -> Optional[ParsedMacro]:
+        # The result only depends on the macros, the root project and the
+        # arguments, so it's stored on the macro name index, which is rebuilt
+        # when any of those change. Macros replaced in place must go through
+        # 'update_macros' for that.
+        index = self._get_macro_name_index(project_name)
+        key = (materialization_name, adapter_type)
+        if key in index.materializations:
+            index.record_materialization(hit=True)
+            return index.materializations[key]
+        index.record_materialization(hit=False)
+
         candidates: CandidateList = CandidateList(chain.from_iterable(
             self._materialization_candidates_for(
                 project_name=project_name,
@@ -650,7 +1046,27 @@ class Manifest(MacroMethods):
                 adapter_type=atype,
             ) for atype in (adapter_type, None)
         ))
-        return candidates.last()
+        macro = candidates.last()
+        index.materializations[key] = macro
+        return macro
+
+    def get_materialization_cache_stats(self) -> Tuple[int, int]:
+        """Return the number of materialization lookups that were cached and
+        that had to be resolved, since the macros last changed.
+        """
+        index = self._macro_name_index
+        if index is None:
+            return 0, 0
+        return index.materialization_hits, index.materialization_misses
+
+    # The index is built the first time a node selector method uses it, and
+    # rebuilt after nodes, sources, exposures or macros are added.
+    def get_selector_index(self) -> SelectorIndex:
+        index = self._selector_index
+        if index is None or not index.is_valid_for(self):
+            index = SelectorIndex(self)
+            self._selector_index = index
+        return index
 
     def get_resource_fqns(self) -> Mapping[str, PathSet]:
         resource_fqns: Dict[str, Set[Tuple[str, ...]]] = {}
@@ -806,8 +1222,22 @@ class Manifest(MacroMethods):
             disabled=self.disabled,
             child_map=forward_edges,
             parent_map=backward_edges,
+            fingerprints=self.get_fingerprints(),
         )
 
+    def get_fingerprints(self) -> Dict[str, str]:
+        """Return the content fingerprint of each node, source and exposure
+        that has one.
+        """
+        fingerprints: Dict[str, str] = {}
+        for unique_id, node in chain(
+            self.nodes.items(), self.sources.items(), self.exposures.items()
+        ):
+            fingerprint = node.content_fingerprint()
+            if fingerprint is not None:
+                fingerprints[unique_id] = fingerprint
+        return fingerprints
+
     # When 'to_dict' is called on the Manifest, it substitues a
     # WritableManifest
     def __pre_serialize__(self):
@@ -944,12 +1374,16 @@ class Manifest(MacroMethods):
         """
         refables = set(NodeType.refable())
         merged = set()
-        for unique_id, node in other.nodes.items():
+        for unique_id in other.nodes:
+            # check the unique ID before looking up the node, which may only
+            # be deserialized on demand (see read_previous_manifest)
             current = self.nodes.get(unique_id)
-            if current and (
+            if not current or unique_id in selected:
+                continue
+            node = other.nodes[unique_id]
+            if (
                 node.resource_type in refables and
                 not node.is_ephemeral and
-                unique_id not in selected and
                 not adapter.get_relation(
                     current.database, current.schema, current.identifier
                 )
@@ -997,8 +1431,19 @@ class Manifest(MacroMethods):
             raise_compiler_error(msg)
 
         self.macros[macro.unique_id] = macro
+        self._macro_name_index = None
+        self._shared_macro_namespace = None
         self.get_file(source_file).macros.append(macro.unique_id)
 
+    def update_macros(self, macros: Mapping[str, ParsedMacro]) -> None:
+        """Add macros, replacing any with the same unique IDs. Use this
+        instead of updating 'macros' directly: replacing a macro doesn't
+        change the dict's size, so the macro lookups couldn't tell it changed.
+        """
+        self.macros.update(macros)
+        self._macro_name_index = None
+        self._shared_macro_namespace = None
+
     def has_file(self, source_file: SourceFile) -> bool:
         key = source_file.search_key
         if key is None:
@@ -1097,8 +1542,8 @@ class Manifest(MacroMethods):
 
     # This is called by ManifestLoader._get_cached/parse_with_cache,
     # which handles updating the ManifestLoader results with information
-    # from the "old_manifest", i.e. the pickle file if the checksums are
-    # the same.
+    # from the "old_manifest", i.e. the partial parse cache if the checksums
+    # are the same.
     def sanitized_update(
         self,
         source_file: SourceFile,
@@ -1145,7 +1590,7 @@ class Manifest(MacroMethods):
             self.add_exposure(source_file, exposure)
 
         # Note: There shouldn't be any patches in here after the cleanup.
-        # The pickled Manifest should have had all patches applied.
+        # The saved Manifest should have had all patches applied.
         patched = False
         for name in old_file.patches:
             patch = _expect_value(
@@ -1204,6 +1649,8 @@ class MacroManifest(MacroMethods):
     def __init__(self, macros):
         self.macros = macros
         self.metadata = ManifestMetadata()
+        self._macro_name_index = None
+        self._shared_macro_namespace = None
         # This is returned by the 'graph' context property
         # in the ProviderContext class.
         self.flat_graph = {}
@@ -1257,6 +1704,13 @@ class WritableManifest(ArtifactMixin):
     metadata: ManifestMetadata = field(metadata=dict(
         description='Metadata about the manifest',
     ))
+    fingerprints: Optional[Mapping[UniqueID, str]] = field(
+        default=None,
+        metadata=dict(description=(
+            'A mapping from nodes to a hash of the contents that state '
+            'comparison checks'
+        )),
+    )
 
 
 def _check_duplicates(
@@ -264,6 +264,17 @@ class BaseConfig(
                     return False
         return True
 
+    @classmethod
+    def comparable_contents(cls, unrendered: Dict[str, Any]) -> Dict[str, Any]:
+        """Return the items of an unrendered config that same_contents
+        compares.
+        """
+        excluded = {
+            target_name for fld, target_name in cls._get_fields()
+            if not CompareBehavior.should_include(fld)
+        }
+        return {k: v for k, v in unrendered.items() if k not in excluded}
+
     @classmethod
     def _extract_dict(
         cls, src: Dict[str, Any], data: Dict[str, Any]
@@ -1,3 +1,5 @@
+import hashlib
+import json
 import os
 from dataclasses import dataclass, field
 from pathlib import Path
@@ -17,7 +19,7 @@ from dbt.dataclass_schema import (
     dbtClassMixin, ExtensibleDbtClassMixin
 )
 
-from dbt.clients.system import write_file
+from dbt.clients.file_writer import write_output
 from dbt.contracts.files import FileHash, MAXIMUM_SEED_SIZE_NAME
 from dbt.contracts.graph.unparsed import (
     UnparsedNode, UnparsedDocumentation, Quoting, Docs,
@@ -58,6 +60,17 @@ class ColumnInfo(
     _extra: Dict[str, Any] = field(default_factory=dict)
 
 
+def hash_contents(contents: Dict[str, Any]) -> Optional[str]:
+    """Hash the parts of a node that its same_contents compares. Returns None
+    if they can't be serialized, then the nodes have to be compared.
+    """
+    try:
+        serialized = json.dumps(contents, sort_keys=True)
+    except (TypeError, ValueError):
+        return None
+    return hashlib.sha256(serialized.encode('utf-8')).hexdigest()
+
+
 @dataclass
 class HasFqn(dbtClassMixin, Replaceable):
     fqn: List[str]
@@ -195,7 +208,7 @@ class ParsedNodeDefaults(ParsedNodeMandatory):
             target_path, subdirectory, self.package_name, path
         )
 
-        write_file(full_path, payload)
+        write_output(full_path, payload)
         return full_path
 
 
@@ -266,6 +279,39 @@ class ParsedNode(ParsedNodeDefaults, ParsedNodeMixins):
             True
         )
 
+    # The fingerprint methods mirror the 'same_*' methods: nodes with the same
+    # content_fingerprint have the same contents.
+    def body_fingerprint(self) -> Optional[Any]:
+        return self.raw_sql
+
+    def persisted_description_fingerprint(self) -> Dict[str, Any]:
+        persisted: Dict[str, Any] = {}
+        if self._persist_relation_docs():
+            persisted['description'] = self.description
+        if self._persist_column_docs():
+            persisted['columns'] = {
+                k: v.description for k, v in self.columns.items()
+            }
+        return persisted
+
+    def content_fingerprint(self) -> Optional[str]:
+        """Return a hash of what same_contents compares, or None if the node
+        has to be compared with same_contents.
+        """
+        body = self.body_fingerprint()
+        if body is None:
+            return None
+        return hash_contents({
+            'body': body,
+            'config': self.config.comparable_contents(self.unrendered_config),
+            'persisted_description': self.persisted_description_fingerprint(),
+            'fqn': self.fqn,
+            'database_representation': {
+                key: self.unrendered_config.get(key)
+                for key in ('database', 'schema', 'alias')
+            },
+        })
+
 
 @dataclass
 class ParsedAnalysisNode(ParsedNode):
@@ -328,6 +374,21 @@ def same_seeds(first: ParsedNode, second: ParsedNode) -> bool:
     return result
 
 
+def seed_body_fingerprint(node: ParsedNode) -> Optional[Any]:
+    # dbt warns when it can't tell whether a seed changed, so those seeds
+    # always go through same_seeds
+    if node.checksum.name == 'path':
+        return None
+    return node.checksum.to_dict()
+
+
+def schema_test_fingerprint(node: ParsedNode) -> Optional[str]:
+    return hash_contents({
+        'severity': node.unrendered_config.get('severity'),
+        'fqn': node.fqn,
+    })
+
+
 @dataclass
 class ParsedSeedNode(ParsedNode):
     # keep this in sync with CompiledSeedNode!
@@ -342,6 +403,9 @@ class ParsedSeedNode(ParsedNode):
     def same_body(self: T, other: T) -> bool:
         return same_seeds(self, other)
 
+    def body_fingerprint(self) -> Optional[Any]:
+        return seed_body_fingerprint(self)
+
 
 @dataclass
 class TestMetadata(dbtClassMixin, Replaceable):
@@ -387,6 +451,9 @@ class ParsedSchemaTestNode(ParsedNode, HasTestMetadata):
             True
         )
 
+    def content_fingerprint(self) -> Optional[str]:
+        return schema_test_fingerprint(self)
+
 
 @dataclass
 class IntermediateSnapshotNode(ParsedNode):
@@ -620,6 +687,28 @@ class ParsedSourceDefinition(
             True
         )
 
+    def content_fingerprint(self) -> Optional[str]:
+        """Return a hash of what same_contents compares, or None if the source
+        has to be compared with same_contents.
+        """
+        return hash_contents({
+            'database_representation': [
+                self.database, self.schema, self.identifier
+            ],
+            'fqn': self.fqn,
+            'config': self.config.comparable_contents(self.unrendered_config),
+            'quoting': self.quoting.to_dict(omit_none=False),
+            'freshness': (
+                None if self.freshness is None
+                else self.freshness.to_dict(omit_none=False)
+            ),
+            'loaded_at_field': self.loaded_at_field,
+            'external': (
+                None if self.external is None
+                else self.external.to_dict(omit_none=False)
+            ),
+        })
+
     def get_full_source_name(self):
         return f'{self.source_name}_{self.name}'
 
@@ -719,6 +808,20 @@ class ParsedExposure(UnparsedBaseNode, HasUniqueID, HasFqn):
             True
         )
 
+    def content_fingerprint(self) -> Optional[str]:
+        """Return a hash of what same_contents compares, or None if the
+        exposure has to be compared with same_contents.
+        """
+        return hash_contents({
+            'fqn': self.fqn,
+            'type': self.type,
+            'owner': self.owner.to_dict(omit_none=False),
+            'maturity': self.maturity,
+            'url': self.url,
+            'description': self.description,
+            'depends_on': sorted(set(self.depends_on.nodes)),
+        })
+
 
 ManifestNodes = Union[
     ParsedAnalysisNode,
@@ -1,7 +1,145 @@
+from dataclasses import dataclass
 from pathlib import Path
-from .graph.manifest import WritableManifest
-from typing import Optional
-from dbt.exceptions import IncompatibleSchemaException
+from .graph.compiled import COMPILED_TYPES, CompileResultNode, ManifestNode
+from .graph.manifest import ManifestMetadata, WritableManifest
+from .graph.parsed import (
+    ParsedAnalysisNode,
+    ParsedDataTestNode,
+    ParsedDocumentation,
+    ParsedExposure,
+    ParsedHookNode,
+    ParsedMacro,
+    ParsedModelNode,
+    ParsedNode,
+    ParsedRPCNode,
+    ParsedSchemaTestNode,
+    ParsedSeedNode,
+    ParsedSnapshotNode,
+    ParsedSourceDefinition,
+)
+from .results import NodeStatus
+from typing import (
+    Any, Callable, Dict, Generic, Iterator, List, Mapping, Optional, Type,
+    TypeVar,
+)
+from dbt.clients.system import read_json
+from dbt.dataclass_schema import dbtClassMixin
+from dbt.exceptions import IncompatibleSchemaException, RuntimeException
+from dbt.node_types import NodeType
+
+
+T = TypeVar('T')
+
+
+class LazyResources(Mapping[str, T], Generic[T]):
+    """A read-only mapping of unique IDs to the resources of an artifact.
+    Each resource is deserialized from its JSON the first time it's looked
+    up, so checking for a unique ID or iterating doesn't deserialize
+    anything.
+    """
+    def __init__(
+        self,
+        raw: Dict[str, Dict[str, Any]],
+        from_dict: Callable[[Dict[str, Any]], T],
+    ) -> None:
+        self._raw = raw
+        self._from_dict = from_dict
+        self._resources: Dict[str, T] = {}
+
+    def __getitem__(self, key: str) -> T:
+        resource = self._resources.get(key)
+        if resource is None:
+            resource = self._from_dict(self._raw[key])
+            self._resources[key] = resource
+        return resource
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._raw
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._raw)
+
+    def __len__(self) -> int:
+        return len(self._raw)
+
+
+# Nodes whose resource type isn't known here are deserialized the way
+# WritableManifest deserializes its nodes, by trying each type in the union.
+@dataclass
+class _ManifestNodeField(dbtClassMixin):
+    node: ManifestNode
+
+
+@dataclass
+class _CompileResultNodesField(dbtClassMixin):
+    nodes: List[CompileResultNode]
+
+
+_PARSED_NODE_TYPES: Dict[str, Type[ParsedNode]] = {
+    NodeType.Analysis: ParsedAnalysisNode,
+    NodeType.Model: ParsedModelNode,
+    NodeType.Operation: ParsedHookNode,
+    NodeType.RPCCall: ParsedRPCNode,
+    NodeType.Seed: ParsedSeedNode,
+    NodeType.Snapshot: ParsedSnapshotNode,
+}
+
+
+def _manifest_node_from_dict(data: Dict[str, Any]) -> ManifestNode:
+    resource_type = data.get('resource_type')
+    cls: Optional[Type[ParsedNode]]
+    if resource_type == NodeType.Test:
+        if 'test_metadata' in data:
+            cls = ParsedSchemaTestNode
+        else:
+            cls = ParsedDataTestNode
+    else:
+        cls = _PARSED_NODE_TYPES.get(resource_type)  # type: ignore
+
+    if cls is None:
+        return _ManifestNodeField.from_dict({'node': data}).node
+    if data.get('compiled'):
+        return COMPILED_TYPES[cls].from_dict(data)  # type: ignore
+    return cls.from_dict(data)  # type: ignore
+
+
+def read_previous_manifest(path: str) -> WritableManifest:
+    """Read a manifest.json for state comparison and deferral. The JSON is
+    parsed up front, but the nodes, sources, macros, docs and exposures are
+    only deserialized when they're looked up. Selecting with state usually
+    only needs the unique IDs and fingerprints.
+    """
+    try:
+        data = read_json(path)
+    except (EnvironmentError, ValueError) as exc:
+        raise RuntimeException(
+            f'Could not read {WritableManifest.__name__} at "{path}" as '
+            f'JSON: {exc}'
+        ) from exc
+
+    disabled = data.get('disabled')
+    if disabled is not None:
+        disabled = _CompileResultNodesField.from_dict(
+            {'nodes': disabled}
+        ).nodes
+
+    return WritableManifest(
+        nodes=LazyResources(
+            data['nodes'], _manifest_node_from_dict  # type: ignore
+        ),
+        sources=LazyResources(
+            data['sources'], ParsedSourceDefinition.from_dict
+        ),
+        macros=LazyResources(data['macros'], ParsedMacro.from_dict),
+        docs=LazyResources(data['docs'], ParsedDocumentation.from_dict),
+        exposures=LazyResources(data['exposures'], ParsedExposure.from_dict),
+        selectors=data['selectors'],
+        disabled=disabled,
+        parent_map=data.get('parent_map'),
+        child_map=data.get('child_map'),
+        metadata=ManifestMetadata.from_dict(data['metadata']),
+        fingerprints=data.get('fingerprints'),
+    )
 
 
 class PreviousState:
@@ -12,7 +150,37 @@ class PreviousState:
         manifest_path = self.path / 'manifest.json'
         if manifest_path.exists() and manifest_path.is_file():
             try:
-                self.manifest = WritableManifest.read(str(manifest_path))
+                self.manifest = read_previous_manifest(str(manifest_path))
             except IncompatibleSchemaException as exc:
                 exc.add_filename(str(manifest_path))
                 raise
+
+        # only the runtimes are kept from run_results.json, so the results
+        # aren't deserialized
+        self.runtimes: Dict[str, float] = {}
+        results_path = self.path / 'run_results.json'
+        if results_path.exists() and results_path.is_file():
+            self.runtimes = self._read_runtimes(str(results_path))
+
+    def get_runtimes(self) -> Dict[str, float]:
+        """Return the execution time in seconds of each node that finished
+        in the previous run.
+        """
+        return self.runtimes
+
+    @staticmethod
+    def _read_runtimes(path: str) -> Dict[str, float]:
+        try:
+            data = read_json(path)
+        except (EnvironmentError, ValueError) as exc:
+            raise RuntimeException(
+                f'Could not read run results at "{path}" as JSON: {exc}'
+            ) from exc
+        unfinished = (
+            NodeStatus.Error, NodeStatus.RuntimeErr, NodeStatus.Skipped
+        )
+        return {
+            result['unique_id']: result['execution_time']
+            for result in data['results']
+            if result['status'] not in unfinished
+        }
@@ -16,6 +16,7 @@ TEST_NEW_PARSER = None
 WRITE_JSON = None
 PARTIAL_PARSE = None
 USE_COLORS = None
+PARSE_PROCESSES = None
 
 
 def env_set_truthy(key: str) -> Optional[str]:
@@ -53,7 +54,7 @@ MP_CONTEXT = _get_context()
 
 def reset():
     global STRICT_MODE, FULL_REFRESH, USE_CACHE, WARN_ERROR, TEST_NEW_PARSER, \
-        WRITE_JSON, PARTIAL_PARSE, MP_CONTEXT, USE_COLORS
+        WRITE_JSON, PARTIAL_PARSE, MP_CONTEXT, USE_COLORS, PARSE_PROCESSES
 
     STRICT_MODE = False
     FULL_REFRESH = False
@@ -64,11 +65,12 @@ def reset():
     PARTIAL_PARSE = False
     MP_CONTEXT = _get_context()
     USE_COLORS = True
+    PARSE_PROCESSES = None
 
 
 def set_from_args(args):
     global STRICT_MODE, FULL_REFRESH, USE_CACHE, WARN_ERROR, TEST_NEW_PARSER, \
-        WRITE_JSON, PARTIAL_PARSE, MP_CONTEXT, USE_COLORS
+        WRITE_JSON, PARTIAL_PARSE, MP_CONTEXT, USE_COLORS, PARSE_PROCESSES
 
     USE_CACHE = getattr(args, 'use_cache', USE_CACHE)
 
@@ -82,6 +84,7 @@ def set_from_args(args):
     TEST_NEW_PARSER = getattr(args, 'test_new_parser', TEST_NEW_PARSER)
     WRITE_JSON = getattr(args, 'write_json', WRITE_JSON)
     PARTIAL_PARSE = getattr(args, 'partial_parse', None)
+    PARSE_PROCESSES = getattr(args, 'parse_processes', None)
     MP_CONTEXT = _get_context()
 
     # The use_colors attribute will always have a value because it is assigned
@@ -14,5 +14,6 @@ from .cli import (  # noqa: F401
     parse_test_selectors,
     parse_from_selectors_definition,
 )
-from .queue import GraphQueue  # noqa: F401
+from .queue import GraphQueue, QueuePriority  # noqa: F401
 from .graph import Graph, UniqueId  # noqa: F401
+from .dag import DAG  # noqa: F401
@@ -0,0 +1,211 @@
+from collections import deque
+from typing import (
+    Deque, Dict, Iterable, Iterator, List, NewType, Optional, Set, Tuple
+)
+
+from dbt.exceptions import InternalException
+
+UniqueId = NewType('UniqueId', str)
+
+
+class DAG:
+    """A directed graph of unique IDs. Each node gets an integer index in the
+    order it was added, and edges are stored as lists of indexes in both
+    directions, so traversals don't hash unique IDs.
+
+    This is what the Linker builds and what Graph, GraphQueue and the
+    NodeSelector traverse. It's only converted to a networkx graph to write
+    graph.gpickle.
+    """
+    def __init__(self) -> None:
+        self._ids: List[UniqueId] = []
+        self._indexes: Dict[UniqueId, int] = {}
+        self._children: List[List[int]] = []
+        self._parents: List[List[int]] = []
+        self._edge_count = 0
+        # cached topological order, reset when the graph changes
+        self._order: Optional[List[int]] = None
+
+    @classmethod
+    def from_edges(
+        cls,
+        nodes: Iterable[UniqueId],
+        edges: Iterable[Tuple[UniqueId, UniqueId]],
+    ) -> 'DAG':
+        dag = cls()
+        for node in nodes:
+            dag.add_node(node)
+        for parent, child in edges:
+            dag.add_edge(parent, child)
+        return dag
+
+    def add_node(self, node: UniqueId) -> int:
+        index = self._indexes.get(node)
+        if index is None:
+            index = len(self._ids)
+            self._ids.append(node)
+            self._indexes[node] = index
+            self._children.append([])
+            self._parents.append([])
+            self._order = None
+        return index
+
+    def add_edge(self, parent: UniqueId, child: UniqueId) -> None:
+        parent_index = self.add_node(parent)
+        child_index = self.add_node(child)
+        children = self._children[parent_index]
+        if child_index not in children:
+            children.append(child_index)
+            self._parents[child_index].append(parent_index)
+            self._edge_count += 1
+            self._order = None
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __iter__(self) -> Iterator[UniqueId]:
+        return iter(self._ids)
+
+    def __contains__(self, node: object) -> bool:
+        return node in self._indexes
+
+    def nodes(self) -> List[UniqueId]:
+        return list(self._ids)
+
+    def edges(self) -> List[Tuple[UniqueId, UniqueId]]:
+        return [
+            (self._ids[parent], self._ids[child])
+            for parent, children in enumerate(self._children)
+            for child in children
+        ]
+
+    def edge_count(self) -> int:
+        return self._edge_count
+
+    def index(self, node: UniqueId) -> int:
+        try:
+            return self._indexes[node]
+        except KeyError:
+            raise InternalException(
+                f'Node {node} not found in the graph!'
+            ) from None
+
+    def node_id(self, index: int) -> UniqueId:
+        return self._ids[index]
+
+    def child_indexes(self, index: int) -> List[int]:
+        return self._children[index]
+
+    def parent_indexes(self, index: int) -> List[int]:
+        return self._parents[index]
+
+    def successors(self, node: UniqueId) -> List[UniqueId]:
+        return [self._ids[i] for i in self._children[self.index(node)]]
+
+    def predecessors(self, node: UniqueId) -> List[UniqueId]:
+        return [self._ids[i] for i in self._parents[self.index(node)]]
+
+    def in_degree(self, node: UniqueId) -> int:
+        return len(self._parents[self.index(node)])
+
+    def reachable(
+        self,
+        sources: Iterable[int],
+        max_depth: Optional[int] = None,
+        reverse: bool = False,
+    ) -> Set[int]:
+        """Return the indexes of the nodes within max_depth edges of any of
+        the sources, following edges backwards if reverse is set. The sources
+        themselves are included.
+        """
+        adjacency = self._parents if reverse else self._children
+        seen: Set[int] = set(sources)
+        frontier = list(seen)
+        depth = 0
+        while frontier and (max_depth is None or depth < max_depth):
+            next_frontier = []
+            for index in frontier:
+                for neighbor in adjacency[index]:
+                    if neighbor not in seen:
+                        seen.add(neighbor)
+                        next_frontier.append(neighbor)
+            frontier = next_frontier
+            depth += 1
+        return seen
+
+    def topological_order(self) -> List[int]:
+        """Return the node indexes with parents before their children. Nodes
+        that don't depend on each other stay in the order they were added.
+        """
+        if self._order is None:
+            remaining = [len(parents) for parents in self._parents]
+            queue: Deque[int] = deque(
+                index for index, count in enumerate(remaining) if count == 0
+            )
+            order: List[int] = []
+            while queue:
+                index = queue.popleft()
+                order.append(index)
+                for child in self._children[index]:
+                    remaining[child] -= 1
+                    if remaining[child] == 0:
+                        queue.append(child)
+            if len(order) != len(self._ids):
+                raise InternalException(
+                    'Found a cycle: {}'.format(
+                        ' --> '.join(self.find_cycle() or [])
+                    )
+                )
+            self._order = order
+        return self._order
+
+    def find_cycle(self) -> Optional[List[UniqueId]]:
+        """Return the nodes of a cycle in the graph, in order, or None if the
+        graph is acyclic.
+        """
+        # 0: not visited, 1: on the current path, 2: done
+        state = [0] * len(self._ids)
+        for root in range(len(self._ids)):
+            if state[root]:
+                continue
+            path: List[int] = [root]
+            # the next child to look at for each node on the path
+            positions: List[int] = [0]
+            state[root] = 1
+            while path:
+                index = path[-1]
+                children = self._children[index]
+                position = positions[-1]
+                if position == len(children):
+                    state[index] = 2
+                    path.pop()
+                    positions.pop()
+                    continue
+                positions[-1] += 1
+                child = children[position]
+                if state[child] == 1:
+                    cycle = path[path.index(child):]
+                    return [self._ids[i] for i in cycle]
+                elif state[child] == 0:
+                    state[child] = 1
+                    path.append(child)
+                    positions.append(0)
+        return None
+
+    def subgraph(self, nodes: Iterable[UniqueId]) -> 'DAG':
+        """Return a new graph with only the given nodes and the edges between
+        them. Nodes keep the order they have in this graph.
+        """
+        keep = sorted(self.index(node) for node in set(nodes))
+        dag = DAG()
+        for index in keep:
+            dag.add_node(self._ids[index])
+        for index in keep:
+            parent = dag._indexes[self._ids[index]]
+            for child in self._children[index]:
+                child_index = dag._indexes.get(self._ids[child])
+                if child_index is not None:
+                    dag._children[parent].append(child_index)
+                    dag._parents[child_index].append(parent)
+                    dag._edge_count += 1
+        return dag
@@ -1,53 +1,92 @@
 from typing import (
-    Set, Iterable, Iterator, Optional, NewType
+    Dict, FrozenSet, Set, Iterable, Iterator, List, Optional, Tuple
 )
-import networkx as nx  # type: ignore
 
-from dbt.exceptions import InternalException
+from .dag import DAG, UniqueId  # noqa: F401
 
-UniqueId = NewType('UniqueId', str)
+
+def _set_bits(value: int) -> Iterator[int]:
+    while value:
+        lowest = value & -value
+        yield lowest.bit_length() - 1
+        value ^= lowest
 
 
 class Graph:
-    """A wrapper around the networkx graph that understands SelectionCriteria
-    and how they interact with the graph.
+    """A wrapper around the DAG that understands SelectionCriteria and how
+    they interact with the graph.
+
+    The graph must not change once it's wrapped: the nodes reachable from a
+    set of nodes are cached, so that repeated selectors (and the criteria of
+    one selector) don't traverse the same part of the graph again.
     """
     def __init__(self, graph):
-        self.graph = graph
+        if not isinstance(graph, DAG):
+            # anything with networkx-style nodes() and edges(), like the
+            # graphs the unit tests build
+            graph = DAG.from_edges(graph.nodes(), graph.edges())
+        self.graph: DAG = graph
+        # (reverse, max_depth, source indexes) -> reachable indexes
+        self._reachable_cache: Dict[
+            Tuple[bool, Optional[int], FrozenSet[int]], FrozenSet[int]
+        ] = {}
 
     def nodes(self) -> Set[UniqueId]:
-        return set(self.graph.nodes())
+        return set(self.graph)
 
     def edges(self):
         return self.graph.edges()
 
     def __iter__(self) -> Iterator[UniqueId]:
-        return iter(self.graph.nodes())
+        return iter(self.graph)
+
+    def _reachable(
+        self,
+        nodes: Iterable[UniqueId],
+        max_depth: Optional[int],
+        reverse: bool,
+    ) -> Set[UniqueId]:
+        """Return the nodes within max_depth edges of any of the given nodes,
+        following edges backwards if reverse is set. A given node is only
+        included if another given node reaches it.
+
+        This is a single traversal from all of the nodes at once.
+        """
+        sources = frozenset(self.graph.index(node) for node in nodes)
+        key = (reverse, max_depth, sources)
+        reached = self._reachable_cache.get(key)
+        if reached is None:
+            if max_depth is not None and max_depth < 1:
+                reached = frozenset()
+            else:
+                # start one edge away, so the sources are only included when
+                # they can be reached from each other
+                if reverse:
+                    neighbors = self.graph.parent_indexes
+                else:
+                    neighbors = self.graph.child_indexes
+                start = {
+                    neighbor for index in sources
+                    for neighbor in neighbors(index)
+                }
+                depth = None if max_depth is None else max_depth - 1
+                reached = frozenset(
+                    self.graph.reachable(start, depth, reverse)
+                )
+            self._reachable_cache[key] = reached
+        return {self.graph.node_id(index) for index in reached}
 
     def ancestors(
         self, node: UniqueId, max_depth: Optional[int] = None
     ) -> Set[UniqueId]:
         """Returns all nodes having a path to `node` in `graph`"""
-        if not self.graph.has_node(node):
-            raise InternalException(f'Node {node} not found in the graph!')
-        with nx.utils.reversed(self.graph):
-            anc = nx.single_source_shortest_path_length(G=self.graph,
-                                                        source=node,
-                                                        cutoff=max_depth)\
-                .keys()
-        return anc - {node}
+        return self._reachable([node], max_depth, reverse=True)
 
     def descendants(
         self, node: UniqueId, max_depth: Optional[int] = None
     ) -> Set[UniqueId]:
         """Returns all nodes reachable from `node` in `graph`"""
-        if not self.graph.has_node(node):
-            raise InternalException(f'Node {node} not found in the graph!')
-        des = nx.single_source_shortest_path_length(G=self.graph,
-                                                    source=node,
-                                                    cutoff=max_depth)\
-            .keys()
-        return des - {node}
+        return self._reachable([node], max_depth, reverse=False)
 
     def select_childrens_parents(
         self, selected: Set[UniqueId]
@@ -58,18 +97,12 @@ class Graph:
     def select_children(
         self, selected: Set[UniqueId], max_depth: Optional[int] = None
     ) -> Set[UniqueId]:
-        descendants: Set[UniqueId] = set()
-        for node in selected:
-            descendants.update(self.descendants(node, max_depth))
-        return descendants
+        return self._reachable(selected, max_depth, reverse=False)
 
     def select_parents(
         self, selected: Set[UniqueId], max_depth: Optional[int] = None
     ) -> Set[UniqueId]:
-        ancestors: Set[UniqueId] = set()
-        for node in selected:
-            ancestors.update(self.ancestors(node, max_depth))
-        return ancestors
+        return self._reachable(selected, max_depth, reverse=True)
 
     def select_successors(self, selected: Set[UniqueId]) -> Set[UniqueId]:
         successors: Set[UniqueId] = set()
@@ -81,25 +114,75 @@ class Graph:
         """Create and return a new graph that is a shallow copy of the graph,
         but with only the nodes in include_nodes. Transitive edges across
         removed nodes are preserved as explicit new edges.
-        """
-        new_graph = nx.algorithms.transitive_closure(self.graph)
 
+        A selected node reaches the same selected nodes as in the full
+        graph, but edges that are implied by other edges are left out.
+        """
         include_nodes = set(selected)
 
-        for node in self:
-            if node not in include_nodes:
-                new_graph.remove_node(node)
-
         for node in include_nodes:
-            if node not in new_graph:
+            if node not in self.graph:
                 raise ValueError(
                     "Couldn't find model '{}' -- does it exist or is "
                     "it disabled?".format(node)
                 )
+
+        graph = self.graph
+        selected_indexes = sorted(graph.index(node) for node in include_nodes)
+        new_graph = DAG()
+        for index in selected_indexes:
+            new_graph.add_node(graph.node_id(index))
+
+        # only the nodes downstream of a selected node can connect two of them
+        reachable = graph.reachable(selected_indexes)
+
+        # Sets of selected nodes are kept as bitsets, so merging the sets of
+        # the children stays cheap on large graphs. For each node, children
+        # first:
+        #  - 'below' is the selected nodes downstream of the node
+        #  - 'beyond' is the selected nodes downstream of those
+        # A selected node only needs an edge to the ones that aren't beyond.
+        selected_bits = {
+            index: 1 << bit for bit, index in enumerate(selected_indexes)
+        }
+        below: Dict[int, int] = {}
+        beyond: Dict[int, int] = {}
+        # the sets of a node are dropped once all of its parents have used them
+        remaining_parents: Dict[int, int] = {
+            index: sum(
+                1 for parent in graph.parent_indexes(index)
+                if parent in reachable
+            )
+            for index in reachable
+        }
+        order: List[int] = [
+            index for index in graph.topological_order() if index in reachable
+        ]
+        for index in reversed(order):
+            node_below = 0
+            node_beyond = 0
+            for child in graph.child_indexes(index):
+                node_below |= below[child]
+                if child in selected_bits:
+                    node_below |= selected_bits[child]
+                    node_beyond |= below[child]
+                else:
+                    node_beyond |= beyond[child]
+                remaining_parents[child] -= 1
+                if remaining_parents[child] == 0:
+                    del below[child], beyond[child]
+            below[index] = node_below
+            beyond[index] = node_beyond
+            if index in selected_bits:
+                node = graph.node_id(index)
+                for bit in _set_bits(node_below & ~node_beyond):
+                    new_graph.add_edge(
+                        node, graph.node_id(selected_indexes[bit])
+                    )
         return Graph(new_graph)
 
     def subgraph(self, nodes: Iterable[UniqueId]) -> 'Graph':
         return Graph(self.graph.subgraph(nodes))
 
-    def get_dependent_nodes(self, node: UniqueId):
-        return nx.descendants(self.graph, node)
+    def get_dependent_nodes(self, node: UniqueId) -> Set[UniqueId]:
+        return self.descendants(node)
@@ -1,32 +1,48 @@
+import heapq
 import threading
 from queue import PriorityQueue
 from typing import (
-    Dict, Set, Optional
+    Dict, Set, Optional, List, Mapping, Tuple, Iterable
 )
 
-import networkx as nx  # type: ignore
-
-from .graph import UniqueId
+from .dag import DAG, UniqueId
 from dbt.contracts.graph.parsed import ParsedSourceDefinition, ParsedExposure
 from dbt.contracts.graph.compiled import GraphMemberNode
 from dbt.contracts.graph.manifest import Manifest
+from dbt.dataclass_schema import StrEnum
 from dbt.node_types import NodeType
 
 
+class QueuePriority(StrEnum):
+    # the number of blocking descendants
+    Descendants = 'descendants'
+    # the number of blocking nodes on the longest path starting at the node
+    LongestPath = 'longest-path'
+    # the expected runtime of the longest path starting at the node
+    CriticalPath = 'critical-path'
+
+
 class GraphQueue:
     """A fancy queue that is backed by the dependency graph.
-    Note: this will mutate input!
 
     This queue is thread-safe for `mark_done` calls, though you must ensure
     that separate threads do not call `.empty()` or `__len__()` and `.get()` at
     the same time, as there is an unlocked race!
     """
     def __init__(
-        self, graph: nx.DiGraph, manifest: Manifest, selected: Set[UniqueId]
+        self,
+        graph: DAG,
+        manifest: Manifest,
+        selected: Set[UniqueId],
+        priority: QueuePriority = QueuePriority.Descendants,
+        runtimes: Optional[Mapping[str, float]] = None,
     ):
         self.graph = graph
         self.manifest = manifest
         self._selected = selected
+        self.priority = priority
+        # expected runtimes in seconds, used by QueuePriority.CriticalPath
+        self.runtimes: Mapping[str, float] = runtimes or {}
         # store the queue as a priority queue.
         self.inner: PriorityQueue = PriorityQueue()
         # things that have been popped off the queue but not finished
@@ -34,12 +50,19 @@ class GraphQueue:
         self.in_progress: Set[UniqueId] = set()
         # things that are in the queue
         self.queued: Set[UniqueId] = set()
+        # the number of nodes that have been marked done
+        self._done_count = 0
         # this lock controls most things
         self.lock = threading.Lock()
         # store the 'score' of each node as a number. Lower is higher priority.
         self._scores = self._calculate_scores()
+        # the number of parents of each node that aren't done yet, by index
+        self._remaining_parents: List[int] = [
+            len(self.graph.parent_indexes(index))
+            for index in range(len(self.graph))
+        ]
         # populate the initial queue
-        self._find_new_additions()
+        self._find_new_additions(range(len(self.graph)))
         # awaits after task end
         self.some_task_done = threading.Condition(self.lock)
 
@@ -56,32 +79,120 @@ class GraphQueue:
             return False
         return True
 
-    def _calculate_scores(self) -> Dict[UniqueId, int]:
-        """Calculate the 'value' of each node in the graph based on how many
-        blocking descendants it has. We use this score for the internal
-        priority queue's ordering, so the quality of this metric is important.
+    def _calculate_scores(self) -> Dict[UniqueId, float]:
+        """Calculate the 'value' of each node in the graph, according to the
+        queue's priority. We use this score for the internal priority queue's
+        ordering, so the quality of this metric is important.
 
         The score is stored as a negative number because the internal
         PriorityQueue picks lowest values first.
 
-        We could do this in one pass over the graph instead of len(self.graph)
-        passes but this is easy. For large graphs this may hurt performance.
+        This is one pass over the graph in reverse topological order, so
+        every node is scored after all of its children.
 
         This operates on the graph, so it would require a lock if called from
         outside __init__.
 
-        :return Dict[str, int]: The score dict, mapping unique IDs to integer
+        :return Dict[str, float]: The score dict, mapping unique IDs to
             scores. Lower scores are higher priority.
         """
-        scores = {}
-        for node in self.graph.nodes():
-            score = -1 * len([
-                d for d in nx.descendants(self.graph, node)
-                if self._include_in_cost(d)
-            ])
-            scores[node] = score
+        order = list(reversed(self.graph.topological_order()))
+        if self.priority == QueuePriority.Descendants:
+            scores = self._descendant_scores(order)
+        else:
+            scores = self._path_scores(order)
+        return {
+            self.graph.node_id(index): score
+            for index, score in enumerate(scores)
+        }
+
+    def _descendant_scores(self, order: List[int]) -> List[float]:
+        # The descendants that count towards the cost are kept as a bitset per
+        # node, so that descendants shared by several children aren't counted
+        # twice.
+        node_bits: List[int] = [0] * len(self.graph)
+        descendant_bits: List[int] = [0] * len(self.graph)
+        scores: List[float] = [0] * len(self.graph)
+        bit_count = 0
+        for index in order:
+            if self._include_in_cost(self.graph.node_id(index)):
+                node_bits[index] = 1 << bit_count
+                bit_count += 1
+            descendants = 0
+            for child in self.graph.child_indexes(index):
+                descendants |= descendant_bits[child] | node_bits[child]
+            descendant_bits[index] = descendants
+            scores[index] = -bin(descendants).count('1')
         return scores
 
+    def _node_weight(self, node_id: UniqueId, default_runtime: float) -> float:
+        if self.priority == QueuePriority.CriticalPath:
+            if node_id in self.runtimes:
+                return self.runtimes[node_id]
+            elif self._include_in_cost(node_id):
+                return default_runtime
+            else:
+                return 0
+        elif self._include_in_cost(node_id):
+            return 1
+        else:
+            return 0
+
+    def _default_runtime(self) -> float:
+        # models without a known runtime are expected to take the average
+        if self.runtimes:
+            return sum(self.runtimes.values()) / len(self.runtimes)
+        else:
+            return 1.0
+
+    def _path_scores(self, order: List[int]) -> List[float]:
+        default_runtime = self._default_runtime()
+        path_lengths: List[float] = [0] * len(self.graph)
+        for index in order:
+            longest = max(
+                (path_lengths[child]
+                 for child in self.graph.child_indexes(index)),
+                default=0,
+            )
+            weight = self._node_weight(
+                self.graph.node_id(index), default_runtime
+            )
+            path_lengths[index] = weight + longest
+        return [-length for length in path_lengths]
+
+    def predict_makespan(self, threads: int) -> float:
+        """Simulate running every node in the queue on 'threads' threads, in
+        the queue's priority order, with each node taking its expected
+        runtime. Return the number of seconds it would take.
+
+        This must be called before any node is marked done.
+        """
+        default_runtime = self._default_runtime()
+        remaining_parents = list(self._remaining_parents)
+        ready: List[Tuple[float, UniqueId, int]] = [
+            self._ready_entry(index)
+            for index, count in enumerate(remaining_parents) if count == 0
+        ]
+        heapq.heapify(ready)
+        # (finish time, node, index) of the nodes being run
+        running: List[Tuple[float, UniqueId, int]] = []
+        now = 0.0
+        while ready or running:
+            while ready and len(running) < max(threads, 1):
+                _, node, index = heapq.heappop(ready)
+                runtime = self._node_weight(node, default_runtime)
+                heapq.heappush(running, (now + runtime, node, index))
+            now, _, index = heapq.heappop(running)
+            for child in self.graph.child_indexes(index):
+                remaining_parents[child] -= 1
+                if remaining_parents[child] == 0:
+                    heapq.heappush(ready, self._ready_entry(child))
+        return now
+
+    def _ready_entry(self, index: int) -> Tuple[float, UniqueId, int]:
+        node = self.graph.node_id(index)
+        return self._scores[node], node, index
+
     def get(
         self, block: bool = True, timeout: Optional[float] = None
     ) -> GraphMemberNode:
@@ -109,7 +220,9 @@ class GraphQueue:
         This takes the lock.
         """
         with self.lock:
-            return len(self.graph) - len(self.in_progress)
+            return (
+                len(self.graph) - self._done_count - len(self.in_progress)
+            )
 
     def empty(self) -> bool:
         """The graph queue is 'empty' if it all remaining nodes in the graph
@@ -130,14 +243,18 @@ class GraphQueue:
         """
         return node in self.in_progress or node in self.queued
 
-    def _find_new_additions(self) -> None:
-        """Find any nodes in the graph that need to be added to the internal
-        queue and add them.
+    def _find_new_additions(self, candidates: Iterable[int]) -> None:
+        """Find the nodes in candidates, given by index, that need to be added
+        to the internal queue and add them.
 
         Callers must hold the lock.
         """
-        for node, in_degree in self.graph.in_degree():
-            if not self._already_known(node) and in_degree == 0:
+        for index in candidates:
+            node = self.graph.node_id(index)
+            if (
+                self._remaining_parents[index] == 0 and
+                not self._already_known(node)
+            ):
                 self.inner.put((self._scores[node], node))
                 self.queued.add(node)
 
@@ -150,8 +267,12 @@ class GraphQueue:
         """
         with self.lock:
             self.in_progress.remove(node_id)
-            self.graph.remove_node(node_id)
-            self._find_new_additions()
+            self._done_count += 1
+            # only the children of the node can have become ready
+            children = self.graph.child_indexes(self.graph.index(node_id))
+            for child in children:
+                self._remaining_parents[child] -= 1
+            self._find_new_additions(children)
             self.inner.task_done()
             self.some_task_done.notify_all()
 
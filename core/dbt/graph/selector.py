@@ -1,8 +1,8 @@
 
-from typing import Set, List, Optional, Tuple
+from typing import Set, List, Optional, Tuple, Mapping
 
 from .graph import Graph, UniqueId
-from .queue import GraphQueue
+from .queue import GraphQueue, QueuePriority
 from .selector_methods import MethodManager
 from .selector_spec import SelectionCriteria, SelectionSpec
 
@@ -262,14 +262,21 @@ class NodeSelector(MethodManager):
         filtered_nodes = self.filter_selection(selected_nodes)
         return filtered_nodes
 
-    def get_graph_queue(self, spec: SelectionSpec) -> GraphQueue:
+    def get_graph_queue(
+        self,
+        spec: SelectionSpec,
+        priority: QueuePriority = QueuePriority.Descendants,
+        runtimes: Optional[Mapping[str, float]] = None,
+    ) -> GraphQueue:
         """Returns a queue over nodes in the graph that tracks progress of
         dependecies.
         """
         selected_nodes = self.get_selected(spec)
         new_graph = self.full_graph.get_subset_graph(selected_nodes)
         # should we give a way here for consumers to mutate the graph?
-        return GraphQueue(new_graph.graph, self.manifest, selected_nodes)
+        return GraphQueue(
+            new_graph.graph, self.manifest, selected_nodes, priority, runtimes
+        )
 
 
 class ResourceTypeSelector(NodeSelector):
@@ -1,7 +1,9 @@
 import abc
 from itertools import chain
 from pathlib import Path
-from typing import Set, List, Dict, Iterator, Tuple, Any, Union, Type, Optional
+from typing import (
+    Set, List, Dict, Iterable, Iterator, Tuple, Any, Union, Type, Optional
+)
 
 from dbt.dataclass_schema import StrEnum
 
@@ -142,6 +144,19 @@ class SelectorMethod(metaclass=abc.ABCMeta):
         yield from chain(self.parsed_nodes(included_nodes),
                          self.exposure_nodes(included_nodes))
 
+    def indexed_nodes(
+        self,
+        included_nodes: Set[UniqueId],
+        unique_ids: Iterable[str],
+    ) -> Iterator[UniqueId]:
+        """Yield the unique IDs found in one of the manifest's selector
+        indexes that are also included.
+        """
+        for key in unique_ids:
+            unique_id = UniqueId(key)
+            if unique_id in included_nodes:
+                yield unique_id
+
     @abc.abstractmethod
     def search(
         self,
@@ -176,10 +191,10 @@ class QualifiedNameSelectorMethod(SelectorMethod):
 
         :param str selector: The selector or node name
         """
-        parsed_nodes = list(self.parsed_nodes(included_nodes))
-        for node, real_node in parsed_nodes:
-            if self.node_is_match(selector, real_node.fqn):
-                yield node
+        index = self.manifest.get_selector_index()
+        yield from self.indexed_nodes(
+            included_nodes, index.fqn_matches(selector, SELECTOR_GLOB)
+        )
 
 
 class TagSelectorMethod(SelectorMethod):
@@ -187,9 +202,10 @@ class TagSelectorMethod(SelectorMethod):
         self, included_nodes: Set[UniqueId], selector: str
     ) -> Iterator[UniqueId]:
         """ yields nodes from included that have the specified tag """
-        for node, real_node in self.all_nodes(included_nodes):
-            if selector in real_node.tags:
-                yield node
+        index = self.manifest.get_selector_index()
+        yield from self.indexed_nodes(
+            included_nodes, index.tags.get(selector, ())
+        )
 
 
 class SourceSelectorMethod(SelectorMethod):
@@ -262,14 +278,12 @@ class PathSelectorMethod(SelectorMethod):
         # use '.' and not 'root' for easy comparison
         root = Path.cwd()
         paths = set(p.relative_to(root) for p in root.glob(selector))
-        for node, real_node in self.all_nodes(included_nodes):
-            if Path(real_node.root_path) != root:
-                continue
-            ofp = Path(real_node.original_file_path)
-            if ofp in paths:
-                yield node
-            elif any(parent in paths for parent in ofp.parents):
-                yield node
+        # nodes are indexed by their file path and all of its directories
+        index = self.manifest.get_selector_index().paths.get(root, {})
+        matches: Set[str] = set()
+        for path in paths:
+            matches.update(index.get(path, ()))
+        yield from self.indexed_nodes(included_nodes, matches)
 
 
 class PackageSelectorMethod(SelectorMethod):
@@ -277,9 +291,10 @@ class PackageSelectorMethod(SelectorMethod):
         self, included_nodes: Set[UniqueId], selector: str
     ) -> Iterator[UniqueId]:
         """Yields nodes from included that have the specified package"""
-        for node, real_node in self.all_nodes(included_nodes):
-            if real_node.package_name == selector:
-                yield node
+        index = self.manifest.get_selector_index()
+        yield from self.indexed_nodes(
+            included_nodes, index.packages.get(selector, ())
+        )
 
 
 def _getattr_descend(obj: Any, attrs: List[str]) -> Any:
@@ -323,14 +338,12 @@ class ConfigSelectorMethod(SelectorMethod):
         # search sources is kind of useless now source configs only have
         # 'enabled', which you can't really filter on anyway, but maybe we'll
         # add more someday, so search them anyway.
-        for node, real_node in self.configurable_nodes(included_nodes):
-            try:
-                value = _getattr_descend(real_node.config, parts)
-            except AttributeError:
-                continue
-            else:
-                if selector == value:
-                    yield node
+        values = self.manifest.get_selector_index().config_values(
+            tuple(parts), lambda config: _getattr_descend(config, parts)
+        )
+        for value, unique_ids in values:
+            if selector == value:
+                yield from self.indexed_nodes(included_nodes, unique_ids)
 
 
 class ResourceTypeSelectorMethod(SelectorMethod):
@@ -382,6 +395,7 @@ class StateSelectorMethod(SelectorMethod):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.macros_were_modified: Optional[List[str]] = None
+        self.nodes_using_modified_macros: Optional[Set[str]] = None
 
     def _macros_modified(self) -> List[str]:
         # we checked in the caller!
@@ -402,15 +416,42 @@ class StateSelectorMethod(SelectorMethod):
             else:
                 modified.append(f'{name} added')
 
-        for uid, macro in old_macros.items():
+        for uid in old_macros:
             if uid not in new_macros:
+                macro = old_macros[uid]
                 modified.append(f'{macro.package_name}.{macro.name} removed')
 
         return modified[:3]
 
+    def _previous_manifest(self) -> WritableManifest:
+        # we checked in search!
+        if self.previous_state is None or self.previous_state.manifest is None:
+            raise InternalException('No comparison manifest')
+        return self.previous_state.manifest
+
+    def _in_previous_manifest(self, unique_id: UniqueId) -> bool:
+        manifest = self._previous_manifest()
+        return (
+            unique_id in manifest.nodes or
+            unique_id in manifest.sources or
+            unique_id in manifest.exposures
+        )
+
+    def _previous_node(
+        self, unique_id: UniqueId
+    ) -> Optional[SelectorTarget]:
+        manifest = self._previous_manifest()
+        if unique_id in manifest.nodes:
+            return manifest.nodes[unique_id]
+        elif unique_id in manifest.sources:
+            return manifest.sources[unique_id]
+        elif unique_id in manifest.exposures:
+            return manifest.exposures[unique_id]
+        return None
+
     def check_modified(
         self,
-        old: Optional[SelectorTarget],
+        unique_id: UniqueId,
         new: SelectorTarget,
     ) -> bool:
         # check if there are any changes in macros, if so, log a warning the
@@ -421,18 +462,53 @@ class StateSelectorMethod(SelectorMethod):
                 log_str = ', '.join(self.macros_were_modified)
                 logger.warning(warning_tag(
                     f'During a state comparison, dbt detected a change in '
-                    f'macros. This will not be marked as a modification. Some '
-                    f'macros: {log_str}'
+                    f'macros. This will not be marked as a modification, '
+                    f'use state:modified.macros to select the nodes that use '
+                    f'them. Some macros: {log_str}'
                 ))
 
+        # Nodes with the same fingerprint have the same contents, which is a
+        # lot cheaper to check than comparing them. Different fingerprints
+        # are confirmed with same_contents, which also logs the seed warnings.
+        fingerprints = self._previous_manifest().fingerprints or {}
+        old_fingerprint = fingerprints.get(unique_id)
+        if (
+            old_fingerprint is not None and
+            old_fingerprint == new.content_fingerprint()
+        ):
+            return False
+
+        old = self._previous_node(unique_id)
         return not new.same_contents(old)  # type: ignore
 
+    def _nodes_using_modified_macros(self) -> Set[str]:
+        if self.nodes_using_modified_macros is None:
+            old_macros = self._previous_manifest().macros
+            # removed macros can't be called by anything in this manifest
+            modified = [
+                uid for uid, macro in self.manifest.macros.items()
+                if uid not in old_macros or
+                macro.macro_sql != old_macros[uid].macro_sql
+            ]
+            index = self.manifest.get_selector_index()
+            self.nodes_using_modified_macros = index.nodes_using_macros(
+                modified
+            )
+        return self.nodes_using_modified_macros
+
+    def check_modified_macros(
+        self,
+        unique_id: UniqueId,
+        new: SelectorTarget,
+    ) -> bool:
+        return unique_id in self._nodes_using_modified_macros()
+
     def check_new(
         self,
-        old: Optional[SelectorTarget],
+        unique_id: UniqueId,
         new: SelectorTarget,
     ) -> bool:
-        return old is None
+        return not self._in_previous_manifest(unique_id)
 
     def search(
         self, included_nodes: Set[UniqueId], selector: str
@@ -444,6 +520,7 @@ class StateSelectorMethod(SelectorMethod):
 
         state_checks = {
             'modified': self.check_modified,
+            'modified.macros': self.check_modified_macros,
             'new': self.check_new,
         }
         if selector in state_checks:
@@ -454,18 +531,8 @@ class StateSelectorMethod(SelectorMethod):
                 f'"{list(state_checks)}"'
             )
 
-        manifest: WritableManifest = self.previous_state.manifest
-
         for node, real_node in self.all_nodes(included_nodes):
-            previous_node: Optional[SelectorTarget] = None
-            if node in manifest.nodes:
-                previous_node = manifest.nodes[node]
-            elif node in manifest.sources:
-                previous_node = manifest.sources[node]
-            elif node in manifest.exposures:
-                previous_node = manifest.exposures[node]
-
-            if checker(previous_node, real_node):
+            if checker(node, real_node):
                 yield node
 
 
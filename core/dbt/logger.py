@@ -601,6 +601,20 @@ class ListLogHandler(LogMessageHandler):
         self.records.append(as_dict)
 
 
+class RecordCollector(logbook.Handler):
+    """Collect log records, so a worker process can send them back to the
+    main process to be dispatched there.
+    """
+    def __init__(self) -> None:
+        super().__init__(bubble=False)
+        self.records: List[logbook.LogRecord] = []
+
+    def emit(self, record: logbook.LogRecord) -> None:
+        # trigger the cached properties before the record is pickled
+        record.pull_information()
+        self.records.append(record)
+
+
 def _env_log_level(var_name: str) -> int:
     # convert debugging environment variable name to a log level
     if dbt.flags.env_set_truthy(var_name):
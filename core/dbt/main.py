@@ -34,6 +34,7 @@ import dbt.tracking
 from dbt.utils import ExitCodes
 from dbt.config import PROFILES_DIR, read_user_config
 from dbt.exceptions import RuntimeException, InternalException
+from dbt.graph import QueuePriority
 
 
 class DBTVersion(argparse.Action):
@@ -461,6 +462,59 @@ def _add_defer_argument(*subparsers):
         )
 
 
+def _add_queue_priority_argument(*subparsers):
+    for sub in subparsers:
+        sub.add_argument(
+            '--queue-priority',
+            choices=[str(p) for p in QueuePriority],
+            default=str(QueuePriority.Descendants),
+            help='''
+            How to prioritize the nodes that are ready to run: by the number
+            of models downstream of them ('descendants'), by the number of
+            models on the longest path downstream of them ('longest-path'),
+            or by the expected runtime of that path ('critical-path').
+            '''
+        )
+
+
+def _add_compile_ahead_argument(*subparsers):
+    for sub in subparsers:
+        sub.add_argument(
+            '--compile-ahead',
+            action='store_true',
+            help='''
+            Compile nodes on a background thread while their parents run.
+            Nodes that query the database while compiling are still compiled
+            when they run.
+            '''
+        )
+
+
+def _add_compile_processes_argument(*subparsers):
+    for sub in subparsers:
+        sub.add_argument(
+            '--compile-processes',
+            type=int,
+            default=None,
+            help='''
+            Compile nodes on a pool of this many processes. By default, nodes
+            are compiled on the threads, in a single process.
+            '''
+        )
+
+
+def _add_skip_unchanged_files_argument(*subparsers):
+    for sub in subparsers:
+        sub.add_argument(
+            '--skip-unchanged-files',
+            action='store_true',
+            help='''
+            Don't rewrite the files in target/compiled and target/run that
+            already have the contents dbt would write to them.
+            '''
+        )
+
+
 def _build_run_subparser(subparsers, base_subparser):
     run_sub = subparsers.add_parser(
         'run',
@@ -974,7 +1028,7 @@ def parse_args(args, cls=DBTArgumentParser):
     p.add_optional_argument_inverse(
         '--partial-parse',
         enable_help='''
-        Allow for partial parsing by looking for and writing to a pickle file
+        Allow for partial parsing by looking for and writing to a parse cache
         in the target directory. This overrides the user configuration file.
 
         WARNING: This can result in unexpected behavior if you use env_var()!
@@ -984,6 +1038,16 @@ def parse_args(args, cls=DBTArgumentParser):
         ''',
     )
 
+    p.add_argument(
+        '--parse-processes',
+        type=int,
+        default=None,
+        help='''
+        Parse models, snapshots, analyses and data tests on a pool of this
+        many processes. By default, all files are parsed in a single process.
+        ''',
+    )
+
     # if set, run dbt in single-threaded mode: thread count is ignored, and
     # calls go through `map` instead of the thread pool. This is useful for
     # getting performance information about aspects of dbt that normally run in
@@ -1037,6 +1101,16 @@ def parse_args(args, cls=DBTArgumentParser):
     _add_selection_arguments(snapshot_sub, seed_sub, models_name='select')
     # --defer
     _add_defer_argument(run_sub, test_sub)
+    # --queue-priority
+    _add_queue_priority_argument(run_sub, compile_sub, generate_sub, test_sub,
+                                 seed_sub, snapshot_sub)
+    # --compile-ahead
+    _add_compile_ahead_argument(run_sub, test_sub, snapshot_sub)
+    # --compile-processes
+    _add_compile_processes_argument(compile_sub, generate_sub)
+    # --skip-unchanged-files
+    _add_skip_unchanged_files_argument(run_sub, compile_sub, generate_sub,
+                                       test_sub, seed_sub, snapshot_sub)
     # --full-refresh
     _add_table_mutability_arguments(run_sub, compile_sub)
 
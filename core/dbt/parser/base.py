@@ -2,16 +2,19 @@ import abc
 import itertools
 import os
 from typing import (
-    List, Dict, Any, Generic, TypeVar
+    List, Dict, Any, Generic, Optional, TypeVar
 )
 
 from dbt.dataclass_schema import ValidationError
 
 from dbt import utils
-from dbt.clients.jinja import MacroGenerator
+from dbt.clients.jinja import (
+    MacroGenerator, STATIC_PARSE_CALLS, statically_extract_ref_source_config
+)
 from dbt.context.providers import (
     generate_parser_model,
     generate_generate_component_name_macro,
+    ParseConfigObject,
 )
 from dbt.adapters.factory import get_adapter
 from dbt.clients.jinja import get_rendered
@@ -127,6 +130,11 @@ class ConfiguredParser(
             manifest=manifest, config=root_project,
             component='alias'
         )
+        # how many nodes had their refs, sources and configs found
+        # statically, and how many had to be rendered
+        self.static_parse_count: int = 0
+        self.render_count: int = 0
+        self._static_calls_overridden: Optional[bool] = None
 
     @abc.abstractclassmethod
     def get_compiled_path(cls, block: ConfiguredBlockType) -> str:
@@ -242,6 +250,40 @@ class ConfiguredParser(
             parsed_node, self.root_project, self.manifest, config
         )
 
+    # A macro with the same name as ref(), source() or config() replaces it
+    # in the context, so then we can't know what calling it does without
+    # rendering.
+    def _static_calls_are_builtin(self) -> bool:
+        if self._static_calls_overridden is None:
+            self._static_calls_overridden = any(
+                macro.name in STATIC_PARSE_CALLS
+                for macro in self.manifest.macros.values()
+            )
+        return not self._static_calls_overridden
+
+    def static_parse(
+        self, parsed_node: IntermediateNode, config: ContextConfig
+    ) -> bool:
+        """If the only things the node's sql does are call ref(), source()
+        and config() with literal arguments, apply those calls to the node
+        and config the way rendering would, and return True. Otherwise, return
+        False without changing anything.
+        """
+        if not self._static_calls_are_builtin():
+            return False
+        calls = statically_extract_ref_source_config(parsed_node.raw_sql)
+        if calls is None:
+            return False
+        config_call = ParseConfigObject(parsed_node, config)
+        for name, args, kwargs in calls:
+            if name == 'ref':
+                parsed_node.refs.append(list(args))
+            elif name == 'source':
+                parsed_node.sources.append(list(args))
+            else:
+                config_call(*args, **kwargs)
+        return True
+
     def render_with_context(
         self, parsed_node: IntermediateNode, config: ContextConfig
     ) -> None:
@@ -249,6 +291,13 @@ class ConfiguredParser(
         # render the node's sql wtih macro capture enabled.
         # Note: this mutates the config object when config calls are rendered.
 
+        # Building the parse context and rendering is expensive, and most
+        # nodes don't need it.
+        if self.static_parse(parsed_node, config):
+            self.static_parse_count += 1
+            return
+        self.render_count += 1
+
         # during parsing, we don't have a connection, but we might need one, so
         # we have to acquire it.
         with get_adapter(self.root_project).connection_for(parsed_node):
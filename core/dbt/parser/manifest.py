@@ -1,12 +1,14 @@
 from dataclasses import dataclass
 from dataclasses import field
+import json
 import os
-import pickle
 from typing import (
-    Dict, Optional, Mapping, Callable, Any, List, Type, Union
+    Dict, Optional, Mapping, Callable, Any, List, Set, Type, Union
 )
 import time
 
+import logbook
+
 import dbt.exceptions
 import dbt.tracking
 import dbt.flags as flags
@@ -20,13 +22,17 @@ from dbt.helper_types import PathSet
 from dbt.logger import GLOBAL_LOGGER as logger, DbtProcessState
 from dbt.node_types import NodeType
 from dbt.clients.jinja import get_rendered, statically_extract_macro_calls
-from dbt.clients.system import make_directory
 from dbt.config import Project, RuntimeConfig
 from dbt.context.docs import generate_runtime_docs
 from dbt.context.macro_resolver import MacroResolver
-from dbt.context.base import generate_base_context
-from dbt.contracts.files import FileHash, ParseFileType
-from dbt.parser.read_files import read_files, load_source_file
+from dbt.context.base import (
+    generate_base_context, record_parse_dependencies, cli_var_checksum,
+    env_var_checksum,
+)
+from dbt.contracts.files import FileHash, ParseFileType, SourceFile
+from dbt.parser.read_files import (
+    read_files, load_source_file, read_files_executor, ensure_contents_loaded
+)
 from dbt.contracts.graph.compiled import ManifestNode
 from dbt.contracts.graph.manifest import (
     Manifest, Disabled, MacroManifest, ManifestStateCheck
@@ -42,13 +48,20 @@ from dbt.exceptions import (
     get_source_not_found_or_disabled_msg,
     warn_or_error,
 )
-from dbt.parser.base import BaseParser, Parser
+from dbt.parser.base import BaseParser, ConfiguredParser, Parser
 from dbt.parser.analysis import AnalysisParser
 from dbt.parser.data_test import DataTestParser
 from dbt.parser.docs import DocumentationParser
 from dbt.parser.hooks import HookParser
 from dbt.parser.macros import MacroParser
 from dbt.parser.models import ModelParser
+from dbt.parser.parallel import (
+    PARALLEL_PARSERS, ParseTask, ParseTaskResult, parse_files_in_processes
+)
+from dbt.parser.parse_cache import (
+    PARTIAL_PARSE_DIR_NAME, PARTIAL_PARSE_FORMAT_VERSION, SavedManifest,
+    read_parse_cache, write_parse_cache,
+)
 from dbt.parser.schemas import SchemaParser
 from dbt.parser.search import FileBlock
 from dbt.parser.seeds import SeedParser
@@ -59,7 +72,6 @@ from dbt.version import __version__
 
 from dbt.dataclass_schema import dbtClassMixin
 
-PARTIAL_PARSE_FILE_NAME = 'partial_parse.pickle'
 PARSING_STATE = DbtProcessState('parsing')
 DEFAULT_PARTIAL_PARSE = False
 
@@ -70,6 +82,9 @@ class ParserInfo(dbtClassMixin):
     parser: str
     elapsed: float
     path_count: int = 0
+    # nodes whose refs, sources and configs were found without rendering
+    static_parse_count: int = 0
+    render_count: int = 0
 
 
 # Part of saved performance info
@@ -85,6 +100,8 @@ class ProjectLoaderInfo(dbtClassMixin):
 @dataclass
 class ManifestLoaderInfo(dbtClassMixin, Writable):
     path_count: int = 0
+    static_parse_count: int = 0
+    render_count: int = 0
     is_partial_parse_enabled: Optional[bool] = None
     read_files_elapsed: Optional[float] = None
     load_macros_elapsed: Optional[float] = None
@@ -124,8 +141,14 @@ class ManifestLoader:
         # State check determines whether the old_manifest and the current
         # manifest match well enough to do partial parsing
         self.manifest.state_check = self.build_manifest_state_check()
+        # The results of files that were parsed on a process pool, by
+        # search key. They're merged in by 'parse_with_cache'.
+        self.parsed_in_processes: Dict[str, ParseTaskResult] = {}
         # This is a saved manifest from a previous run that's used for partial parsing
         self.old_manifest: Optional[Manifest] = self.read_saved_manifest()
+        # Dependency projects whose config changed since the saved manifest
+        # was written. Only the files from those projects are re-parsed.
+        self.changed_projects: Set[str] = self.get_changed_projects()
 
     # This is the method that builds a complete manifest. We sometimes
     # use an abbreviated process in tests.
@@ -185,11 +208,24 @@ class ManifestLoader:
         # In the future the loaded files will be used to control
         # partial parsing, but right now we're just moving the
         # file loading out of the individual parsers and doing it
-        # all at once.
+        # all at once. The files are read and hashed on a thread pool that
+        # is shared by all of the projects, but the projects and their
+        # files are still added to manifest.files in a deterministic order.
+        # If we have a saved manifest, files whose stat hasn't changed since
+        # it was written are not read at all.
         start_read_files = time.perf_counter()
         project_parser_files = {}
-        for project in self.all_projects.values():
-            read_files(project, self.manifest.files, project_parser_files)
+        saved_files = None
+        saved_at = None
+        if self.old_manifest is not None:
+            saved_files = self.old_manifest.files
+            saved_at = self.old_manifest.metadata.generated_at
+        with read_files_executor() as executor:
+            for project in self.all_projects.values():
+                read_files(
+                    project, self.manifest.files, project_parser_files,
+                    executor, saved_files, saved_at
+                )
         self._perf_info.read_files_elapsed = (time.perf_counter() - start_read_files)
 
         # We need to parse the macros first, so they're resolvable when
@@ -208,11 +244,23 @@ class ManifestLoader:
 
         # Now that the macros are parsed, parse the rest of the files.
         # This is currently done on a per project basis,
-        # but in the future we may change that
+        # but in the future we may change that. If parsing on a process
+        # pool is enabled, the files of the independent parsers are parsed
+        # first, and merged into the manifest in the usual order.
         start_parse_projects = time.perf_counter()
+        processes = flags.PARSE_PROCESSES
+        if processes is not None and processes > 1:
+            self.parse_in_processes(project_parser_files, processes)
         for project in self.all_projects.values():
             self.parse_project(project, project_parser_files[project.project_name])
         self._perf_info.parse_project_elapsed = (time.perf_counter() - start_parse_projects)
+        logger.debug(
+            'Found the refs, sources and configs of {} nodes statically, '
+            'rendered {} nodes'.format(
+                self._perf_info.static_parse_count,
+                self._perf_info.render_count,
+            )
+        )
 
     # Parse every file in this project, except macros (already done)
     def parse_project(
@@ -247,11 +295,17 @@ class ManifestLoader:
                 parser_path_count = parser_path_count + 1
 
             # Save timing info
-            project_parser_info.append(ParserInfo(
+            parser_info = ParserInfo(
                 parser=parser.resource_type,
                 path_count=parser_path_count,
                 elapsed=time.perf_counter() - parser_start_timer
-            ))
+            )
+            if isinstance(parser, ConfiguredParser):
+                parser_info.static_parse_count = parser.static_parse_count
+                parser_info.render_count = parser.render_count
+                self._perf_info.static_parse_count += parser.static_parse_count
+                self._perf_info.render_count += parser.render_count
+            project_parser_info.append(parser_info)
             total_path_count = total_path_count + parser_path_count
 
         # HookParser doesn't run from loaded files, just dbt_project.yml,
@@ -274,6 +328,33 @@ class ManifestLoader:
             self._perf_info.path_count + total_path_count
         )
 
+    # Parse the files of the parsers in PARALLEL_PARSERS that aren't in the
+    # partial parse cache on a process pool. The results are kept in
+    # 'parsed_in_processes' until 'parse_project' gets to them, so the
+    # manifest ends up the same as when parsing in a single process.
+    def parse_in_processes(self, project_parser_files, processes: int) -> None:
+        tasks: List[ParseTask] = []
+        for project in self.all_projects.values():
+            parser_files = project_parser_files[project.project_name]
+            for parser_name in PARALLEL_PARSERS:
+                for search_key in parser_files.get(parser_name, []):
+                    source_file = self.manifest.files[search_key]
+                    if self._is_cached(source_file):
+                        continue
+                    ensure_contents_loaded(source_file)
+                    tasks.append(ParseTask(
+                        parser_name=parser_name,
+                        project_name=project.project_name,
+                        file=source_file,
+                    ))
+        if len(tasks) < 2:
+            return
+        logger.debug(f'Parsing {len(tasks)} files in {processes} processes')
+        self.parsed_in_processes = parse_files_in_processes(
+            self.root_project, self.all_projects, self.manifest.macros,
+            tasks, processes
+        )
+
     # Loop through macros in the manifest and statically parse
     # the 'macro_sql' to find depends_on.macros
     def reparse_macros(self):
@@ -298,7 +379,7 @@ class ManifestLoader:
                     macro.depends_on.add_macro(dep_macro_id)  # will check for dupes
 
     # This is where we use the partial-parse state from the
-    # pickle file (if it exists)
+    # partial parse cache (if it exists)
     def parse_with_cache(
         self,
         block: FileBlock,
@@ -306,8 +387,18 @@ class ManifestLoader:
     ) -> None:
         # _get_cached actually copies the nodes, etc, that were
         # generated from the file to the results, in 'sanitized_update'
-        if not self._get_cached(block, parser):
+        if self._get_cached(block, parser):
+            return
+        # the file may have been parsed on a process pool already
+        if self._merge_parsed_in_processes(block, parser):
+            return
+        ensure_contents_loaded(block.file)
+        # record the vars and env vars used by the file, so the next
+        # partial parse knows when it has to be re-parsed
+        with record_parse_dependencies() as dependencies:
             parser.parse_file(block)
+        block.file.vars = dependencies.vars
+        block.file.env_vars = dependencies.env_vars
 
     # check if we have a stored parse file, then check if
     # file checksums are the same or not and either return
@@ -322,33 +413,106 @@ class ManifestLoader:
         # parser type during parsing?
         if self.old_manifest is None:
             return False
+        key = block.file.search_key
+        old_file = self.old_manifest.files.get(key) if key else None
+        if old_file is not None and self.dependencies_changed(old_file):
+            return False
         # The 'has_file' method is where we check to see if
         # the checksum of the old file is the same as the new
         # file. If the checksum is different, 'has_file' returns
         # false. If it's the same, the file and the things that
         # were generated from it are used.
         if self.old_manifest.has_file(block.file):
-            return self.manifest.sanitized_update(
+            cached = self.manifest.sanitized_update(
                 block.file, self.old_manifest, parser.resource_type
             )
+            if cached and old_file is not None:
+                block.file.vars = old_file.vars
+                block.file.env_vars = old_file.env_vars
+            return cached
+        return False
+
+    # Return whether _get_cached would use the saved results for this file,
+    # without adding them to the manifest.
+    def _is_cached(self, source_file: SourceFile) -> bool:
+        if self.old_manifest is None:
+            return False
+        key = source_file.search_key
+        old_file = self.old_manifest.files.get(key) if key else None
+        if old_file is not None and self.dependencies_changed(old_file):
+            return False
+        return self.old_manifest.has_file(source_file)
+
+    def _merge_parsed_in_processes(
+        self,
+        block: FileBlock,
+        parser: BaseParser,
+    ) -> bool:
+        key = block.file.search_key
+        if key is None or key not in self.parsed_in_processes:
+            return False
+        result = self.parsed_in_processes.pop(key)
+        for record in result.records:
+            logbook.dispatch_record(record)
+        if result.manifest is None:
+            return False
+        self.manifest.sanitized_update(
+            block.file, result.manifest, parser.resource_type
+        )
+        parsed_file = result.manifest.files[key]
+        block.file.vars = parsed_file.vars
+        block.file.env_vars = parsed_file.env_vars
+        if isinstance(parser, ConfiguredParser):
+            parser.static_parse_count += result.static_parse_count
+            parser.render_count += result.render_count
+        return True
+
+    # Return whether anything that the file used while it was parsed, other
+    # than its contents, has changed: its project's config, or the value of
+    # a var or env var it used.
+    def dependencies_changed(self, old_file: SourceFile) -> bool:
+        path = old_file.path.original_file_path
+        if old_file.project_name in self.changed_projects:
+            logger.debug(
+                f'Partial parsing: the config of project '
+                f'"{old_file.project_name}" changed, re-parsing {path}'
+            )
+            return True
+        cli_vars = self.root_project.cli_vars
+        for name, checksum in old_file.vars.items():
+            if cli_var_checksum(cli_vars, name) != checksum:
+                logger.debug(
+                    f'Partial parsing: var "{name}" changed, re-parsing {path}'
+                )
+                return True
+        for name, checksum in old_file.env_vars.items():
+            if env_var_checksum(name) != checksum:
+                logger.debug(
+                    f'Partial parsing: env var "{name}" changed, re-parsing '
+                    f'{path}'
+                )
+                return True
         return False
 
     def write_manifest_for_partial_parse(self):
         path = os.path.join(self.root_project.target_path,
-                            PARTIAL_PARSE_FILE_NAME)
-        make_directory(self.root_project.target_path)
-        with open(path, 'wb') as fp:
-            pickle.dump(self.manifest, fp)
+                            PARTIAL_PARSE_DIR_NAME)
+        saved = None
+        if isinstance(self.old_manifest, SavedManifest):
+            saved = self.old_manifest
+        write_parse_cache(self.manifest, path, saved)
 
-    def matching_parse_results(self, manifest: Manifest) -> bool:
+    def matching_parse_results(self, manifest: SavedManifest) -> bool:
         """Compare the global hashes of the read-in parse results' values to
         the known ones, and return if it is ok to re-use the results.
         """
         try:
-            if manifest.metadata.dbt_version != __version__:
+            if manifest.format_version != PARTIAL_PARSE_FORMAT_VERSION:
                 logger.debug(
-                    'dbt version mismatch: {} != {}, cache invalidated'
-                    .format(manifest.metadata.dbt_version, __version__)
+                    'partial parse format mismatch: {} != {}, cache '
+                    'invalidated'
+                    .format(manifest.format_version,
+                            PARTIAL_PARSE_FORMAT_VERSION)
                 )
                 return False
         except AttributeError as exc:
@@ -378,18 +542,40 @@ class ManifestLoader:
             )
             valid = False
 
-        for key, new_value in self.manifest.state_check.project_hashes.items():
-            if key in manifest.state_check.project_hashes:
-                old_value = manifest.state_check.project_hashes[key]
-                if new_value != old_value:
-                    logger.debug(
-                        'For key {}, hash mismatch ({} -> {}), cache '
-                        'invalidated'
-                        .format(key, old_value, new_value)
-                    )
-                    valid = False
+        # the root project's config applies to the nodes in every project,
+        # so if it changed nothing can be reused. Changes to the other
+        # projects are handled per file, see 'get_changed_projects'.
+        root_name = self.root_project.project_name
+        new_value = self.manifest.state_check.project_hashes.get(root_name)
+        old_value = manifest.state_check.project_hashes.get(root_name)
+        if new_value != old_value:
+            logger.debug(
+                'For key {}, hash mismatch ({} -> {}), cache '
+                'invalidated'
+                .format(root_name, old_value, new_value)
+            )
+            valid = False
         return valid
 
+    def get_changed_projects(self) -> Set[str]:
+        if self.old_manifest is None:
+            return set()
+        new_state = self.manifest.state_check
+        old_state = self.old_manifest.state_check
+        if not new_state or not old_state:
+            return set()
+        changed = set()
+        for key, new_value in new_state.project_hashes.items():
+            old_value = old_state.project_hashes.get(key)
+            if new_value != old_value:
+                logger.debug(
+                    'For key {}, hash mismatch ({} -> {}), re-parsing the '
+                    'files in that project'
+                    .format(key, old_value, new_value)
+                )
+                changed.add(key)
+        return changed
+
     def _partial_parse_enabled(self):
         # if the CLI is set, follow that
         if flags.PARTIAL_PARSE is not None:
@@ -400,21 +586,22 @@ class ManifestLoader:
         else:
             return DEFAULT_PARTIAL_PARSE
 
-    def read_saved_manifest(self) -> Optional[Manifest]:
+    def read_saved_manifest(self) -> Optional[SavedManifest]:
         if not self._partial_parse_enabled():
             logger.debug('Partial parsing not enabled')
             return None
         path = os.path.join(self.root_project.target_path,
-                            PARTIAL_PARSE_FILE_NAME)
+                            PARTIAL_PARSE_DIR_NAME)
 
         if os.path.exists(path):
             try:
-                with open(path, 'rb') as fp:
-                    manifest: Manifest = pickle.load(fp)
+                # only the index is read here, the entries for each file are
+                # loaded as they're needed
+                manifest = read_parse_cache(path)
                 # keep this check inside the try/except in case something about
                 # the file has changed in weird ways, perhaps due to being a
                 # different version of dbt
-                if self.matching_parse_results(manifest):
+                if manifest is not None and self.matching_parse_results(manifest):
                     return manifest
             except Exception as exc:
                 logger.debug(
@@ -467,34 +654,38 @@ class ManifestLoader:
 
         return self.manifest
 
-    # TODO: this should be calculated per-file based on the vars() calls made in
-    # parsing, so changing one var doesn't invalidate everything. also there should
-    # be something like that for env_var - currently changing env_vars in way that
-    # impact graph selection or configs will result in weird test failures.
-    # finally, we should hash the actual profile used, not just root project +
-    # profiles.yml + relevant args. While sufficient, it is definitely overkill.
+    # The vars and env vars used while parsing are tracked per file (see
+    # 'dependencies_changed'), so changing one of them only re-parses the files
+    # that used it. Vars and env vars can also be used in profiles.yml and
+    # dbt_project.yml, so the profile hash is of the rendered target that's
+    # actually used, and the project hashes include the rendered project.
     def build_manifest_state_check(self):
         config = self.root_project
         all_projects = self.all_projects
         # if any of these change, we need to reject the parser
         vars_hash = FileHash.from_contents(
             '\x00'.join([
-                getattr(config.args, 'vars', '{}') or '{}',
                 getattr(config.args, 'profile', '') or '',
                 getattr(config.args, 'target', '') or '',
                 __version__
             ])
         )
 
-        profile_path = os.path.join(config.args.profiles_dir, 'profiles.yml')
-        with open(profile_path) as fp:
-            profile_hash = FileHash.from_contents(fp.read())
+        profile_hash = FileHash.from_contents(
+            json.dumps(config.to_target_dict(), sort_keys=True, default=str)
+        )
 
         project_hashes = {}
         for name, project in all_projects.items():
             path = os.path.join(project.project_root, 'dbt_project.yml')
             with open(path) as fp:
-                project_hashes[name] = FileHash.from_contents(fp.read())
+                contents = fp.read()
+            rendered = json.dumps(
+                project.to_project_config(), sort_keys=True, default=str
+            )
+            project_hashes[name] = FileHash.from_contents(
+                '\x00'.join([contents, rendered])
+            )
 
         state_check = ManifestStateCheck(
             vars_hash=vars_hash,
@@ -0,0 +1,141 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Type
+
+import logbook
+
+import dbt.flags as flags
+from dbt.adapters.factory import load_plugin, register_adapter
+from dbt.config import Project, RuntimeConfig
+from dbt.context.base import record_parse_dependencies
+from dbt.contracts.files import SourceFile
+from dbt.contracts.graph.manifest import Manifest
+from dbt.contracts.graph.parsed import ParsedMacro
+from dbt.logger import GLOBAL_LOGGER as logger, RecordCollector
+from dbt.parser.analysis import AnalysisParser
+from dbt.parser.base import ConfiguredParser
+from dbt.parser.data_test import DataTestParser
+from dbt.parser.models import ModelParser
+from dbt.parser.search import FileBlock
+from dbt.parser.snapshots import SnapshotParser
+
+
+# The files of these parsers can be parsed independently of each other, once
+# the macros are loaded: each file only adds its own nodes to the manifest.
+# They're also the files that spend most of their time rendering jinja. The
+# other parsers are cheap, or (like the SchemaParser) depend on the order in
+# which files are parsed, so they always run in the main process.
+PARALLEL_PARSERS: Dict[str, Type[ConfiguredParser]] = {
+    'ModelParser': ModelParser,
+    'SnapshotParser': SnapshotParser,
+    'AnalysisParser': AnalysisParser,
+    'DataTestParser': DataTestParser,
+}
+
+
+@dataclass
+class ParseTask:
+    parser_name: str
+    project_name: str
+    file: SourceFile
+
+
+@dataclass
+class ParseTaskResult:
+    search_key: str
+    # A manifest with only the things generated from this file, or None if
+    # it couldn't be parsed in a worker. The file is then parsed again in the
+    # main process, so that errors are raised from there.
+    manifest: Optional[Manifest]
+    # log records emitted while parsing, to be dispatched in the main process
+    records: List[logbook.LogRecord] = field(default_factory=list)
+    static_parse_count: int = 0
+    render_count: int = 0
+
+
+# set in each worker process by '_initialize_worker'
+_WORKER_STATE: Dict[str, Any] = {}
+
+
+def _initialize_worker(
+    root_project: RuntimeConfig,
+    all_projects: Mapping[str, Project],
+    macros: Mapping[str, ParsedMacro],
+) -> None:
+    flags.set_from_args(root_project.args)
+    load_plugin(root_project.credentials.type)
+    register_adapter(root_project)
+    _WORKER_STATE['root_project'] = root_project
+    _WORKER_STATE['all_projects'] = all_projects
+    _WORKER_STATE['macros'] = macros
+
+
+def _parse_file(task: ParseTask) -> ParseTaskResult:
+    root_project: RuntimeConfig = _WORKER_STATE['root_project']
+    project = _WORKER_STATE['all_projects'][task.project_name]
+    source_file = task.file
+    assert source_file.search_key is not None
+
+    manifest = Manifest({}, {}, _WORKER_STATE['macros'], {}, {}, {}, [], {})
+    parser_cls = PARALLEL_PARSERS[task.parser_name]
+    parser = parser_cls(project, manifest, root_project)
+
+    collector = RecordCollector()
+    with collector.threadbound():
+        try:
+            with record_parse_dependencies() as dependencies:
+                parser.parse_file(FileBlock(source_file))
+        except Exception as exc:
+            logger.debug(
+                f'Failed to parse {source_file.path.original_file_path} in '
+                f'a worker process: {exc}'
+            )
+            return ParseTaskResult(
+                search_key=source_file.search_key,
+                manifest=None,
+                records=collector.records,
+            )
+
+    source_file = manifest.get_file(source_file)
+    source_file.vars = dependencies.vars
+    source_file.env_vars = dependencies.env_vars
+    # the macros are already in the main process, don't send them back
+    manifest.macros = {}
+    return ParseTaskResult(
+        search_key=source_file.search_key,  # type: ignore
+        manifest=manifest,
+        records=collector.records,
+        static_parse_count=parser.static_parse_count,
+        render_count=parser.render_count,
+    )
+
+
+def parse_files_in_processes(
+    root_project: RuntimeConfig,
+    all_projects: Mapping[str, Project],
+    macros: Mapping[str, ParsedMacro],
+    tasks: List[ParseTask],
+    processes: int,
+) -> Dict[str, ParseTaskResult]:
+    """Parse the files in 'tasks' on a pool of 'processes' processes and
+    return the results by search key. If the pool fails, whatever couldn't be
+    parsed is missing from the results and should be parsed as usual.
+    """
+    if not tasks:
+        return {}
+    processes = min(processes, len(tasks))
+    chunksize = max(1, len(tasks) // (processes * 4))
+    try:
+        with flags.MP_CONTEXT.Pool(
+            processes,
+            initializer=_initialize_worker,
+            initargs=(root_project, all_projects, macros),
+        ) as pool:
+            results = pool.map(_parse_file, tasks, chunksize=chunksize)
+    except Exception as exc:
+        logger.debug(
+            f'Parsing in {processes} processes failed, parsing in a single '
+            f'process instead: {exc}',
+            exc_info=True
+        )
+        return {}
+    return {result.search_key: result for result in results}
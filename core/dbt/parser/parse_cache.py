@@ -0,0 +1,264 @@
+import hashlib
+import os
+import pickle
+import tempfile
+from dataclasses import dataclass, field, replace
+from typing import (
+    Dict, List, Mapping, Optional, Set
+)
+
+from dbt.clients.system import make_directory
+from dbt.contracts.files import FileHash, SourceFile
+from dbt.contracts.graph.compiled import CompileResultNode, ManifestNode
+from dbt.contracts.graph.manifest import (
+    Manifest, ManifestMetadata, ManifestStateCheck
+)
+from dbt.contracts.graph.parsed import (
+    ParsedDocumentation, ParsedExposure, ParsedMacro, ParsedMacroPatch,
+    ParsedNodePatch, UnpatchedSourceDefinition
+)
+from dbt.contracts.util import MacroKey
+from dbt.logger import GLOBAL_LOGGER as logger
+
+
+# The partial parse cache is a directory in the target path with an index
+# and one entry per parsed file. The index is small: it has the state check
+# and the SourceFile (without contents) for every file. The entries have
+# everything that was generated from a single file, and are only loaded
+# for files whose checksums still match.
+#
+# Bump the format version whenever the layout of the index or entries
+# changes, or anything stored in them changes in an incompatible way.
+PARTIAL_PARSE_FORMAT_VERSION = 2
+PARTIAL_PARSE_DIR_NAME = 'partial_parse'
+INDEX_FILE_NAME = 'index.pickle'
+ENTRIES_DIR_NAME = 'files'
+# the single file the cache was written to before the current format
+LEGACY_PARSE_FILE_NAME = 'partial_parse.pickle'
+TMP_SUFFIX = '.tmp'
+
+
+@dataclass
+class ParseCacheEntry:
+    """Everything generated from a single file by a previous parse."""
+    search_key: str
+    checksum: FileHash
+    nodes: Dict[str, ManifestNode] = field(default_factory=dict)
+    disabled: Dict[str, List[CompileResultNode]] = field(default_factory=dict)
+    docs: Dict[str, ParsedDocumentation] = field(default_factory=dict)
+    macros: Dict[str, ParsedMacro] = field(default_factory=dict)
+    sources: Dict[str, UnpatchedSourceDefinition] = field(default_factory=dict)
+    exposures: Dict[str, ParsedExposure] = field(default_factory=dict)
+    patches: Dict[str, ParsedNodePatch] = field(default_factory=dict)
+    macro_patches: Dict[MacroKey, ParsedMacroPatch] = field(
+        default_factory=dict
+    )
+
+    @classmethod
+    def from_manifest(
+        cls, manifest: Manifest, source_file: SourceFile
+    ) -> 'ParseCacheEntry':
+        assert source_file.search_key is not None
+        entry = cls(
+            search_key=source_file.search_key,
+            checksum=source_file.checksum,
+        )
+        file_path = source_file.path.original_file_path
+        for unique_id in source_file.nodes:
+            if unique_id in manifest.nodes:
+                entry.nodes[unique_id] = manifest.nodes[unique_id]
+            disabled = [
+                n for n in manifest._disabled.get(unique_id, [])
+                if n.original_file_path == file_path
+            ]
+            if disabled:
+                entry.disabled[unique_id] = disabled
+        for unique_id in source_file.docs:
+            entry.docs[unique_id] = manifest.docs[unique_id]
+        for unique_id in source_file.macros:
+            entry.macros[unique_id] = manifest.macros[unique_id]
+        for unique_id in source_file.sources:
+            entry.sources[unique_id] = manifest.sources[unique_id]  # type: ignore
+        for unique_id in source_file.exposures:
+            entry.exposures[unique_id] = manifest.exposures[unique_id]
+        for name in source_file.patches:
+            entry.patches[name] = manifest.patches[name]
+        for key in source_file.macro_patches:
+            entry.macro_patches[key] = manifest.macro_patches[key]
+        return entry
+
+
+@dataclass
+class ParseCacheIndex:
+    format_version: int
+    metadata: ManifestMetadata
+    state_check: Optional[ManifestStateCheck]
+    # search_key -> SourceFile without contents
+    files: Dict[str, SourceFile]
+    # search_key -> name of the entry file
+    entries: Dict[str, str]
+
+
+def _entry_name(search_key: str) -> str:
+    digest = hashlib.sha1(search_key.encode('utf-8')).hexdigest()
+    return f'{digest}.pickle'
+
+
+def _write_pickle(path: str, value) -> None:
+    # write to a temporary file and rename, so readers never see a partially
+    # written file. The temporary file gets a unique name, so concurrent runs
+    # in the same project don't write over each other's.
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(path), suffix=TMP_SUFFIX
+    )
+    try:
+        with os.fdopen(fd, 'wb') as fp:
+            pickle.dump(value, fp, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class SavedManifest(Manifest):
+    """A Manifest loaded from the partial parse cache. Only the index is read
+    up front. The nodes, macros, etc. generated from a file are read from
+    disk the first time that file is looked up with has_file or get_file,
+    so only the entries for unchanged files are ever materialized.
+    """
+    format_version: int
+    cache_path: str
+    entries: Mapping[str, str]
+    _loaded: Set[str]
+
+    @classmethod
+    def from_index(cls, index: ParseCacheIndex, cache_path: str):
+        self = cls(
+            nodes={}, sources={}, macros={}, docs={}, exposures={},
+            selectors={}, disabled=[], files=index.files,
+            metadata=index.metadata, state_check=index.state_check,
+        )
+        self.format_version = index.format_version
+        self.cache_path = cache_path
+        self.entries = index.entries
+        self._loaded = set()
+        return self
+
+    def _load_entry(self, search_key: str) -> bool:
+        if search_key in self._loaded:
+            return True
+        if search_key not in self.entries:
+            return False
+        path = os.path.join(
+            self.cache_path, ENTRIES_DIR_NAME, self.entries[search_key]
+        )
+        try:
+            with open(path, 'rb') as fp:
+                entry: ParseCacheEntry = pickle.load(fp)
+        except Exception as exc:
+            logger.debug(
+                f'Failed to load partial parse entry for {search_key} from '
+                f'{path}: {exc}'
+            )
+            return False
+        # the entry could have been rewritten without the index, if a
+        # previous run was interrupted
+        if (
+            entry.search_key != search_key or
+            entry.checksum != self.files[search_key].checksum
+        ):
+            return False
+
+        self.nodes.update(entry.nodes)
+        for unique_id, disabled in entry.disabled.items():
+            self._disabled.setdefault(unique_id, []).extend(disabled)
+        self.docs.update(entry.docs)
+        self.macros.update(entry.macros)
+        self.sources.update(entry.sources)  # type: ignore
+        self.exposures.update(entry.exposures)
+        self.patches.update(entry.patches)
+        self.macro_patches.update(entry.macro_patches)
+        self._loaded.add(search_key)
+        return True
+
+    def reused(self, search_key: str, cache_path: str) -> bool:
+        """Return whether the entry for the given file was loaded from the
+        cache at cache_path.
+        """
+        return cache_path == self.cache_path and search_key in self._loaded
+
+    def has_file(self, source_file: SourceFile) -> bool:
+        if not super().has_file(source_file):
+            return False
+        # has_file returned True, so the search_key can't be None
+        return self._load_entry(source_file.search_key)  # type: ignore
+
+    def get_file(self, source_file: SourceFile) -> SourceFile:
+        key = source_file.search_key
+        if key is not None and key in self.files:
+            self._load_entry(key)
+            return self.files[key]
+        return super().get_file(source_file)
+
+
+def write_parse_cache(
+    manifest: Manifest,
+    cache_path: str,
+    saved: Optional[SavedManifest] = None,
+) -> None:
+    """Write the manifest to the partial parse cache at cache_path. 'saved' is
+    the cache that was read at the start of this parse, if any. Entries that
+    were reused from it are already on disk, so they aren't written again.
+    """
+    entries_path = os.path.join(cache_path, ENTRIES_DIR_NAME)
+    make_directory(entries_path)
+
+    files: Dict[str, SourceFile] = {}
+    entries: Dict[str, str] = {}
+    for search_key, source_file in manifest.files.items():
+        if source_file.search_key is None:
+            continue
+        entry_name = _entry_name(search_key)
+        files[search_key] = replace(source_file, _contents=None)
+        entries[search_key] = entry_name
+        if saved is not None and saved.reused(search_key, cache_path):
+            continue
+        entry = ParseCacheEntry.from_manifest(manifest, source_file)
+        _write_pickle(os.path.join(entries_path, entry_name), entry)
+
+    index = ParseCacheIndex(
+        format_version=PARTIAL_PARSE_FORMAT_VERSION,
+        metadata=manifest.metadata,
+        state_check=manifest.state_check,
+        files=files,
+        entries=entries,
+    )
+    _write_pickle(os.path.join(cache_path, INDEX_FILE_NAME), index)
+
+    # clean up entries for files that no longer exist. Temporary files belong
+    # to writes that are still in progress.
+    expected = set(entries.values())
+    for name in os.listdir(entries_path):
+        if name not in expected and not name.endswith(TMP_SUFFIX):
+            os.remove(os.path.join(entries_path, name))
+
+    # the cache written by older versions of dbt is in the target path
+    legacy_path = os.path.join(
+        os.path.dirname(os.path.normpath(cache_path)), LEGACY_PARSE_FILE_NAME
+    )
+    if os.path.exists(legacy_path):
+        os.remove(legacy_path)
+
+
+def read_parse_cache(cache_path: str) -> Optional[SavedManifest]:
+    """Read the index of the partial parse cache at cache_path. The entries
+    are loaded lazily by the SavedManifest. Raises if the index can't be
+    read.
+    """
+    path = os.path.join(cache_path, INDEX_FILE_NAME)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'rb') as fp:
+        index: ParseCacheIndex = pickle.load(fp)
+    return SavedManifest.from_index(index, cache_path)
@@ -1,23 +1,52 @@
+import os
+from collections import deque
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import (
+    Callable, Deque, Iterable, Iterator, List, Mapping, Optional
+)
+
 from dbt.clients.system import load_file_contents
-from dbt.contracts.files import FilePath, ParseFileType, SourceFile, FileHash
+from dbt.contracts.files import (
+    FilePath, ParseFileType, SourceFile, FileHash, FileStat
+)
 
 from dbt.parser.search import FilesystemSearcher
 
 
+# Reading and hashing files is mostly I/O wait, so the files are loaded
+# on a thread pool sized to the number of cores. Only a bounded number
+# of loads are in flight at once so that we never hold the contents of
+# an entire large project in memory waiting to be consumed.
+READ_FILES_WORKERS = os.cpu_count() or 1
+READ_FILES_MAX_IN_FLIGHT = READ_FILES_WORKERS * 4
+
+
+def read_files_executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(
+        max_workers=READ_FILES_WORKERS,
+        thread_name_prefix='read_files',
+    )
+
+
 # This loads the files contents and creates the SourceFile object
 def load_source_file(
         path: FilePath, parse_file_type: ParseFileType,
         project_name: str) -> SourceFile:
+    # stat before reading, so a change during the read is caught next time
+    stat = FileStat.from_path(path.absolute_path)
     file_contents = load_file_contents(path.absolute_path, strip=False)
     checksum = FileHash.from_contents(file_contents)
     source_file = SourceFile(path=path, checksum=checksum,
-                             parse_file_type=parse_file_type, project_name=project_name)
+                             parse_file_type=parse_file_type, project_name=project_name,
+                             stat=stat)
     source_file.contents = file_contents.strip()
     return source_file
 
 
 # Special processing for big seed files
 def load_seed_source_file(match: FilePath, project_name) -> SourceFile:
+    stat = FileStat.from_path(match.absolute_path)
     if match.seed_too_large():
         # We don't want to calculate a hash of this file. Use the path.
         source_file = SourceFile.big_seed(match)
@@ -28,31 +57,115 @@ def load_seed_source_file(match: FilePath, project_name) -> SourceFile:
         source_file.contents = ''
     source_file.parse_file_type = ParseFileType.Seed
     source_file.project_name = project_name
+    source_file.stat = stat
+    return source_file
+
+
+# Partial parsing fast path. If the file was read by a previous run and its
+# stat (mtime, size, inode) hasn't changed since, reuse the saved checksum
+# without opening the file. Files modified after the previous run started
+# are always re-read, because their stat can't be trusted. The contents are
+# not loaded; see 'ensure_contents_loaded'.
+def load_unchanged_source_file(
+    path: FilePath,
+    parse_file_type: ParseFileType,
+    project_name: str,
+    saved_files: Mapping[str, SourceFile],
+    saved_at: datetime,
+) -> Optional[SourceFile]:
+    saved_file = saved_files.get(path.search_key)
+    if saved_file is None or saved_file.stat is None:
+        return None
+    if saved_file.parse_file_type != parse_file_type:
+        return None
+    stat = FileStat.from_path(path.absolute_path)
+    if stat != saved_file.stat or stat.modified_since(saved_at):
+        return None
+    source_file = SourceFile(
+        path=path, checksum=saved_file.checksum,
+        parse_file_type=parse_file_type, project_name=project_name,
+        stat=stat,
+    )
     return source_file
 
 
+# Files from the stat fast path have a stat but no contents. The contents are
+# only needed if the file has to be parsed after all, so they're read here
+# when that happens.
+def ensure_contents_loaded(source_file: SourceFile) -> None:
+    if source_file._contents is not None or source_file.stat is None:
+        return
+    if isinstance(source_file.path, FilePath):
+        if source_file.parse_file_type == ParseFileType.Seed:
+            source_file.contents = ''
+        else:
+            source_file.contents = load_file_contents(
+                source_file.path.absolute_path, strip=True
+            )
+
+
+def _map_in_order(
+    executor: Executor,
+    func: Callable[[FilePath], SourceFile],
+    paths: Iterable[FilePath],
+    max_in_flight: int = READ_FILES_MAX_IN_FLIGHT,
+) -> Iterator[SourceFile]:
+    """Like executor.map, but only keeps max_in_flight calls submitted at a
+    time. Results are yielded in the order of the input paths, regardless of
+    the order in which they complete, and exceptions are re-raised in the
+    caller's thread.
+    """
+    pending: Deque[Future] = deque()
+    for path in paths:
+        if len(pending) >= max_in_flight:
+            yield pending.popleft().result()
+        pending.append(executor.submit(func, path))
+    while pending:
+        yield pending.popleft().result()
+
+
 # Use the FilesystemSearcher to get a bunch of FilePaths, then turn
 # them into a bunch of FileSource objects
-def get_source_files(project, paths, extension, parse_file_type):
+def get_source_files(
+    project, paths, extension, parse_file_type,
+    executor: Optional[Executor] = None,
+    saved_files: Optional[Mapping[str, SourceFile]] = None,
+    saved_at: Optional[datetime] = None,
+) -> List[SourceFile]:
     # file path list
     fp_list = list(FilesystemSearcher(
         project, paths, extension
     ))
-    # file block list
-    fb_list = []
-    for fp in fp_list:
+
+    def load(fp: FilePath) -> SourceFile:
+        if saved_files is not None and saved_at is not None:
+            unchanged = load_unchanged_source_file(
+                fp, parse_file_type, project.project_name, saved_files,
+                saved_at
+            )
+            if unchanged is not None:
+                return unchanged
         if parse_file_type == ParseFileType.Seed:
-            fb_list.append(load_seed_source_file(fp, project.project_name))
+            return load_seed_source_file(fp, project.project_name)
         else:
-            fb_list.append(load_source_file(
-                fp, parse_file_type, project.project_name))
-    return fb_list
+            return load_source_file(
+                fp, parse_file_type, project.project_name)
+
+    # file block list
+    if executor is None or len(fp_list) < 2:
+        return [load(fp) for fp in fp_list]
+    return list(_map_in_order(executor, load, fp_list))
 
 
-def read_files_for_parser(project, files, dirs, extension, parse_ft):
+def read_files_for_parser(
+    project, files, dirs, extension, parse_ft,
+    executor: Optional[Executor] = None,
+    saved_files: Optional[Mapping[str, SourceFile]] = None,
+    saved_at: Optional[datetime] = None,
+):
     parser_files = []
     source_files = get_source_files(
-        project, dirs, extension, parse_ft
+        project, dirs, extension, parse_ft, executor, saved_files, saved_at
     )
     for sf in source_files:
         files[sf.search_key] = sf
@@ -64,46 +177,76 @@ def read_files_for_parser(project, files, dirs, extension, parse_ft):
 # dictionary needs to be passed in. What determines the order of
 # the various projects? Is the root project always last? Do the
 # non-root projects need to be done separately in order?
-def read_files(project, files, parser_files):
+# If no executor is passed in, one is created for this project only.
+# 'saved_files' and 'saved_at' are the files from the partial parse
+# manifest and the time its parse started, if there is one.
+def read_files(
+    project, files, parser_files, executor=None,
+    saved_files=None, saved_at=None,
+):
+    if executor is None:
+        with read_files_executor() as project_executor:
+            _read_project_files(
+                project, files, parser_files, project_executor,
+                saved_files, saved_at
+            )
+    else:
+        _read_project_files(
+            project, files, parser_files, executor, saved_files, saved_at
+        )
+
+
+def _read_project_files(
+    project, files, parser_files, executor, saved_files, saved_at
+):
 
     project_files = {}
 
     project_files['MacroParser'] = read_files_for_parser(
         project, files, project.macro_paths, '.sql', ParseFileType.Macro,
+        executor, saved_files, saved_at,
     )
 
     project_files['ModelParser'] = read_files_for_parser(
         project, files, project.source_paths, '.sql', ParseFileType.Model,
+        executor, saved_files, saved_at,
     )
 
     project_files['SnapshotParser'] = read_files_for_parser(
         project, files, project.snapshot_paths, '.sql', ParseFileType.Snapshot,
+        executor, saved_files, saved_at,
     )
 
     project_files['AnalysisParser'] = read_files_for_parser(
         project, files, project.analysis_paths, '.sql', ParseFileType.Analysis,
+        executor, saved_files, saved_at,
     )
 
     project_files['DataTestParser'] = read_files_for_parser(
         project, files, project.test_paths, '.sql', ParseFileType.Test,
+        executor, saved_files, saved_at,
     )
 
     project_files['SeedParser'] = read_files_for_parser(
         project, files, project.data_paths, '.csv', ParseFileType.Seed,
+        executor, saved_files, saved_at,
     )
 
     project_files['DocumentationParser'] = read_files_for_parser(
         project, files, project.docs_paths, '.md', ParseFileType.Documentation,
+        executor, saved_files, saved_at,
     )
 
     project_files['SchemaParser'] = read_files_for_parser(
         project, files, project.all_source_paths, '.yml', ParseFileType.Schema,
+        executor, saved_files, saved_at,
     )
 
     # Also read .yaml files for schema files. Might be better to change
     # 'read_files_for_parser' accept an array in the future.
     yaml_files = read_files_for_parser(
         project, files, project.all_source_paths, '.yaml', ParseFileType.Schema,
+        executor, saved_files, saved_at,
     )
     project_files['SchemaParser'].extend(yaml_files)
 
@@ -16,6 +16,7 @@ from dbt.exceptions import (
     InternalException
 )
 from dbt.logger import GLOBAL_LOGGER as logger, log_manager
+from .compile_ahead import CompileAhead
 from .printer import print_skip_caused_by_error, print_skip_line
 
 
@@ -181,6 +182,8 @@ class BaseRunner(metaclass=ABCMeta):
 
         self.skip = False
         self.skip_cause: Optional[RunResult] = None
+        # set by the task if nodes may have been compiled ahead of time
+        self.compile_ahead: Optional[CompileAhead] = None
 
     @abstractmethod
     def compile(self, manifest: Manifest) -> Any:
@@ -274,11 +277,17 @@ class BaseRunner(metaclass=ABCMeta):
     def compile_and_execute(self, manifest, ctx):
         result = None
         with self.adapter.connection_for(self.node):
-            with collect_timing_info('compile') as timing_info:
-                # if we fail here, we still have a compiled node to return
-                # this has the benefit of showing a build path for the errant
-                # model
-                ctx.node = self.compile(manifest)
+            compiled = None
+            if self.compile_ahead is not None:
+                compiled = self.compile_ahead.take(self.node.unique_id)
+            if compiled is not None:
+                ctx.node, timing_info = compiled
+            else:
+                with collect_timing_info('compile') as timing_info:
+                    # if we fail here, we still have a compiled node to
+                    # return this has the benefit of showing a build path for
+                    # the errant model
+                    ctx.node = self.compile(manifest)
             ctx.timing.append(timing_info)
 
             # for ephemeral nodes, we only want to compile, not run
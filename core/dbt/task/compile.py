@@ -1,15 +1,23 @@
 import threading
+from typing import Optional
+
 from .runnable import GraphRunnableTask
 from .base import BaseRunner
+from .parallel_compile import CompileProcessPool
 
 from dbt.contracts.results import RunStatus, RunResult
 from dbt.exceptions import InternalException
 from dbt.graph import ResourceTypeSelector, SelectionSpec, parse_difference
-from dbt.logger import print_timestamped_line
+from dbt.logger import GLOBAL_LOGGER as logger, print_timestamped_line
 from dbt.node_types import NodeType
 
 
 class CompileRunner(BaseRunner):
+    def __init__(self, config, adapter, node, node_index, num_nodes):
+        super().__init__(config, adapter, node, node_index, num_nodes)
+        # set by the task if nodes are compiled on a pool of processes
+        self.compile_pool: Optional[CompileProcessPool] = None
+
     def before_execute(self):
         pass
 
@@ -28,14 +36,70 @@ class CompileRunner(BaseRunner):
         )
 
     def compile(self, manifest):
+        if self.compile_pool is not None:
+            compiled = self.compile_pool.compile_node(self.node.unique_id)
+            if compiled is not None:
+                return compiled
         compiler = self.adapter.get_compiler()
         return compiler.compile_node(self.node, manifest, {})
 
 
 class CompileTask(GraphRunnableTask):
+    def __init__(self, args, config):
+        super().__init__(args, config)
+        self._compile_pool: Optional[CompileProcessPool] = None
+
     def raise_on_first_error(self):
         return True
 
+    def _compile_processes(self) -> Optional[int]:
+        processes = getattr(self.args, 'compile_processes', None)
+        if processes is None or processes < 2:
+            return None
+        return processes
+
+    def get_num_threads(self) -> int:
+        # each thread waits on a process while its node is compiled
+        num_threads = super().get_num_threads()
+        processes = self._compile_processes()
+        if processes is not None:
+            num_threads = max(num_threads, processes)
+        return num_threads
+
+    def get_runner(self, node):
+        runner = super().get_runner(node)
+        runner.compile_pool = self._compile_pool
+        return runner
+
+    def execute_nodes(self):
+        """If --compile-processes is set, compile the nodes on a pool of
+        processes, so that compiling isn't limited by the GIL. The threads
+        still run the queue and handle the results.
+        """
+        processes = self._compile_processes()
+        if processes is None or self.manifest is None:
+            return super().execute_nodes()
+        try:
+            pool = CompileProcessPool(self.config, self.manifest, processes)
+        except Exception as exc:
+            logger.debug(
+                f'Could not start {processes} compile processes, compiling '
+                f'in threads instead: {exc}',
+                exc_info=True
+            )
+            return super().execute_nodes()
+
+        self._compile_pool = pool
+        try:
+            results = super().execute_nodes()
+        except BaseException:
+            pool.terminate()
+            raise
+        finally:
+            self._compile_pool = None
+        pool.close()
+        return results
+
     def get_selection_spec(self) -> SelectionSpec:
         if self.args.selector_name:
             spec = self.config.get_selector(self.args.selector_name)
@@ -0,0 +1,102 @@
+import threading
+from typing import Any, Callable, Dict, Iterable, Optional, Set, Tuple
+
+from dbt.context.providers import introspection_disallowed
+from dbt.contracts.results import TimingInfo
+from dbt.logger import GLOBAL_LOGGER as logger
+
+
+CompiledEntry = Tuple[Any, TimingInfo]
+
+
+class CompileAhead:
+    """Compile nodes on a background thread while they wait for their parents
+    to run, so a worker can execute a node as soon as the queue hands it out.
+
+    Compiling a node only needs the relation names of its parents, but a
+    node that inspects the database (run_query, adapter.get_relation, ...)
+    would see its parents before they ran. Those nodes fail to compile ahead,
+    and are compiled by their worker as usual. So are the nodes a worker
+    takes before the background thread gets to them.
+    """
+    def __init__(
+        self,
+        nodes: Iterable[Any],
+        compile_node: Callable[[Any], Any],
+    ) -> None:
+        # compiled in this order, so parents should come first
+        self._nodes = list(nodes)
+        self._compile_node = compile_node
+        self._lock = threading.Lock()
+        self._compiled_one = threading.Condition(self._lock)
+        # unique ID -> the compiled node and its compile timing
+        self._compiled: Dict[str, CompiledEntry] = {}
+        # the nodes that workers have taken
+        self._taken: Set[str] = set()
+        self._compiling: Optional[str] = None
+        self._stopped = False
+        self._thread = threading.Thread(
+            target=self._compile_nodes, name='compile-ahead', daemon=True
+        )
+        # the nodes that were taken compiled, and their compile time
+        self.used = 0
+        self.seconds_saved = 0.0
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        with self._lock:
+            self._stopped = True
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def take(self, unique_id: str) -> Optional[CompiledEntry]:
+        """Return the compiled node and compile timing of the node, if it was
+        compiled ahead. If it's being compiled, wait for it. Otherwise the
+        node won't be compiled ahead anymore, and the caller must compile it.
+        """
+        with self._lock:
+            self._taken.add(unique_id)
+            while self._compiling == unique_id:
+                self._compiled_one.wait()
+            entry = self._compiled.pop(unique_id, None)
+            if entry is not None:
+                timing = entry[1]
+                self.used += 1
+                self.seconds_saved += (
+                    timing.completed_at - timing.started_at  # type: ignore
+                ).total_seconds()
+            return entry
+
+    def _compile_nodes(self) -> None:
+        for node in self._nodes:
+            unique_id = node.unique_id
+            with self._lock:
+                if self._stopped:
+                    return
+                if unique_id in self._taken:
+                    continue
+                self._compiling = unique_id
+
+            entry = self._compile(node)
+
+            with self._lock:
+                self._compiling = None
+                if entry is not None:
+                    self._compiled[unique_id] = entry
+                self._compiled_one.notify_all()
+
+    def _compile(self, node: Any) -> Optional[CompiledEntry]:
+        timing = TimingInfo(name='compile')
+        timing.begin()
+        try:
+            with introspection_disallowed():
+                compiled = self._compile_node(node)
+        except Exception as exc:
+            logger.debug(
+                f'Could not compile {node.unique_id} ahead of time: {exc}'
+            )
+            return None
+        timing.end()
+        return compiled, timing
@@ -0,0 +1,104 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, cast
+
+import logbook
+
+import dbt.flags as flags
+from dbt.adapters.factory import get_adapter, load_plugin, register_adapter
+from dbt.config import RuntimeConfig
+from dbt.contracts.graph.compiled import NonSourceCompiledNode
+from dbt.contracts.graph.manifest import Manifest
+from dbt.logger import GLOBAL_LOGGER as logger, RecordCollector
+
+
+@dataclass
+class CompileTaskResult:
+    # The compiled node, or None if it couldn't be compiled in a worker. The
+    # node is then compiled again in the main process, so that errors are
+    # raised from there.
+    node: Optional[NonSourceCompiledNode]
+    # log records emitted while compiling, to be dispatched in the main
+    # process
+    records: List[logbook.LogRecord] = field(default_factory=list)
+
+
+# set in each worker process by '_initialize_worker'
+_WORKER_STATE: Dict[str, Any] = {}
+
+
+def _initialize_worker(config: RuntimeConfig, manifest: Manifest) -> None:
+    flags.set_from_args(config.args)
+    load_plugin(config.credentials.type)
+    register_adapter(config)
+    _WORKER_STATE['config'] = config
+    _WORKER_STATE['manifest'] = manifest
+
+
+def _compile_node(unique_id: str) -> CompileTaskResult:
+    manifest: Manifest = _WORKER_STATE['manifest']
+    adapter = get_adapter(_WORKER_STATE['config'])
+
+    collector = RecordCollector()
+    with collector.threadbound():
+        try:
+            node = manifest.nodes[unique_id]
+            # ephemeral nodes are compiled into this worker's copy of the
+            # manifest as they're needed, and the compiled SQL files are
+            # written from here
+            compiled: NonSourceCompiledNode
+            if getattr(node, 'compiled', False):
+                compiled = cast(NonSourceCompiledNode, node)
+            else:
+                with adapter.connection_for(node):
+                    compiled = adapter.get_compiler().compile_node(
+                        node, manifest, {}
+                    )
+        except Exception as exc:
+            logger.debug(
+                f'Failed to compile {unique_id} in a worker process: {exc}'
+            )
+            return CompileTaskResult(node=None, records=collector.records)
+    return CompileTaskResult(node=compiled, records=collector.records)
+
+
+class CompileProcessPool:
+    """A pool of processes that compile nodes, each with a copy of the
+    manifest as it was when the pool started. Nodes are compiled from their
+    parsed version, like when they're compiled in the main process, so the
+    copies don't need the nodes that get compiled afterwards.
+
+    compile_node can be called from many threads at once.
+    """
+    def __init__(
+        self, config: RuntimeConfig, manifest: Manifest, processes: int
+    ) -> None:
+        self.processes = processes
+        self._pool = flags.MP_CONTEXT.Pool(
+            processes,
+            initializer=_initialize_worker,
+            initargs=(config, manifest),
+        )
+
+    def compile_node(self, unique_id: str) -> Optional[NonSourceCompiledNode]:
+        """Compile the node in a worker process and return it. If that fails,
+        return None: the node should be compiled as usual.
+        """
+        try:
+            result = self._pool.apply(_compile_node, (unique_id,))
+        except Exception as exc:
+            logger.debug(
+                f'Compiling {unique_id} in a worker process failed: {exc}',
+                exc_info=True
+            )
+            return None
+        for record in result.records:
+            logbook.dispatch_record(record)
+        return result.node
+
+    def close(self) -> None:
+        self._pool.close()
+        self._pool.join()
+
+    def terminate(self) -> None:
+        self._pool.terminate()
+        self._pool.join()
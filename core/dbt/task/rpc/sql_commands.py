@@ -36,7 +36,7 @@ def add_new_refs(
     if config.args.single_threaded or flags.SINGLE_THREADED_HANDLER:
         manifest = manifest.deepcopy()
     # it's ok for macros to silently override a local project macro name
-    manifest.macros.update(macros)
+    manifest.update_macros(macros)
 
     for macro in macros.values():
         process_macro(config, manifest, macro)
@@ -112,7 +112,7 @@ class RemoteRunSQLTask(RPCTask[RPCExecParameters]):
             for node in macro_parser.parse_remote(macros):
                 macro_overrides[node.unique_id] = node
 
-        self.manifest.macros.update(macro_overrides)
+        self.manifest.update_macros(macro_overrides)
         rpc_parser = RPCCallParser(
             project=self.config,
             manifest=self.manifest,
@@ -7,6 +7,7 @@ from multiprocessing.dummy import Pool as ThreadPool
 from typing import Optional, Dict, List, Set, Tuple, Iterable, AbstractSet
 from pathlib import PosixPath, WindowsPath
 
+from .compile_ahead import CompileAhead
 from .printer import (
     print_run_result_error,
     print_run_end_messages,
@@ -16,6 +17,7 @@ from dbt import ui
 from dbt.task.base import ConfiguredTask
 from dbt.adapters.base import BaseRelation
 from dbt.adapters.factory import get_adapter
+from dbt.clients.file_writer import BufferedFileWriter, buffered_writes
 from dbt.logger import (
     GLOBAL_LOGGER as logger,
     DbtProcessState,
@@ -39,7 +41,9 @@ from dbt.exceptions import (
     RuntimeException,
     FailFastException
 )
-from dbt.graph import GraphQueue, NodeSelector, SelectionSpec, Graph
+from dbt.graph import (
+    GraphQueue, NodeSelector, SelectionSpec, Graph, QueuePriority
+)
 from dbt.parser.manifest import ManifestLoader
 
 import dbt.exceptions
@@ -91,6 +95,8 @@ class GraphRunnableTask(ManifestTask):
         self.node_results = []
         self._skipped_children = {}
         self._raise_next_tick = None
+        self._predicted_makespan: Optional[float] = None
+        self._compile_ahead: Optional[CompileAhead] = None
         self.previous_state: Optional[PreviousState] = None
         self.set_previous_state()
 
@@ -116,7 +122,26 @@ class GraphRunnableTask(ManifestTask):
     def get_graph_queue(self) -> GraphQueue:
         selector = self.get_node_selector()
         spec = self.get_selection_spec()
-        return selector.get_graph_queue(spec)
+        priority = QueuePriority(
+            getattr(self.args, 'queue_priority', None) or
+            QueuePriority.Descendants
+        )
+        runtimes = None
+        if priority == QueuePriority.CriticalPath:
+            runtimes = self._get_previous_runtimes()
+        return selector.get_graph_queue(spec, priority, runtimes)
+
+    def _get_previous_runtimes(self) -> Dict[str, float]:
+        runtimes = {}
+        if self.previous_state is not None:
+            runtimes = self.previous_state.get_runtimes()
+        if not runtimes:
+            logger.warning(
+                'No node runtimes found in the run_results.json of --state, '
+                'the critical path will count every model as taking the '
+                'same time.'
+            )
+        return runtimes
 
     def _runtime_initialize(self):
         super()._runtime_initialize()
@@ -126,6 +151,10 @@ class GraphRunnableTask(ManifestTask):
             )
 
         self.job_queue = self.get_graph_queue()
+        if self.job_queue.priority == QueuePriority.CriticalPath:
+            self._predicted_makespan = self.job_queue.predict_makespan(
+                self.config.threads
+            )
 
         # we use this a couple times. order does not matter.
         self._flattened_nodes = []
@@ -166,7 +195,47 @@ class GraphRunnableTask(ManifestTask):
             num_nodes = self.num_nodes
 
         cls = self.get_runner_type()
-        return cls(self.config, adapter, node, run_count, num_nodes)
+        runner = cls(self.config, adapter, node, run_count, num_nodes)
+        runner.compile_ahead = self._compile_ahead
+        return runner
+
+    def _start_compile_ahead(self) -> None:
+        """Compile the selected nodes that aren't ephemeral on a background
+        thread, parents first, if --compile-ahead is set.
+        """
+        if not getattr(self.args, 'compile_ahead', False):
+            return
+        if self.manifest is None or self.job_queue is None:
+            raise InternalException(
+                'Got to _start_compile_ahead with no manifest or job queue'
+            )
+        graph = self.job_queue.graph
+        nodes = []
+        for index in graph.topological_order():
+            node = self.manifest.nodes.get(graph.node_id(index))
+            if node is not None and not node.is_ephemeral_model:
+                nodes.append(node)
+        adapter = get_adapter(self.config)
+        cls = self.get_runner_type()
+        manifest = self.manifest
+
+        def compile_node(node):
+            return cls(self.config, adapter, node, 0, 0).compile(manifest)
+
+        self._compile_ahead = CompileAhead(nodes, compile_node)
+        self._compile_ahead.start()
+
+    def _stop_compile_ahead(self) -> None:
+        if self._compile_ahead is None:
+            return
+        self._compile_ahead.stop()
+        logger.debug(
+            'Compiled {} nodes ahead of time, taking {:0.2f}s of compilation '
+            'off the worker threads'.format(
+                self._compile_ahead.used, self._compile_ahead.seconds_saved
+            )
+        )
+        self._compile_ahead = None
 
     def call_runner(self, runner):
         uid_context = UniqueID(runner.node.unique_id)
@@ -323,8 +392,11 @@ class GraphRunnableTask(ManifestTask):
 
         pool.join()
 
+    def get_num_threads(self) -> int:
+        return self.config.threads
+
     def execute_nodes(self):
-        num_threads = self.config.threads
+        num_threads = self.get_num_threads()
         target_name = self.config.target_name
 
         text = "Concurrency: {} threads (target='{}')"
@@ -335,6 +407,7 @@ class GraphRunnableTask(ManifestTask):
             print_timestamped_line("")
 
         pool = ThreadPool(num_threads)
+        self._start_compile_ahead()
         try:
             self.run_queue(pool)
 
@@ -348,6 +421,9 @@ class GraphRunnableTask(ManifestTask):
             print_run_end_messages(self.node_results, keyboard_interrupt=True)
             raise
 
+        finally:
+            self._stop_compile_ahead()
+
         pool.close()
         pool.join()
 
@@ -359,6 +435,48 @@ class GraphRunnableTask(ManifestTask):
         for dep_node_id in self.graph.get_dependent_nodes(node_id):
             self._skipped_children[dep_node_id] = cause
 
+    def _log_makespan(self, elapsed: float):
+        if self._predicted_makespan is None:
+            return
+        logger.info(
+            'Expected to run nodes in {:0.2f}s based on previous runtimes, '
+            'took {:0.2f}s.'.format(self._predicted_makespan, elapsed)
+        )
+
+    def _log_materialization_cache_stats(self):
+        if self.manifest is None:
+            return
+        hits, misses = self.manifest.get_materialization_cache_stats()
+        if hits + misses == 0:
+            return
+        logger.debug(
+            'Materialization macro lookups: {} cached, {} resolved ({:.1%} '
+            'hit rate)'.format(hits, misses, hits / (hits + misses))
+        )
+
+    def _log_ephemeral_cache_stats(self):
+        if self.manifest is None:
+            return
+        hits, misses = self.manifest.get_ephemeral_cache_stats()
+        if hits + misses == 0:
+            return
+        logger.debug(
+            'Ephemeral models injected: {} already compiled, {} compiled '
+            'just in time'.format(hits, misses)
+        )
+
+    def _skip_unchanged_files(self) -> bool:
+        return getattr(self.args, 'skip_unchanged_files', False)
+
+    def _log_file_writer_stats(self, writer: BufferedFileWriter):
+        if writer.written + writer.unchanged == 0:
+            return
+        logger.debug(
+            'Wrote {} compiled and run files, skipped {} unchanged'.format(
+                writer.written, writer.unchanged
+            )
+        )
+
     def populate_adapter_cache(self, adapter):
         adapter.set_relations_cache(self.manifest)
 
@@ -381,7 +499,11 @@ class GraphRunnableTask(ManifestTask):
             self.before_hooks(adapter)
             started = time.time()
             self.before_run(adapter, selected_uids)
+            nodes_started = time.time()
             res = self.execute_nodes()
+            self._log_makespan(time.time() - nodes_started)
+            self._log_materialization_cache_stats()
+            self._log_ephemeral_cache_stats()
             self.after_run(adapter, res)
             elapsed = time.time() - started
             self.after_hooks(adapter, res, elapsed)
@@ -422,7 +544,11 @@ class GraphRunnableTask(ManifestTask):
             with TextOnly():
                 logger.info("")
             selected_uids = frozenset(n.unique_id for n in self._flattened_nodes)
-            result = self.execute_with_hooks(selected_uids)
+            # the compiled and run files are written in the background, and
+            # all of them are written when this returns
+            with buffered_writes(self._skip_unchanged_files()) as writer:
+                result = self.execute_with_hooks(selected_uids)
+            self._log_file_writer_stats(writer)
 
         if flags.WRITE_JSON:
             self.write_manifest()
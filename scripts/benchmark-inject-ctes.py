@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+"""Measure the time it takes to inject the CTEs of synthetic chains of
+ephemeral models, the way Compiler._recursively_prepend_ctes does, with and
+without parsing the SQL with sqlparse.
+"""
+from argparse import ArgumentParser
+import time
+from typing import Callable, Dict, List
+from unittest.mock import patch
+
+import dbt.compilation
+from dbt.compilation import Compiler, _extend_prepended_ctes
+from dbt.contracts.graph.compiled import InjectedCTE
+
+
+def model_sql(index: int, columns: int) -> str:
+    # Every model in the chain selects a few columns from the one before it,
+    # and every other one has a CTE of its own.
+    select = ',\n'.join(f'    column_{i}' for i in range(columns))
+    parent = f'__dbt__cte__model_{index - 1}' if index else 'source_table'
+    if index % 2:
+        return (
+            f'with renamed as (\n  select\n{select}\n  from {parent}\n)\n'
+            f'select * from renamed'
+        )
+    return f'-- model {index}\nselect\n{select}\nfrom {parent}'
+
+
+def inject_chain(compiler: Compiler, depth: int, columns: int) -> str:
+    # model_0 <- model_1 <- ... <- model_{depth - 1}, all but the last one
+    # ephemeral
+    extra_ctes: List[InjectedCTE] = []
+    injected_sql = ''
+    for index in range(depth):
+        sql = model_sql(index, columns)
+        prepended_ctes: Dict[str, InjectedCTE] = {}
+        if index:
+            parent_sql = model_sql(index - 1, columns)
+            _extend_prepended_ctes(prepended_ctes, extra_ctes)
+            _extend_prepended_ctes(prepended_ctes, [InjectedCTE(
+                id=f'model.pkg.model_{index - 1}',
+                sql=f' __dbt__cte__model_{index - 1} as (\n{parent_sql}\n)',
+            )])
+        extra_ctes = list(prepended_ctes.values())
+        injected_sql = compiler._inject_ctes_into_sql(sql, extra_ctes)
+    return injected_sql
+
+
+def measure(func: Callable[[], object], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = ArgumentParser(prog='Benchmark Compiler._inject_ctes_into_sql')
+    parser.add_argument(
+        '--depths', type=int, nargs='+', default=[1, 5, 10, 25, 50]
+    )
+    parser.add_argument('--columns', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    compiler = Compiler(config=None)
+    print(f'{"depth":>5} {"method":>8} {"seconds":>9}')
+    for depth in args.depths:
+        expected = inject_chain(compiler, depth, args.columns)
+        elapsed = measure(
+            lambda: inject_chain(compiler, depth, args.columns), args.repeat
+        )
+        print(f'{depth:>5} {"scan":>8} {elapsed:>9.4f}')
+        with patch.object(
+            dbt.compilation, '_inject_ctes_without_parsing', return_value=None
+        ):
+            parsed = inject_chain(compiler, depth, args.columns)
+            elapsed = measure(
+                lambda: inject_chain(compiler, depth, args.columns),
+                args.repeat,
+            )
+        print(f'{depth:>5} {"sqlparse":>8} {elapsed:>9.4f}')
+        if parsed != expected:
+            raise AssertionError(f'The injected SQL differs at depth {depth}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+"""Measure the time and peak memory of Graph.get_subset_graph on synthetic
+DAGs, optionally next to the transitive closure it used to compute.
+"""
+from argparse import ArgumentParser
+import random
+import time
+import tracemalloc
+from typing import Callable, List, Set, Tuple
+
+import networkx as nx
+
+from dbt.graph import Graph
+
+
+def build_graph(size: int, seed: int) -> nx.DiGraph:
+    # Every node depends on up to 3 of the 200 nodes before it, which is
+    # roughly the shape of a large project: long chains with a lot of fan in.
+    rand = random.Random(seed)
+    graph = nx.DiGraph()
+    nodes = [f'model.pkg.m{i}' for i in range(size)]
+    graph.add_nodes_from(nodes)
+    for i in range(1, size):
+        window = range(max(0, i - 200), i)
+        for parent in rand.sample(window, min(3, len(window))):
+            graph.add_edge(nodes[parent], nodes[i])
+    return graph
+
+
+def closure_subset_graph(graph: nx.DiGraph, selected: Set[str]) -> nx.DiGraph:
+    new_graph = nx.algorithms.transitive_closure(graph)
+    for node in graph:
+        if node not in selected:
+            new_graph.remove_node(node)
+    return new_graph
+
+
+def measure(func: Callable[[], object]) -> Tuple[float, float]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / (1024 * 1024)
+
+
+def main():
+    parser = ArgumentParser(prog='Benchmark Graph.get_subset_graph')
+    parser.add_argument(
+        '--sizes', type=int, nargs='+', default=[1000, 10000, 50000]
+    )
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument(
+        '--compare-closure',
+        type=int,
+        default=1000,
+        metavar='MAX_SIZE',
+        help='Also time the transitive closure for graphs up to this size',
+    )
+    args = parser.parse_args()
+
+    print(f'{"nodes":>7} {"selected":>9} {"method":>8} {"seconds":>9} '
+          f'{"peak MiB":>9}')
+    for size in args.sizes:
+        nx_graph = build_graph(size, args.seed)
+        graph = Graph(nx_graph)
+        rand = random.Random(args.seed)
+        nodes: List[str] = list(graph)
+        for count in (5, size // 10, size):
+            selected = set(rand.sample(nodes, count))
+            methods = [
+                ('subset', lambda: graph.get_subset_graph(selected)),
+            ]
+            if size <= args.compare_closure:
+                methods.append((
+                    'closure',
+                    lambda: closure_subset_graph(nx_graph, selected),
+                ))
+            for name, func in methods:
+                elapsed, peak = measure(func)
+                print(f'{size:>7} {count:>9} {name:>8} {elapsed:>9.3f} '
+                      f'{peak:>9.1f}')
+
+
+if __name__ == '__main__':
+    main()
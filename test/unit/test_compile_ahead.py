@@ -0,0 +1,74 @@
+import threading
+import unittest
+from unittest import mock
+
+from dbt.task.compile_ahead import CompileAhead
+
+
+def make_node(unique_id):
+    node = mock.MagicMock()
+    node.unique_id = unique_id
+    return node
+
+
+class TestCompileAhead(unittest.TestCase):
+    def setUp(self):
+        self.nodes = [make_node(f'model.pkg.{name}') for name in 'abc']
+        self.compiled = []
+
+    def compile_node(self, node):
+        self.compiled.append(node.unique_id)
+        return f'compiled {node.unique_id}'
+
+    def test_compiles_nodes_in_order(self):
+        compile_ahead = CompileAhead(self.nodes, self.compile_node)
+        compile_ahead.start()
+        compile_ahead.stop()
+        self.assertEqual(
+            self.compiled, ['model.pkg.a', 'model.pkg.b', 'model.pkg.c']
+        )
+
+        compiled, timing = compile_ahead.take('model.pkg.b')
+        self.assertEqual(compiled, 'compiled model.pkg.b')
+        self.assertEqual(timing.name, 'compile')
+        self.assertLessEqual(timing.started_at, timing.completed_at)
+        self.assertEqual(compile_ahead.used, 1)
+        # a node is only handed out once
+        self.assertIsNone(compile_ahead.take('model.pkg.b'))
+
+    def test_taken_nodes_are_not_compiled(self):
+        compile_ahead = CompileAhead(self.nodes, self.compile_node)
+        self.assertIsNone(compile_ahead.take('model.pkg.a'))
+        compile_ahead.start()
+        compile_ahead.stop()
+        self.assertEqual(self.compiled, ['model.pkg.b', 'model.pkg.c'])
+        self.assertEqual(compile_ahead.used, 0)
+
+    def test_failed_compile_is_left_to_the_worker(self):
+        def compile_node(node):
+            if node.unique_id == 'model.pkg.b':
+                raise ValueError('uses run_query')
+            return self.compile_node(node)
+
+        compile_ahead = CompileAhead(self.nodes, compile_node)
+        compile_ahead.start()
+        compile_ahead.stop()
+        self.assertIsNone(compile_ahead.take('model.pkg.b'))
+        self.assertIsNotNone(compile_ahead.take('model.pkg.c'))
+
+    def test_take_waits_for_compiling_node(self):
+        started = threading.Event()
+        finish = threading.Event()
+
+        def compile_node(node):
+            started.set()
+            finish.wait()
+            return self.compile_node(node)
+
+        compile_ahead = CompileAhead(self.nodes[:1], compile_node)
+        compile_ahead.start()
+        started.wait()
+        threading.Timer(0.05, finish.set).start()
+        compiled, _ = compile_ahead.take('model.pkg.a')
+        compile_ahead.stop()
+        self.assertEqual(compiled, 'compiled model.pkg.a')
@@ -1,3 +1,7 @@
+import pickle
+import shutil
+import threading
+import time
 import unittest
 from unittest.mock import MagicMock, patch
 
@@ -9,8 +13,10 @@ from dbt.contracts.graph.manifest import Manifest
 from dbt.contracts.graph.parsed import NodeConfig, DependsOn, ParsedModelNode
 from dbt.contracts.graph.compiled import CompiledModelNode, InjectedCTE
 from dbt.node_types import NodeType
+from dbt.task import parallel_compile
 
 from datetime import datetime
+from tempfile import mkdtemp
 
 from .utils import inject_adapter, clear_plugin, config_from_parts_or_dicts
 
@@ -23,6 +29,8 @@ class CompilerTest(unittest.TestCase):
 
     def setUp(self):
         dbt.flags.STRICT_MODE = True
+        self.target_path = mkdtemp()
+        self.addCleanup(shutil.rmtree, self.target_path, ignore_errors=True)
 
         self.maxDiff = None
 
@@ -44,6 +52,8 @@ class CompilerTest(unittest.TestCase):
             'profile': 'test',
             'project-root': '/tmp/dbt/does-not-exist',
             'config-version': 2,
+            # compiling ephemeral models writes their SQL
+            'target-path': self.target_path,
         }
         profile_cfg = {
             'outputs': {
@@ -392,6 +402,106 @@ class CompilerTest(unittest.TestCase):
         self.assertTrue(
             manifest.nodes['model.root.ephemeral'].extra_ctes_injected)
 
+    def _make_manifest(self, models):
+        nodes = {}
+        for name, materialized, raw_sql in models:
+            nodes[f'model.root.{name}'] = ParsedModelNode(
+                name=name,
+                database='dbt',
+                schema='analytics',
+                alias=name,
+                resource_type=NodeType.Model,
+                unique_id=f'model.root.{name}',
+                fqn=['root', name],
+                package_name='root',
+                root_path='/usr/src/app',
+                config=self.model_config.replace(materialized=materialized),
+                path=f'{name}.sql',
+                original_file_path=f'{name}.sql',
+                raw_sql=raw_sql,
+                checksum=FileHash.from_contents(''),
+            )
+        return Manifest(
+            macros={}, nodes=nodes, sources={}, docs={}, disabled=[],
+            files={}, exposures={}, selectors={},
+        )
+
+    def test__prepend_ctes__ephemeral_compiled_once(self):
+        manifest = self._make_manifest([
+            ('view_one', 'view', 'select * from {{ref("ephemeral")}}'),
+            ('view_two', 'view', 'select * from {{ref("ephemeral")}}'),
+            ('ephemeral', 'ephemeral', 'select * from source_table'),
+        ])
+        compiler = dbt.compilation.Compiler(self.config)
+        compile_node = compiler._compile_node
+        compiled = []
+        both_started = threading.Barrier(2)
+
+        def slow_compile_node(node, *args):
+            if node.unique_id == 'model.root.ephemeral':
+                compiled.append(node.unique_id)
+                # give the other thread time to find it being compiled
+                time.sleep(0.05)
+            return compile_node(node, *args)
+
+        def compile_view(name):
+            both_started.wait()
+            results[name] = compiler.compile_node(
+                manifest.nodes[f'model.root.{name}'], manifest, write=False
+            )
+
+        results = {}
+        with patch.object(compiler, '_compile_node', slow_compile_node):
+            threads = [
+                threading.Thread(target=compile_view, args=(name,))
+                for name in ('view_one', 'view_two')
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(compiled, ['model.root.ephemeral'])
+        self.assertEqual(manifest.get_ephemeral_cache_stats(), (1, 1))
+        for result in results.values():
+            self.assertEqualIgnoreWhitespace(
+                result.compiled_sql,
+                ('with __dbt__cte__ephemeral as ('
+                 'select * from source_table'
+                 ') '
+                 'select * from __dbt__cte__ephemeral'))
+
+    def test__compile_node_in_worker(self):
+        manifest = self._make_manifest([
+            ('view', 'view', 'select * from {{ref("ephemeral")}}'),
+            ('ephemeral', 'ephemeral', 'select * from source_table'),
+        ])
+
+        # run the worker in this process, with a copy of the manifest as if
+        # it had been sent to another process
+        self.addCleanup(parallel_compile._WORKER_STATE.clear)
+        parallel_compile._WORKER_STATE.update(
+            config=self.config,
+            manifest=pickle.loads(pickle.dumps(manifest)),
+        )
+        with patch.object(dbt.compilation.Compiler, '_write_node') as write:
+            write.side_effect = lambda node: node
+            result = parallel_compile._compile_node('model.root.view')
+            missing = parallel_compile._compile_node('model.root.missing')
+
+        self.assertTrue(result.node.extra_ctes_injected)
+        self.assertEqualIgnoreWhitespace(
+            result.node.compiled_sql,
+            ('with __dbt__cte__ephemeral as ('
+             'select * from source_table'
+             ') '
+             'select * from __dbt__cte__ephemeral'))
+        # the ephemeral model was only compiled in the worker's manifest
+        self.assertFalse(getattr(
+            manifest.nodes['model.root.ephemeral'], 'compiled', False
+        ))
+        self.assertIsNone(missing.node)
+
     def test__prepend_ctes__multiple_levels(self):
         ephemeral_config = self.model_config.replace(materialized='ephemeral')
 
@@ -565,3 +675,43 @@ class CompilerTest(unittest.TestCase):
             'select * from __dbt__cte__inner_ephemeral')
         )
 
+    def test__inject_ctes_into_sql__matches_sqlparse(self):
+        compiler = dbt.compilation.Compiler(self.config)
+        ctes = [
+            InjectedCTE(id='model.root.one', sql=' one as (select 1)'),
+            InjectedCTE(id='model.root.two', sql=' two as (select 2)'),
+        ]
+        cases = [
+            ('select * from one', True),
+            ('\n  select * from one', True),
+            ('-- with a comment\nselect * from one', False),
+            ('with x as (select 1)\nselect * from x', True),
+            ('  /* header */\nWITH\n  x as (select 1) select * from x', True),
+            ('with/* c */x as (select 1) select * from x', False),
+            ('select 1 as with_one', True),
+            ('(with x as (select 1) select * from x)', False),
+            ('select 1; select 2', False),
+            ('/* one */ /* two */ with x as (select 1) select * from x', True),
+            # a later comment doesn't make the 'with' after it look first
+            ('/* orders model */\nselect * from {{ this }} /* hint */ '
+             'with (nolock)', False),
+            ('/* one */ select * from x /* two */ with x as (select 1) '
+             'select * from x', False),
+        ]
+        for sql, fast in cases:
+            with self.subTest(sql=sql):
+                cte_sql = ', '.join(c.sql for c in ctes)
+                injected = dbt.compilation._inject_ctes_without_parsing(
+                    sql, cte_sql
+                )
+                self.assertEqual(injected is not None, fast)
+                expected = compiler._inject_ctes_into_sql(sql, ctes)
+                if injected is not None:
+                    # the same as the SQL sqlparse would produce
+                    with patch.object(
+                        dbt.compilation, '_inject_ctes_without_parsing',
+                        return_value=None,
+                    ):
+                        parsed = compiler._inject_ctes_into_sql(sql, ctes)
+                    self.assertEqual(injected, parsed)
+                    self.assertEqual(expected, parsed)
@@ -10,13 +10,14 @@ import pytest
 from dbt.adapters import postgres, redshift
 from dbt.adapters import factory
 from dbt.adapters.base import AdapterConfig
-from dbt.clients.jinja import MacroStack
+from dbt.clients.jinja import MacroStack, get_rendered
 from dbt.contracts.graph.parsed import (
     ParsedModelNode, NodeConfig, DependsOn, ParsedMacro
 )
 from dbt.config.project import VarProvider
 from dbt.context import base, target, configured, providers, docs, manifest, macros
 from dbt.contracts.files import FileHash
+from dbt.contracts.graph.manifest import Manifest
 from dbt.node_types import NodeType
 import dbt.exceptions
 from .utils import profile_from_dict, config_from_parts_or_dicts, inject_adapter, clear_plugin
@@ -159,11 +160,20 @@ class TestRuntimeWrapper(unittest.TestCase):
         assert arg.database == 'database'
         assert arg.schema == 'schema'
 
+    def test_introspection_disallowed(self):
+        with providers.introspection_disallowed():
+            self.assertEqual(self.wrapper.quote('test_value'), '"test_value"')
+            with self.assertRaises(dbt.exceptions.RuntimeException):
+                self.wrapper.get_relation('database', 'schema', 'identifier')
+        self.responder.list_relations_without_caching.assert_not_called()
+
 
 def assert_has_keys(
     required_keys: Set[str], maybe_keys: Set[str], ctx: Dict[str, Any]
 ):
-    keys = set(ctx)
+    # the macros of a manifest context are resolved when they're looked up,
+    # so they aren't keys of the dict itself
+    keys = set(ctx) | set(getattr(ctx, 'macros', ()))
     for key in required_keys:
         assert key in keys, f'{key} in required keys but not in context'
         keys.remove(key)
@@ -329,7 +339,7 @@ def mock_manifest(config):
     for name in ['macro_a', 'macro_b']:
         macro = mock_macro(name, config.project_name)
         manifest_macros[macro.unique_id] = macro
-    return mock.MagicMock(macros=manifest_macros)
+    return mock.MagicMock(macros=manifest_macros, _shared_macro_namespace=None)
 
 
 def mock_model():
@@ -434,6 +444,27 @@ def test_query_header_context(config, manifest_fx):
     assert_has_keys(REQUIRED_QUERY_HEADER_KEYS, MAYBE_KEYS, ctx)
 
 
+def test_manifest_context_binds_macros_on_lookup(config, manifest_fx):
+    # a macro with the name of a context member replaces it
+    env_var_macro = mock_macro('env_var', 'root')
+    manifest_fx.macros[env_var_macro.unique_id] = env_var_macro
+    ctx = manifest.generate_query_header_context(
+        config=config,
+        manifest=manifest_fx,
+    )
+    macro_a = manifest_fx.macros['macro.root.macro_a']
+    assert 'macro_a' not in set(ctx)
+    assert ctx['env_var'].macro is env_var_macro
+    assert ctx.macros._bound == {env_var_macro.unique_id: ctx['env_var']}
+
+    assert 'macro_a' in ctx
+    assert ctx['macro_a'].macro is macro_a
+    assert ctx.get('macro_a') is ctx['macro_a']
+    assert ctx.get('missing_macro') is None
+    # templates resolve them from a copy of the context
+    assert get_rendered('{{ macro_a.macro.name }}', ctx) == 'macro_a'
+
+
 def test_macro_runtime_context(config, manifest_fx, get_adapter, get_include_paths):
     ctx = providers.generate_runtime_macro(
         macro=manifest_fx.macros['macro.root.macro_a'],
@@ -515,6 +546,56 @@ def test_macro_namespace(config, manifest_fx):
         assert result['some_macro'].macro is package_macro
 
 
+def test_shared_macro_namespace(config, manifest_fx):
+    dbt_macro = mock_macro('some_macro', 'dbt')
+    package_macro = mock_macro('some_macro', 'root')
+    for macro in (dbt_macro, package_macro):
+        manifest_fx.macros[macro.unique_id] = macro
+
+    internal_packages = ['dbt_postgres', 'dbt']
+    shared = macros.get_shared_namespace(manifest_fx, 'root', internal_packages)
+    # built once for the same macros
+    assert macros.get_shared_namespace(manifest_fx, 'root', internal_packages) is shared
+
+    def bind():
+        builder = macros.MacroNamespaceBuilder(
+            'root', 'search', MacroStack(), internal_packages
+        )
+        return builder.bind_namespace(shared, {})
+
+    first, second = bind(), bind()
+    # nothing is bound until it's looked up
+    assert first._bound == {}
+    assert first['some_macro'].macro is package_macro
+    assert first['dbt']['some_macro'].macro is dbt_macro
+    assert first.get_from_package('dbt', 'some_macro') is first['dbt']['some_macro']
+    assert len(first._bound) == 2
+    assert second._bound == {}
+    assert second['some_macro'] is not first['some_macro']
+
+    # new macros mean a new shared namespace
+    new_macro = mock_macro('new_macro', 'root')
+    manifest_fx.macros[new_macro.unique_id] = new_macro
+    assert macros.get_shared_namespace(manifest_fx, 'root', internal_packages) is not shared
+
+
+def test_shared_macro_namespace_override_in_place():
+    macro = mock_macro('some_macro', 'root')
+    manifest = Manifest(
+        nodes={}, sources={}, macros={macro.unique_id: macro}, docs={},
+        disabled=[], files={}, exposures={}, selectors={},
+    )
+    internal_packages = ['dbt_postgres', 'dbt']
+    shared = macros.get_shared_namespace(manifest, 'root', internal_packages)
+    assert shared.members('root')['some_macro'] is macro
+
+    # like an RPC request's macro overrides, with the same unique ID
+    override = mock_macro('some_macro', 'root')
+    manifest.update_macros({override.unique_id: override})
+    shared = macros.get_shared_namespace(manifest, 'root', internal_packages)
+    assert shared.members('root')['some_macro'] is override
+
+
 def test_resolve_specific(config, manifest_extended, redshift_adapter, get_include_paths):
     rs_macro = manifest_extended.macros['macro.dbt_redshift.redshift__some_macro']
     package_rs_macro = manifest_extended.macros['macro.root.redshift__some_macro']
@@ -0,0 +1,72 @@
+import os
+import shutil
+import unittest
+from tempfile import mkdtemp
+
+from dbt.clients import file_writer
+
+
+class BufferedFileWriterTest(unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.tmp_dir = mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def path(self, *parts):
+        return os.path.join(self.tmp_dir, *parts)
+
+    def read(self, path):
+        with open(path) as fp:
+            return fp.read()
+
+    def test_writes_queued_files(self):
+        one = self.path('compiled', 'pkg', 'one.sql')
+        two = self.path('compiled', 'pkg', 'models', 'two.sql')
+        with file_writer.buffered_writes() as writer:
+            file_writer.write_output(one, 'select 1')
+            file_writer.write_output(two, 'select 2')
+            file_writer.write_output(one, 'select 11')
+            writer.flush()
+            self.assertEqual(self.read(two), 'select 2')
+
+        self.assertEqual(self.read(one), 'select 11')
+        self.assertIsNone(file_writer._ACTIVE_WRITER)
+
+    def test_writes_without_writer(self):
+        path = self.path('run', 'pkg', 'one.sql')
+        file_writer.write_output(path, 'select 1')
+        self.assertEqual(self.read(path), 'select 1')
+
+    def test_skip_unchanged(self):
+        same = self.path('same.sql')
+        changed = self.path('changed.sql')
+        for path in (same, changed):
+            with open(path, 'w') as fp:
+                fp.write('select 1')
+            os.utime(path, (0, 0))
+
+        with file_writer.buffered_writes(skip_unchanged=True) as writer:
+            file_writer.write_output(same, 'select 1')
+            file_writer.write_output(changed, 'select 2')
+
+        self.assertEqual(os.stat(same).st_mtime, 0)
+        self.assertEqual(self.read(changed), 'select 2')
+        self.assertEqual((writer.written, writer.unchanged), (1, 1))
+
+    def test_raises_first_error(self):
+        # a file where the writer needs a directory
+        blocker = self.path('blocker')
+        with open(blocker, 'w') as fp:
+            fp.write('')
+        written = self.path('written.sql')
+
+        with self.assertRaises(OSError):
+            with file_writer.buffered_writes():
+                file_writer.write_output(
+                    os.path.join(blocker, 'one.sql'), 'select 1'
+                )
+                file_writer.write_output(written, 'select 2')
+
+        self.assertEqual(self.read(written), 'select 2')
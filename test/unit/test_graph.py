@@ -1,4 +1,6 @@
+import copy
 import os
+import tempfile
 import unittest
 from unittest.mock import MagicMock, patch
 
@@ -12,9 +14,15 @@ import dbt.parser
 import dbt.config
 import dbt.utils
 import dbt.parser.manifest
+import dbt.parser.parallel
 from dbt.contracts.files import SourceFile, FileHash, FilePath
-from dbt.contracts.graph.manifest import Manifest, MacroManifest, ManifestStateCheck
+from dbt.contracts.graph.manifest import (
+    Manifest, MacroManifest, ManifestStateCheck, SelectorIndex
+)
 from dbt.parser.base import BaseParser
+from dbt.parser.parse_cache import (
+    PARTIAL_PARSE_FORMAT_VERSION, read_parse_cache, write_parse_cache
+)
 from dbt.graph import NodeSelector, parse_difference
 
 try:
@@ -326,6 +334,9 @@ class GraphTest(unittest.TestCase):
             for n in model_ids
         })
         manifest.expect.side_effect = lambda n: MagicMock(unique_id=n)
+        manifest.get_selector_index.side_effect = (
+            lambda: SelectorIndex(manifest)
+        )
         selector = NodeSelector(graph, manifest)
         queue = selector.get_graph_queue(parse_difference(None, None))
 
@@ -347,8 +358,58 @@ class GraphTest(unittest.TestCase):
         loader = dbt.parser.manifest.ManifestLoader(config, {config.project_name: config})
         loader.manifest = manifest.deepcopy()
 
-        self.assertTrue(loader.matching_parse_results(manifest))
-        manifest.metadata.dbt_version = '0.0.1a1'
-        self.assertFalse(loader.matching_parse_results(manifest))
-        manifest.metadata.dbt_version = '99999.99.99'
+        with tempfile.TemporaryDirectory() as cache_path:
+            write_parse_cache(manifest, cache_path)
+            saved = read_parse_cache(cache_path)
+
+        self.assertTrue(loader.matching_parse_results(saved))
+        saved.format_version = 0
+        self.assertFalse(loader.matching_parse_results(saved))
+        saved.format_version = PARTIAL_PARSE_FORMAT_VERSION + 1
+        self.assertFalse(loader.matching_parse_results(saved))
+        # a plain manifest has no format version
         self.assertFalse(loader.matching_parse_results(manifest))
+
+    def test__parse_in_processes(self):
+        self.use_models({
+            'model_one': 'select * from events',
+            'model_two': "select * from {{ref('model_one')}}",
+            'model_three': "select * from {{ref('model_two')}}",
+        })
+        config = self.get_config()
+
+        # run the workers in this process, but copy the tasks as if they
+        # had been sent to another process
+        def parse_files(root_project, all_projects, macros, tasks, processes):
+            dbt.parser.parallel._WORKER_STATE.update(
+                root_project=root_project,
+                all_projects=all_projects,
+                macros=macros,
+            )
+            results = [
+                dbt.parser.parallel._parse_file(copy.deepcopy(task))
+                for task in tasks
+            ]
+            return {result.search_key: result for result in results}
+
+        with patch('dbt.parser.manifest.parse_files_in_processes') as mock_parse, \
+                patch.object(dbt.flags, 'PARSE_PROCESSES', 2):
+            mock_parse.side_effect = parse_files
+            manifest = self.load_manifest(config)
+
+        tasks = mock_parse.call_args[0][3]
+        self.assertEqual(len(tasks), 3)
+        self.assertEqual(
+            list(manifest.nodes),
+            [
+                'model.test_models_compile.model_one',
+                'model.test_models_compile.model_two',
+                'model.test_models_compile.model_three',
+            ]
+        )
+        self.assertEqual(
+            manifest.nodes['model.test_models_compile.model_three'].depends_on.nodes,
+            ['model.test_models_compile.model_two']
+        )
+        for source_file in self.mock_models:
+            self.assertEqual(len(manifest.files[source_file.search_key].nodes), 1)
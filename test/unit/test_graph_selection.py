@@ -3,10 +3,12 @@ from unittest import mock
 
 import pytest
 
+import random
 import string
 import dbt.exceptions
 import dbt.graph.selector as graph_selector
 import dbt.graph.cli as graph_cli
+from dbt.contracts.graph.manifest import SelectorIndex
 from dbt.node_types import NodeType
 
 import networkx as nx
@@ -46,7 +48,9 @@ def _get_manifest(graph):
     nodes['m.X.e'].tags = ['efg', 'bcef']
     nodes['m.Y.f'].tags = ['efg', 'bcef']
     nodes['m.X.g'].tags = ['efg']
-    return mock.MagicMock(nodes=nodes)
+    manifest = mock.MagicMock(nodes=nodes)
+    manifest.get_selector_index.side_effect = lambda: SelectorIndex(manifest)
+    return manifest
 
 
 @pytest.fixture
@@ -195,3 +199,59 @@ invalid_specs = [
 def test_invalid_specs(invalid):
     with pytest.raises(dbt.exceptions.RuntimeException):
         graph_selector.SelectionCriteria.from_single_spec(invalid)
+
+
+def test_subset_graph_reachability():
+    rand = random.Random(1234)
+    nodes = [f'n{i}' for i in range(80)]
+    full_graph = nx.DiGraph()
+    full_graph.add_nodes_from(nodes)
+    for i, parent in enumerate(nodes):
+        for child in rand.sample(nodes[i + 1:], min(2, len(nodes) - i - 1)):
+            full_graph.add_edge(parent, child)
+    graph = graph_selector.Graph(full_graph)
+    closure = nx.transitive_closure(full_graph)
+
+    for size in (0, 1, 5, 40, 80):
+        selected = set(rand.sample(nodes, size))
+        subset = graph.get_subset_graph(selected)
+        assert set(subset) == selected
+        for node in selected:
+            expected = set(closure.successors(node)) & selected
+            assert subset.descendants(node) == expected
+
+
+def test_subset_graph_missing_node(graph):
+    with pytest.raises(ValueError):
+        graph.get_subset_graph(['m.X.a', 'm.X.missing'])
+
+
+def test_select_children_and_parents_multi_source():
+    rand = random.Random(1234)
+    nodes = [f'n{i}' for i in range(80)]
+    full_graph = nx.DiGraph()
+    full_graph.add_nodes_from(nodes)
+    for i, parent in enumerate(nodes):
+        for child in rand.sample(nodes[i + 1:], min(2, len(nodes) - i - 1)):
+            full_graph.add_edge(parent, child)
+    graph = graph_selector.Graph(full_graph)
+
+    def within(node, depth, reverse):
+        lengths = nx.single_source_shortest_path_length(
+            full_graph.reverse() if reverse else full_graph, node, depth
+        )
+        return set(lengths) - {node}
+
+    for size in (1, 5, 30):
+        selected = set(rand.sample(nodes, size))
+        for depth in (None, 0, 1, 3):
+            children = set().union(
+                *(within(node, depth, False) for node in selected)
+            )
+            parents = set().union(
+                *(within(node, depth, True) for node in selected)
+            )
+            assert graph.select_children(selected, depth) == children
+            assert graph.select_parents(selected, depth) == parents
+            # the second time around comes from the cache
+            assert graph.select_children(selected, depth) == children
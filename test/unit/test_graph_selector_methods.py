@@ -7,7 +7,9 @@ from pathlib import Path
 from dbt.contracts.files import FileHash
 from dbt.contracts.graph.parsed import (
     DependsOn,
+    MacroDependsOn,
     NodeConfig,
+    ParsedMacro,
     ParsedModelNode,
     ParsedExposure,
     ParsedSeedNode,
@@ -18,7 +20,7 @@ from dbt.contracts.graph.parsed import (
     TestMetadata,
     ColumnInfo,
 )
-from dbt.contracts.graph.manifest import Manifest
+from dbt.contracts.graph.manifest import Manifest, WritableManifest
 from dbt.contracts.graph.unparsed import ExposureType, ExposureOwner
 from dbt.contracts.state import PreviousState
 from dbt.node_types import NodeType
@@ -295,6 +297,22 @@ def make_data_test(pkg, name, sql, refs=None, sources=None, tags=None, path=None
     )
 
 
+def make_macro(pkg, name, macro_sql, calls=()):
+    return ParsedMacro(
+        name=name,
+        resource_type=NodeType.Macro,
+        unique_id=f'macro.{pkg}.{name}',
+        package_name=pkg,
+        root_path='/usr/dbt/some-project',
+        path=f'{name}.sql',
+        original_file_path=f'macros/{name}.sql',
+        macro_sql=macro_sql,
+        depends_on=MacroDependsOn(
+            macros=[f'macro.{pkg}.{called}' for called in calls]
+        ),
+    )
+
+
 def make_exposure(pkg, name, path=None, fqn_extras=None, owner=None):
     if path is None:
         path = 'schema.yml'
@@ -537,6 +555,30 @@ def test_select_fqn(manifest):
         manifest, method, 'ext') == {'ext_model'}
 
 
+def test_select_fqn_index_matches_node_is_match(manifest):
+    method = MethodManager(manifest, None).get_method('fqn', [])
+    selectors = ['*', 'seed', 'pkg.*', 'pkg.mynamespace', 'mynamespace.*',
+                 'mynamespace.union_model', 'pkg.mynamespace.seed.extra',
+                 'ext.*.x', 'union_model', 'missing']
+    for selector in selectors:
+        expected = {
+            unique_id for unique_id, node in manifest.nodes.items()
+            if method.node_is_match(selector, node.fqn)
+        }
+        assert set(method.search(set(manifest.nodes), selector)) == expected
+
+
+def test_selector_index_rebuilt_after_add(manifest, view_model):
+    index = manifest.get_selector_index()
+    assert manifest.get_selector_index() is index
+    new_model = copy.deepcopy(view_model)
+    new_model.unique_id = 'model.pkg.new_model'
+    new_model.tags = ['new']
+    manifest.add_node_nofile(new_model)
+    assert manifest.get_selector_index() is not index
+    assert manifest.get_selector_index().tags['new'] == {'model.pkg.new_model'}
+
+
 def test_select_tag(manifest):
     methods = MethodManager(manifest, None)
     method = methods.get_method('tag', [])
@@ -682,6 +724,12 @@ def change_node(manifest, node, change=None):
     if change is not None:
         node = change(node)
     manifest.nodes[node.unique_id] = node
+    # a previous manifest is read from disk, where its fingerprints match
+    if isinstance(manifest, WritableManifest):
+        manifest.fingerprints.pop(node.unique_id, None)
+        fingerprint = node.content_fingerprint()
+        if fingerprint is not None:
+            manifest.fingerprints[node.unique_id] = fingerprint
 
 
 def statemethod(manifest, previous_state):
@@ -698,6 +746,28 @@ def test_select_state_no_change(manifest, previous_state):
     assert not search_manifest_using_method(manifest, method, 'new')
 
 
+def test_select_state_unchanged_by_fingerprint(manifest, previous_state):
+    method = statemethod(manifest, previous_state)
+    # unchanged nodes are found from their fingerprints alone
+    with mock.patch.object(method, '_previous_node') as previous_node:
+        assert not search_manifest_using_method(manifest, method, 'modified')
+        previous_node.assert_not_called()
+
+
+def test_select_state_from_disk(manifest, tmp_path, view_model):
+    writable = copy.deepcopy(manifest).writable_manifest()
+    writable.write(str(tmp_path / 'manifest.json'))
+    state = PreviousState(tmp_path)
+    # nodes are only deserialized when they're looked up
+    assert view_model.unique_id in state.manifest.nodes
+    assert not state.manifest.nodes._resources
+    method = statemethod(manifest, state)
+    assert not search_manifest_using_method(manifest, method, 'modified')
+    assert not search_manifest_using_method(manifest, method, 'new')
+    assert not state.manifest.nodes._resources
+    assert state.manifest.nodes[view_model.unique_id] == view_model
+
+
 def test_select_state_nothing(manifest, previous_state):
     previous_state.manifest = None
     method = statemethod(manifest, previous_state)
@@ -745,6 +815,37 @@ def test_select_state_added_seed(manifest, previous_state):
         manifest, method, 'new') == {'another_seed'}
 
 
+def test_select_state_changed_macros(manifest, previous_state, view_model, table_model):
+    # outer calls inner, view_model calls outer and table_model calls other
+    macros = [
+        make_macro('pkg', 'outer', '{{ inner() }}', calls=['inner']),
+        make_macro('pkg', 'inner', 'select 1'),
+        make_macro('pkg', 'other', 'select 2'),
+    ]
+    for target in (manifest, previous_state.manifest):
+        for macro in macros:
+            target.macros[macro.unique_id] = macro
+        for node, called in ((view_model, 'outer'), (table_model, 'other')):
+            changed = copy.deepcopy(node)
+            changed.depends_on.macros = [f'macro.pkg.{called}']
+            change_node(target, changed)
+
+    manifest.macros['macro.pkg.inner'] = make_macro('pkg', 'inner', 'select 3')
+    method = statemethod(manifest, previous_state)
+    assert search_manifest_using_method(
+        manifest, method, 'modified.macros') == {'view_model'}
+    assert not search_manifest_using_method(manifest, method, 'modified')
+
+    added = make_macro('pkg', 'added', 'select 4')
+    manifest.macros[added.unique_id] = added
+    manifest.macros['macro.pkg.other'] = make_macro(
+        'pkg', 'other', 'select 2', calls=['added']
+    )
+    method = statemethod(manifest, previous_state)
+    assert search_manifest_using_method(
+        manifest, method, 'modified.macros') == {'view_model', 'table_model'}
+
+
 def test_select_state_changed_seed_checksum_sha_to_sha(manifest, previous_state, seed):
     change_node(manifest, seed.replace(
         checksum=FileHash.from_contents('changed')))
@@ -6,6 +6,7 @@ import yaml
 from dbt.clients.jinja import get_rendered
 from dbt.clients.jinja import get_template
 from dbt.clients.jinja import extract_toplevel_blocks
+from dbt.clients.jinja import statically_extract_ref_source_config
 from dbt.exceptions import CompilationException, JinjaRenderingException
 
 
@@ -425,6 +426,45 @@ class TestJinja(unittest.TestCase):
         assert value == '1991'
 
 
+class TestStaticExtraction(unittest.TestCase):
+    def test_literal_calls(self):
+        s = (
+            '{{ config(materialized="table", tags=["a", "b"]) }}\n'
+            'select * from {{ ref("model_1") }}\n'
+            'join {{ source("src", "tbl") }}\n'
+            'join {{ ref("pkg", "model_2") }}\n'
+            '{{ config({"post_hook": "grant"}) }}'
+        )
+        self.assertEqual(statically_extract_ref_source_config(s), [
+            ('config', [], {'materialized': 'table', 'tags': ['a', 'b']}),
+            ('ref', ['model_1'], {}),
+            ('source', ['src', 'tbl'], {}),
+            ('ref', ['pkg', 'model_2'], {}),
+            ('config', [{'post_hook': 'grant'}], {}),
+        ])
+
+    def test_no_calls(self):
+        self.assertEqual(statically_extract_ref_source_config('select 1'), [])
+
+    def test_dynamic(self):
+        dynamic = [
+            '{{ ref(var("name")) }}',
+            '{{ ref("a").identifier }}',
+            '{{ ref("a") | upper }}',
+            '{{ ref("a", "b", "c") }}',
+            '{{ source("a") }}',
+            '{{ config("table") }}',
+            '{{ config(**opts) }}',
+            '{{ my_macro() }}',
+            '{{ this }}',
+            '{% if execute %}{{ ref("a") }}{% endif %}',
+            '{% set x = "a" %}{{ ref(x) }}',
+            '{{ SYNTAX ERROR }}',
+        ]
+        for s in dynamic:
+            self.assertIsNone(statically_extract_ref_source_config(s), s)
+
+
 class TestBlockLexer(unittest.TestCase):
     def test_basic(self):
         body = '{{ config(foo="bar") }}\r\nselect * from this.that\r\n'
@@ -1,9 +1,18 @@
 import os
+import random
 import tempfile
 import unittest
+from pathlib import Path
 from unittest import mock
 
+import networkx as nx
+
 from dbt import compilation
+from dbt.contracts.graph.manifest import SelectorIndex
+from dbt.contracts.results import (
+    RunResultOutput, RunResultsArtifact, RunResultsMetadata, RunStatus
+)
+from dbt.contracts.state import PreviousState
 try:
     from queue import Empty
 except ImportError:
@@ -11,6 +20,9 @@ except ImportError:
 
 from dbt.graph.selector import NodeSelector
 from dbt.graph.cli import parse_difference
+from dbt.graph.dag import DAG
+from dbt.graph.queue import GraphQueue, QueuePriority
+from dbt.node_types import NodeType
 
 
 def _mock_manifest(nodes):
@@ -26,6 +38,7 @@ def _mock_manifest(nodes):
         ) for n in nodes
     })
     manifest.expect.side_effect = lambda n: mock.MagicMock(unique_id=n)
+    manifest.get_selector_index.side_effect = lambda: SelectorIndex(manifest)
     return manifest
 
 
@@ -180,3 +193,149 @@ class LinkerTest(unittest.TestCase):
             self.linker.dependency(l, r)
 
         self.assertIsNone(self.linker.find_cycles())
+
+    def test__find_cycles__path(self):
+        self.linker.add_node('Z')
+        for (l, r) in [('A', 'B'), ('B', 'C'), ('C', 'A'), ('C', 'Z')]:
+            self.linker.dependency(l, r)
+
+        cycle = self.linker.find_cycles().split(' --> ')
+        self.assertEqual(sorted(cycle), ['A', 'B', 'C'])
+        # every node in the cycle depends on the one before it
+        for parent, child in zip(cycle, cycle[1:] + cycle[:1]):
+            self.assertIn(child, self.linker.graph.successors(parent))
+
+    def test_topological_order(self):
+        graph, nodes = _random_dag(random.Random(1234))
+        dag = DAG.from_edges(reversed(nodes), graph.edges())
+        order = [dag.node_id(i) for i in dag.topological_order()]
+        self.assertEqual(sorted(order), sorted(nodes))
+        position = {node: i for i, node in enumerate(order)}
+        for parent, child in graph.edges():
+            self.assertLess(position[parent], position[child])
+
+
+def _model_manifest(ephemeral=()):
+    manifest = mock.MagicMock()
+    manifest.expect.side_effect = lambda n: mock.MagicMock(
+        unique_id=n,
+        resource_type=NodeType.Model,
+        is_ephemeral=n in ephemeral,
+    )
+    return manifest
+
+
+def _random_dag(rand, size=60):
+    graph = nx.DiGraph()
+    nodes = [f'n{i}' for i in range(size)]
+    graph.add_nodes_from(nodes)
+    for i, parent in enumerate(nodes):
+        for child in rand.sample(nodes[i + 1:], min(3, len(nodes) - i - 1)):
+            graph.add_edge(parent, child)
+    return graph, nodes
+
+
+class GraphQueueTest(unittest.TestCase):
+    def test_descendant_scores_match_descendants(self):
+        rand = random.Random(1234)
+        graph, nodes = _random_dag(rand)
+        ephemeral = set(rand.sample(nodes, 10))
+
+        queue = GraphQueue(
+            DAG.from_edges(nodes, graph.edges()),
+            _model_manifest(ephemeral),
+            set(nodes),
+        )
+        for node in nodes:
+            expected = len([
+                d for d in nx.descendants(graph, node) if d not in ephemeral
+            ])
+            self.assertEqual(queue._scores[node], -expected)
+
+    def test_nodes_ready_after_parents_done(self):
+        graph, nodes = _random_dag(random.Random(1234))
+        queue = GraphQueue(
+            DAG.from_edges(nodes, graph.edges()), _model_manifest(), set(nodes)
+        )
+        done = set()
+        while not queue.empty():
+            ready = []
+            while True:
+                try:
+                    ready.append(queue.get(block=False).unique_id)
+                except Empty:
+                    break
+            self.assertTrue(ready)
+            for node in ready:
+                self.assertTrue(set(graph.predecessors(node)) <= done)
+            for node in ready:
+                queue.mark_done(node)
+                done.add(node)
+        self.assertEqual(done, set(nodes))
+        self.assert_would_join(queue)
+        # the queue doesn't change the graph it was given
+        self.assertEqual(len(queue.graph), len(nodes))
+
+    def assert_would_join(self, queue):
+        self.assertEqual(queue.inner.unfinished_tasks, 0)
+
+    def _diamond(self):
+        # A -> B -> D, A -> C -> D -> E
+        return DAG.from_edges('ABCDE', [
+            ('A', 'B'), ('A', 'C'), ('B', 'D'), ('C', 'D'), ('D', 'E')
+        ])
+
+    def test_longest_path_scores(self):
+        queue = GraphQueue(
+            self._diamond(), _model_manifest(), set('ABCDE'),
+            QueuePriority.LongestPath,
+        )
+        self.assertEqual(
+            queue._scores, {'A': -4, 'B': -3, 'C': -3, 'D': -2, 'E': -1}
+        )
+
+    def test_critical_path_scores(self):
+        runtimes = {'A': 1.0, 'B': 10.0, 'C': 2.0, 'D': 1.0}
+        queue = GraphQueue(
+            self._diamond(), _model_manifest(), set('ABCDE'),
+            QueuePriority.CriticalPath, runtimes,
+        )
+        # E has no known runtime, so it gets the average
+        self.assertEqual(queue._scores['E'], -3.5)
+        self.assertEqual(queue._scores['B'], -14.5)
+        self.assertEqual(queue._scores['C'], -6.5)
+        self.assertEqual(queue._scores['A'], -15.5)
+
+    def test_predict_makespan(self):
+        runtimes = {'A': 1.0, 'B': 10.0, 'C': 2.0, 'D': 1.0, 'E': 1.0}
+
+        def predict(threads):
+            queue = GraphQueue(
+                self._diamond(), _model_manifest(), set('ABCDE'),
+                QueuePriority.CriticalPath, runtimes,
+            )
+            return queue.predict_makespan(threads)
+
+        self.assertEqual(predict(1), 15.0)
+        # B and C run at the same time
+        self.assertEqual(predict(2), 13.0)
+
+    def test_runtimes_from_previous_state(self):
+        def result(unique_id, status, execution_time):
+            return RunResultOutput(
+                unique_id=unique_id, status=status, timing=[],
+                thread_id='Thread-1', execution_time=execution_time,
+                adapter_response={}, message=None,
+            )
+
+        artifact = RunResultsArtifact(
+            metadata=RunResultsMetadata(), elapsed_time=5.0, results=[
+                result('model.pkg.a', RunStatus.Success, 3.0),
+                result('model.pkg.b', RunStatus.Error, 1.0),
+                result('model.pkg.c', RunStatus.Skipped, 0.0),
+            ],
+        )
+        with tempfile.TemporaryDirectory() as state_path:
+            artifact.write(os.path.join(state_path, 'run_results.json'))
+            state = PreviousState(Path(state_path))
+        self.assertEqual(state.get_runtimes(), {'model.pkg.a': 3.0})
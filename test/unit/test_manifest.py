@@ -3,6 +3,7 @@ import unittest
 from unittest import mock
 
 import copy
+import json
 from collections import namedtuple
 from itertools import product
 from datetime import datetime
@@ -12,6 +13,8 @@ import pytest
 import dbt.flags
 import dbt.version
 from dbt import tracking
+from dbt.clients.jinja import get_rendered
+from dbt.context.base import BaseContext
 from dbt.contracts.files import FileHash
 from dbt.contracts.graph.manifest import Manifest, ManifestMetadata
 from dbt.contracts.graph.parsed import (
@@ -269,6 +272,7 @@ class ManifestTest(unittest.TestCase):
                 'selectors': {},
                 'parent_map': {},
                 'child_map': {},
+                'fingerprints': {},
                 'metadata': {
                     'generated_at': '2018-02-14T09:15:13Z',
                     'dbt_schema_version': 'https://schemas.getdbt.com/dbt/manifest/v1.json',
@@ -367,6 +371,64 @@ class ManifestTest(unittest.TestCase):
         for node in flat_nodes.values():
             self.assertEqual(frozenset(node), REQUIRED_PARSED_NODE_KEYS)
 
+    def test__flat_graph_is_lazy(self):
+        nodes = copy.copy(self.nested_nodes)
+        manifest = Manifest(nodes=nodes, sources={}, macros={}, docs={},
+                            disabled=[], files={}, exposures={}, selectors={})
+        manifest.build_flat_graph()
+        flat_nodes = manifest.flat_graph['nodes']
+
+        def converted():
+            return [
+                unique_id for unique_id, value in dict.items(flat_nodes)
+                if isinstance(value, dict)
+            ]
+
+        self.assertEqual(converted(), [])
+        unique_id = 'model.snowplow.events'
+        node_dict = flat_nodes[unique_id]
+        self.assertEqual(node_dict, nodes[unique_id].to_dict(omit_none=False))
+        self.assertIs(flat_nodes[unique_id], node_dict)
+        self.assertEqual(converted(), [unique_id])
+
+        # jinja sees the same shape
+        rendered = get_rendered(
+            "{{ graph.nodes.values() | selectattr('name', 'equalto', 'events') "
+            "| map(attribute='unique_id') | join(',') }}",
+            {'graph': manifest.flat_graph},
+        )
+        self.assertEqual(
+            set(rendered.split(',')),
+            {'model.snowplow.events', 'model.root.events'},
+        )
+
+    def test__flat_graph_is_a_dict(self):
+        nodes = copy.copy(self.nested_nodes)
+        manifest = Manifest(nodes=nodes, sources={}, macros={}, docs={},
+                            disabled=[], files={}, exposures={}, selectors={})
+        manifest.build_flat_graph()
+        flat_nodes = manifest.flat_graph['nodes']
+        expected = {
+            unique_id: node.to_dict(omit_none=False)
+            for unique_id, node in nodes.items()
+        }
+
+        self.assertIsInstance(flat_nodes, dict)
+        self.assertEqual(flat_nodes.copy(), expected)
+        self.assertIs(type(flat_nodes.copy()), dict)
+        self.assertEqual(repr(flat_nodes), repr(expected))
+        self.assertEqual(
+            json.loads(BaseContext.tojson(flat_nodes, sort_keys=True)),
+            expected,
+        )
+        self.assertEqual(
+            json.loads(get_rendered(
+                '{{ tojson(graph.nodes) }}',
+                {'graph': manifest.flat_graph, 'tojson': BaseContext.tojson},
+            )),
+            expected,
+        )
+
     @mock.patch.object(tracking, 'active_user')
     def test_metadata(self, mock_user):
         mock_user.id = 'cfc9500f-dc7f-4c83-9ea7-2c581c1b38cf'
@@ -414,6 +476,7 @@ class ManifestTest(unittest.TestCase):
                 'selectors': {},
                 'parent_map': {},
                 'child_map': {},
+                'fingerprints': {},
                 'docs': {},
                 'metadata': {
                     'generated_at': '2018-02-14T09:15:13Z',
@@ -658,6 +721,7 @@ class MixedManifestTest(unittest.TestCase):
                 'selectors': {},
                 'parent_map': {},
                 'child_map': {},
+                'fingerprints': {},
                 'metadata': {
                     'generated_at': '2018-02-14T09:15:13Z',
                     'dbt_schema_version': 'https://schemas.getdbt.com/dbt/manifest/v1.json',
@@ -887,6 +951,45 @@ def test_find_macro_by_name(macros, expectations):
             assert result.package_name == expected
 
 
+def test_find_macro_by_name_index_updates():
+    manifest = make_manifest(macros=[MockMacro('dep')])
+    result = manifest.find_macro_by_name(name='my_macro', root_project_name='root', package=None)
+    assert result.package_name == 'dep'
+    index = manifest._macro_name_index
+    assert index is not None
+    # lookups reuse the index
+    manifest.find_macro_by_name(name='other_macro', root_project_name='root', package=None)
+    assert manifest._macro_name_index is index
+
+    # added through add_macro
+    source_file = mock.MagicMock(search_key=None)
+    manifest.add_macro(source_file, MockMacro('root'))
+    result = manifest.find_macro_by_name(name='my_macro', root_project_name='root', package=None)
+    assert result.package_name == 'root'
+    assert manifest._macro_name_index is not index
+
+    # updated directly
+    index = manifest._macro_name_index
+    dbt_macro = MockMacro('dbt')
+    manifest.macros[dbt_macro.unique_id] = dbt_macro
+    result = manifest.find_macro_by_name(name='my_macro', root_project_name='root', package='dbt')
+    assert result.package_name == 'dbt'
+    assert manifest._macro_name_index is not index
+
+
+def test_find_macro_by_name_override_in_place():
+    macro = MockMacro('root')
+    manifest = make_manifest(macros=[macro])
+    result = manifest.find_macro_by_name(name='my_macro', root_project_name='root', package=None)
+    assert result is macro
+
+    # like an RPC request's macro overrides, with the same unique ID
+    override = MockMacro('root')
+    manifest.update_macros({override.unique_id: override})
+    result = manifest.find_macro_by_name(name='my_macro', root_project_name='root', package=None)
+    assert result is override
+
+
 # these don't use a search package, so we don't need to do as much
 generate_name_parameter_sets = [
     # empty
@@ -1059,6 +1162,45 @@ def test_find_materialization_by_name(macros, adapter_type, expected):
         assert result.package_name == expected_package
 
 
+def test_find_materialization_by_name_cached():
+    manifest = make_manifest(macros=[
+        MockMaterialization('dbt', adapter_type=None),
+    ])
+    kwargs = dict(
+        project_name='root',
+        materialization_name='my_materialization',
+        adapter_type='foo',
+    )
+    result = manifest.find_materialization_macro_by_name(**kwargs)
+    assert result.package_name == 'dbt'
+    assert manifest.find_materialization_macro_by_name(**kwargs) is result
+    assert manifest.get_materialization_cache_stats() == (1, 1)
+
+    # adding a macro clears the cached resolutions
+    source_file = mock.MagicMock(search_key=None)
+    manifest.add_macro(source_file, MockMaterialization('root', adapter_type='foo'))
+    result = manifest.find_materialization_macro_by_name(**kwargs)
+    assert result.package_name == 'root'
+    assert manifest.get_materialization_cache_stats() == (0, 1)
+
+
+def test_find_materialization_by_name_override_in_place():
+    materialization = MockMaterialization('root', adapter_type='foo')
+    manifest = make_manifest(macros=[materialization])
+    kwargs = dict(
+        project_name='root',
+        materialization_name='my_materialization',
+        adapter_type='foo',
+    )
+    assert manifest.find_materialization_macro_by_name(**kwargs) is materialization
+
+    # like an RPC request's macro overrides, with the same unique ID
+    override = MockMaterialization('root', adapter_type='foo')
+    manifest.update_macros({override.unique_id: override})
+    assert manifest.find_materialization_macro_by_name(**kwargs) is override
+    assert manifest.get_materialization_cache_stats() == (0, 1)
+
+
 FindNodeSpec = namedtuple('FindNodeSpec', 'nodes,sources,package,expected')
 
 
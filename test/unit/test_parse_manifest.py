@@ -1,11 +1,20 @@
+import os
+import shutil
+import tempfile
 import unittest
 from unittest import mock
 from unittest.mock import patch
 
 from .utils import config_from_parts_or_dicts, normalize
 
+from dbt.context.base import (
+    cli_var_checksum, env_var_checksum, record_parse_dependencies, Var
+)
 from dbt.contracts.files import SourceFile, FileHash, FilePath
 from dbt.contracts.graph.manifest import Manifest, ManifestStateCheck
+from dbt.contracts.graph.parsed import ParsedMacro
+from dbt.node_types import NodeType
+from dbt.parser.parse_cache import read_parse_cache, write_parse_cache
 from dbt.parser.search import FileBlock
 from dbt.parser import manifest
 
@@ -161,3 +170,185 @@ class TestLoader(unittest.TestCase):
         # the filename wasn't in the cache, so parse_file should get called
         # with a  FileBlock that has the given source file in it.
         self.parser.parse_file.assert_called_once_with(FileBlock(file=source_file))
+
+    def _cached_file_with_dependencies(self, **kwargs):
+        source_file = self._matching_file('models', 'model_1.sql')
+        source_file.project_name = 'root'
+        self.parser.load_file.return_value = source_file
+
+        source_file_dupe = self._matching_file('models', 'model_1.sql')
+        source_file_dupe.project_name = 'root'
+        source_file_dupe.nodes.append('model.root.model_1')
+        for key, value in kwargs.items():
+            setattr(source_file_dupe, key, value)
+
+        old_manifest = self._new_manifest()
+        old_manifest.files[source_file_dupe.path.search_key] = source_file_dupe
+        old_manifest.nodes = {'model.root.model_1': mock.MagicMock()}
+        self.loader.old_manifest = old_manifest
+        return source_file
+
+    def test_model_cache_hit_unchanged_var(self):
+        cli_vars = self.root_project_config.cli_vars
+        source_file = self._cached_file_with_dependencies(vars={
+            'test_schema_name': cli_var_checksum(cli_vars, 'test_schema_name'),
+            'not_on_cli': '',
+        })
+        self.loader.parse_with_cache(FileBlock(source_file), self.parser)
+        self.parser.parse_file.assert_not_called()
+        # the dependencies are carried over for the next partial parse
+        self.assertEqual(
+            set(source_file.vars), {'test_schema_name', 'not_on_cli'}
+        )
+
+    def test_model_cache_changed_var(self):
+        source_file = self._cached_file_with_dependencies(vars={
+            'test_schema_name': cli_var_checksum(
+                {'test_schema_name': 'bar'}, 'test_schema_name'
+            ),
+        })
+        self.loader.parse_with_cache(FileBlock(source_file), self.parser)
+        self.parser.parse_file.assert_called_once_with(FileBlock(file=source_file))
+
+    def test_model_cache_changed_env_var(self):
+        with mock.patch.dict(os.environ, {'DBT_TEST_ENV_VAR': 'old'}):
+            checksum = env_var_checksum('DBT_TEST_ENV_VAR')
+        source_file = self._cached_file_with_dependencies(
+            env_vars={'DBT_TEST_ENV_VAR': checksum}
+        )
+        with mock.patch.dict(os.environ, {'DBT_TEST_ENV_VAR': 'new'}):
+            self.loader.parse_with_cache(FileBlock(source_file), self.parser)
+        self.parser.parse_file.assert_called_once_with(FileBlock(file=source_file))
+
+    def test_model_cache_changed_project(self):
+        source_file = self._cached_file_with_dependencies()
+        self.loader.changed_projects = {'root'}
+        self.loader.parse_with_cache(FileBlock(source_file), self.parser)
+        self.parser.parse_file.assert_called_once_with(FileBlock(file=source_file))
+
+    def test_parse_records_dependencies(self):
+        source_file = self._matching_file('models', 'model_1.sql')
+        self.loader.old_manifest = None
+
+        def parse_file(block):
+            var = Var({}, {'cli_var': 1})
+            var('cli_var')
+            var('other_var', default=None)
+
+        self.parser.parse_file.side_effect = parse_file
+        self.loader.parse_with_cache(FileBlock(source_file), self.parser)
+        self.assertEqual(source_file.vars, {
+            'cli_var': cli_var_checksum({'cli_var': 1}, 'cli_var'),
+            'other_var': '',
+        })
+        self.assertEqual(source_file.env_vars, {})
+
+
+class TestRecordParseDependencies(unittest.TestCase):
+    def test_only_records_while_active(self):
+        var = Var({}, {})
+        var('before', default=None)
+        with record_parse_dependencies() as dependencies:
+            var('during', default=None)
+        var('after', default=None)
+        self.assertEqual(dependencies.vars, {'during': ''})
+
+
+class TestParseCache(unittest.TestCase):
+    def setUp(self):
+        self.target_path = tempfile.mkdtemp()
+        self.cache_path = os.path.join(self.target_path, 'partial_parse')
+        self.manifest = Manifest({}, {}, {}, {}, {}, {}, [], {})
+        self.files = {}
+        for name in ('model_1', 'model_2'):
+            path = FilePath(
+                searched_path='models',
+                relative_path=f'{name}.sql',
+                project_root=normalize('/usr/src/app'),
+            )
+            source_file = SourceFile(
+                path=path, checksum=FileHash.from_contents(name)
+            )
+            source_file.contents = f'{{% macro {name}() %}}{{% endmacro %}}'
+            macro = ParsedMacro(
+                name=name,
+                resource_type=NodeType.Macro,
+                unique_id=f'macro.root.{name}',
+                package_name='root',
+                original_file_path=path.original_file_path,
+                root_path=path.project_root,
+                path=path.relative_path,
+                macro_sql=source_file.contents,
+            )
+            self.manifest.add_macro(source_file, macro)
+            self.files[name] = source_file
+
+    def tearDown(self):
+        shutil.rmtree(self.target_path)
+
+    def test_entries_loaded_lazily(self):
+        write_parse_cache(self.manifest, self.cache_path)
+        saved = read_parse_cache(self.cache_path)
+        self.assertEqual(set(saved.files), set(self.manifest.files))
+        for source_file in saved.files.values():
+            self.assertIsNone(source_file._contents)
+        # nothing has been materialized yet
+        self.assertEqual(saved.macros, {})
+
+        self.assertTrue(saved.has_file(self.files['model_1']))
+        self.assertEqual(list(saved.macros), ['macro.root.model_1'])
+
+        changed = SourceFile(
+            path=self.files['model_2'].path,
+            checksum=FileHash.from_contents('changed'),
+        )
+        self.assertFalse(saved.has_file(changed))
+        self.assertEqual(list(saved.macros), ['macro.root.model_1'])
+
+    def test_only_changed_entries_rewritten(self):
+        write_parse_cache(self.manifest, self.cache_path)
+        saved = read_parse_cache(self.cache_path)
+        self.assertTrue(saved.has_file(self.files['model_1']))
+
+        with mock.patch('dbt.parser.parse_cache._write_pickle') as write:
+            write_parse_cache(self.manifest, self.cache_path, saved)
+        # the model_2 entry and the index
+        self.assertEqual(write.call_count, 2)
+
+    def test_stale_entry_rejected(self):
+        write_parse_cache(self.manifest, self.cache_path)
+        saved = read_parse_cache(self.cache_path)
+        # simulate an interrupted write: the entry is newer than the index
+        self.manifest.files[self.files['model_1'].search_key].checksum = \
+            FileHash.from_contents('newer')
+        write_parse_cache(self.manifest, self.cache_path)
+        self.assertFalse(saved.has_file(self.files['model_1']))
+
+    def test_legacy_cache_removed(self):
+        legacy_path = os.path.join(self.target_path, 'partial_parse.pickle')
+        with open(legacy_path, 'wb') as fp:
+            fp.write(b'old')
+        write_parse_cache(self.manifest, self.cache_path)
+        self.assertFalse(os.path.exists(legacy_path))
+
+    def test_no_temporary_files_left(self):
+        entries_path = os.path.join(self.cache_path, 'files')
+        os.makedirs(entries_path)
+        # another run's write that's in progress
+        in_progress = os.path.join(entries_path, 'other.pickle.tmp')
+        with open(in_progress, 'wb') as fp:
+            fp.write(b'')
+        write_parse_cache(self.manifest, self.cache_path)
+        names = os.listdir(entries_path) + os.listdir(self.cache_path)
+        self.assertEqual(
+            [name for name in names if name.endswith('.tmp')],
+            ['other.pickle.tmp'],
+        )
+        self.assertEqual(len(os.listdir(entries_path)), 3)
+
+    def test_failed_write_cleaned_up(self):
+        with mock.patch('pickle.dump', side_effect=ValueError('boom')):
+            with self.assertRaises(ValueError):
+                write_parse_cache(self.manifest, self.cache_path)
+        entries_path = os.path.join(self.cache_path, 'files')
+        self.assertEqual(os.listdir(entries_path), [])
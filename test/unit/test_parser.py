@@ -3,7 +3,12 @@ import unittest
 from unittest import mock
 
 import os
+import shutil
+import tempfile
+import time
 import yaml
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 
 import dbt.flags
 import dbt.parser
@@ -15,12 +20,15 @@ from dbt.parser import (
 from dbt.parser.schemas import (
     TestablePatchParser, SourceParser, AnalysisPatchParser, MacroPatchParser
 )
+from dbt.parser.read_files import (
+    _map_in_order, ensure_contents_loaded, read_files_for_parser
+)
 from dbt.parser.search import FileBlock
 from dbt.parser.schema_test_builders import YamlBlock
 from dbt.parser.manifest import process_docs, process_sources, process_refs
 
 from dbt.node_types import NodeType
-from dbt.contracts.files import SourceFile, FileHash, FilePath
+from dbt.contracts.files import SourceFile, FileHash, FilePath, ParseFileType
 from dbt.contracts.graph.manifest import Manifest
 from dbt.contracts.graph.model_config import (
     NodeConfig, TestConfig, SnapshotConfig
@@ -492,6 +500,30 @@ class ModelParserTest(BaseParserTest):
         path = get_abs_os_path('./dbt_modules/snowplow/models/nested/model_1.sql')
         self.assertIn(path, self.parser.manifest.files)
         self.assertEqual(self.parser.manifest.files[path].nodes, ['model.snowplow.model_1'])
+        # only literal config() calls, so it wasn't rendered
+        self.assertEqual(self.parser.static_parse_count, 1)
+        self.assertEqual(self.parser.render_count, 0)
+
+    def test_static_parse_matches_render(self):
+        raw_sql = (
+            '{{ config(materialized="table", pre_hook="select 1") }}'
+            'select * from {{ ref("model_2") }} join {{ source("src", "tbl") }}'
+        )
+        block = self.file_block_for(raw_sql, 'nested/model_1.sql')
+        self.parser.parse_file(block)
+        static_node = self.parser.manifest.nodes['model.snowplow.model_1']
+        self.assertEqual(self.parser.static_parse_count, 1)
+
+        self.manifest.nodes.clear()
+        self.manifest.files.clear()
+        with mock.patch('dbt.parser.base.statically_extract_ref_source_config') as extract:
+            extract.return_value = None
+            self.parser.parse_file(block)
+        rendered_node = self.parser.manifest.nodes['model.snowplow.model_1']
+        self.assertEqual(self.parser.render_count, 1)
+        self.assertEqual(static_node, rendered_node)
+        self.assertEqual(static_node.refs, [['model_2']])
+        self.assertEqual(static_node.sources, [['src', 'tbl']])
 
     def test_parse_error(self):
         block = self.file_block_for('{{ SYNTAX ERROR }}', 'nested/model_1.sql')
@@ -874,3 +906,113 @@ class ProcessingTest(BaseParserTest):
     def test_process_refs(self):
         process_refs(self.manifest, 'project')
         self.y_node.depends_on.nodes.append.assert_called_once_with('model.project.x')
+
+
+class ReadFilesTest(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.project = mock.MagicMock(
+            project_root=self.tempdir, project_name='root'
+        )
+        os.mkdir(os.path.join(self.tempdir, 'models'))
+        self.names = ['model_{:02}.sql'.format(i) for i in range(20)]
+        for name in self.names:
+            with open(os.path.join(self.tempdir, 'models', name), 'w') as fp:
+                fp.write('select 1 as {}'.format(name[:-4]))
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def test_map_in_order(self):
+        def delayed(value):
+            # later entries finish first
+            time.sleep((20 - value) * 0.001)
+            return value
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            result = list(_map_in_order(
+                executor, delayed, range(20), max_in_flight=3
+            ))
+        self.assertEqual(result, list(range(20)))
+
+    def test_read_files_parallel_matches_serial(self):
+        serial_files = {}
+        serial = read_files_for_parser(
+            self.project, serial_files, ['models'], '.sql',
+            ParseFileType.Model,
+        )
+        parallel_files = {}
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            parallel = read_files_for_parser(
+                self.project, parallel_files, ['models'], '.sql',
+                ParseFileType.Model, executor,
+            )
+        self.assertEqual(serial, parallel)
+        self.assertEqual(list(serial_files), list(parallel_files))
+        self.assertEqual(len(parallel), len(self.names))
+        for key, source_file in parallel_files.items():
+            self.assertEqual(source_file.checksum, serial_files[key].checksum)
+            self.assertEqual(source_file.contents, serial_files[key].contents)
+
+    def test_read_files_unchanged_stat_not_opened(self):
+        saved_files = {}
+        read_files_for_parser(
+            self.project, saved_files, ['models'], '.sql',
+            ParseFileType.Model,
+        )
+        for source_file in saved_files.values():
+            self.assertIsNotNone(source_file.stat)
+        saved_at = datetime.utcnow() + timedelta(seconds=5)
+
+        files = {}
+        with mock.patch('dbt.parser.read_files.load_file_contents') as load:
+            read_files_for_parser(
+                self.project, files, ['models'], '.sql',
+                ParseFileType.Model, None, saved_files, saved_at,
+            )
+            load.assert_not_called()
+        self.assertEqual(list(files), list(saved_files))
+        for key, source_file in files.items():
+            self.assertEqual(source_file.checksum, saved_files[key].checksum)
+            # the contents are only read if they turn out to be needed
+            self.assertIsNone(source_file._contents)
+            ensure_contents_loaded(source_file)
+            self.assertEqual(source_file.contents, saved_files[key].contents)
+
+    def test_read_files_changed_stat_is_read(self):
+        saved_files = {}
+        read_files_for_parser(
+            self.project, saved_files, ['models'], '.sql',
+            ParseFileType.Model,
+        )
+        path = os.path.join(self.tempdir, 'models', self.names[0])
+        with open(path, 'w') as fp:
+            fp.write('select 2 as changed_column')
+        saved_at = datetime.utcnow() + timedelta(seconds=5)
+
+        files = {}
+        read_files_for_parser(
+            self.project, files, ['models'], '.sql',
+            ParseFileType.Model, None, saved_files, saved_at,
+        )
+        key = os.path.abspath(path)
+        self.assertNotEqual(files[key].checksum, saved_files[key].checksum)
+        self.assertEqual(files[key].contents, 'select 2 as changed_column')
+
+    def test_read_files_recently_modified_is_read(self):
+        saved_files = {}
+        read_files_for_parser(
+            self.project, saved_files, ['models'], '.sql',
+            ParseFileType.Model,
+        )
+        # the files were modified after the saved parse started
+        saved_at = datetime.utcnow() - timedelta(seconds=5)
+        with mock.patch(
+            'dbt.parser.read_files.load_file_contents',
+            return_value='select 1'
+        ) as load:
+            read_files_for_parser(
+                self.project, {}, ['models'], '.sql',
+                ParseFileType.Model, None, saved_files, saved_at,
+            )
+            self.assertEqual(load.call_count, len(self.names))